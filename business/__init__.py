@@ -6,14 +6,30 @@ from business.exam_scheduling import (
     run_final_exam_scheduler,
     generate_courses_report,
     save_courses_report_excel,
-    save_diagnostics_excel
+    save_diagnostics_excel,
+    ExamInputs,
+    ExamScheduleResult,
+    load_exam_inputs,
+    prepare_exam_inputs,
+    compute_diagnostics,
+    solve_exam_schedule,
+    save_schedule_excel
 )
 from business.invigilation import run_optimization
+from business.solver import InfeasibleModelError
 
 __all__ = [
     'run_final_exam_scheduler',
     'generate_courses_report',
     'save_courses_report_excel',
     'save_diagnostics_excel',
+    'ExamInputs',
+    'ExamScheduleResult',
+    'load_exam_inputs',
+    'prepare_exam_inputs',
+    'compute_diagnostics',
+    'solve_exam_schedule',
+    'save_schedule_excel',
     'run_optimization',
+    'InfeasibleModelError',
 ]
@@ -6,12 +6,28 @@ from business.exam_scheduling.scheduler import (
     run_final_exam_scheduler,
     generate_courses_report,
     save_courses_report_excel,
-    save_diagnostics_excel
+    save_diagnostics_excel,
+    ExamInputs,
+    ExamScheduleResult,
+    load_exam_inputs,
+    prepare_exam_inputs,
+    compute_diagnostics,
+    solve_exam_schedule,
+    save_schedule_excel
 )
+from business.exam_scheduling.feasibility import SlotDurationIndex
 
 __all__ = [
     'run_final_exam_scheduler',
     'generate_courses_report',
     'save_courses_report_excel',
     'save_diagnostics_excel',
+    'ExamInputs',
+    'ExamScheduleResult',
+    'load_exam_inputs',
+    'prepare_exam_inputs',
+    'compute_diagnostics',
+    'solve_exam_schedule',
+    'save_schedule_excel',
+    'SlotDurationIndex',
 ]
@@ -0,0 +1,96 @@
+"""
+Business Layer - Exam Group Cohorts
+Exam groups sharing the exact same (or a nested) student population
+"""
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def group_student_sets(enroll_df: "pd.DataFrame") -> Dict[str, np.ndarray]:
+    """ExamGroup -> sorted array of integer student codes (one factorize + one sort)."""
+    df = enroll_df[enroll_df["ExamGroup"].astype(str).str.strip() != ""]
+    student_codes, _ = pd.factorize(df["StudentID"])
+    group_codes, group_names = pd.factorize(df["ExamGroup"])
+
+    pairs = np.unique(group_codes.astype(np.int64) * (len(student_codes) + 1) + student_codes)
+    pair_group, pair_student = np.divmod(pairs, len(student_codes) + 1)
+    bounds = np.flatnonzero(np.diff(pair_group)) + 1
+    groups_in_order = pair_group[np.r_[0, bounds]] if len(pairs) else []
+    return {
+        group_names[gc]: students
+        for gc, students in zip(groups_in_order, np.split(pair_student, bounds))
+    }
+
+
+def identical_student_sets(student_sets: Dict[str, np.ndarray]) -> List[List[str]]:
+    """Classes (sorted, size >= 2) of exam groups whose student sets are equal, found by hashing."""
+    buckets: Dict[bytes, List[str]] = {}
+    for g, students in student_sets.items():
+        buckets.setdefault(students.tobytes(), []).append(g)
+    return sorted(sorted(c) for c in buckets.values() if len(c) >= 2)
+
+
+def nested_student_sets(student_sets: Dict[str, np.ndarray]) -> List[Tuple[str, str]]:
+    """
+    (inner, outer) pairs where every student of `inner` also sits `outer`, and
+    `outer` has more students.
+    """
+    return strict_subsets({g: students.tolist() for g, students in student_sets.items()})
+
+
+def strict_subsets(sets: Dict[Hashable, Sequence[Hashable]]) -> List[Tuple[Hashable, Hashable]]:
+    """
+    Sorted (inner, outer) key pairs where set `inner` is a strict subset of
+    set `outer` (members are distinct). Candidates come from the inner set's
+    member found in the fewest sets, so only a handful of subset tests run
+    per set.
+    """
+    sets_of_member: Dict[Hashable, List[Hashable]] = {}
+    for key, members in sets.items():
+        for m in members:
+            sets_of_member.setdefault(m, []).append(key)
+
+    pairs = []
+    for inner, members in sets.items():
+        if not len(members):
+            continue
+        pivot = min(members, key=lambda m: len(sets_of_member[m]))
+        inner_set = None
+        for outer in sets_of_member[pivot]:
+            if outer == inner or len(sets[outer]) <= len(members):
+                continue
+            if inner_set is None:
+                inner_set = set(members)
+            if inner_set.issubset(sets[outer]):
+                pairs.append((inner, outer))
+    return sorted(pairs)
+
+
+def student_set_relations_df(student_sets: Dict[str, np.ndarray]) -> "pd.DataFrame":
+    """Diagnostics sheet: one row per identical or nested pair of exam groups."""
+    rows = []
+    for cls in identical_student_sets(student_sets):
+        for other in cls[1:]:
+            rows.append({"ExamGroup": cls[0], "Relation": "SameStudentsAs", "OtherExamGroup": other,
+                         "Students": int(len(student_sets[cls[0]]))})
+    for inner, outer in nested_student_sets(student_sets):
+        rows.append({"ExamGroup": inner, "Relation": "ContainedIn", "OtherExamGroup": outer,
+                     "Students": int(len(student_sets[inner]))})
+    return pd.DataFrame(rows, columns=["ExamGroup", "Relation", "OtherExamGroup", "Students"])
+
+
+def mergeable_groups(student_sets: Dict[str, np.ndarray], group_duration: Dict[str, int], fixed_groups) -> List[List[str]]:
+    """
+    Identical-student classes that the model can treat as one node: same
+    duration and none of them fixed. Members keep sorted order.
+    """
+    classes = []
+    for cls in identical_student_sets(student_sets):
+        by_duration: Dict[int, List[str]] = {}
+        for g in cls:
+            if g not in fixed_groups:
+                by_duration.setdefault(int(group_duration.get(g, 120)), []).append(g)
+        classes.extend(c for c in by_duration.values() if len(c) >= 2)
+    return sorted(classes)
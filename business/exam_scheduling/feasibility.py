@@ -0,0 +1,52 @@
+"""
+Business Layer - Exam Slot Feasibility
+Duration index answering "which slots are long enough for this exam group?"
+"""
+from bisect import bisect_left
+from typing import Dict, Iterable, Tuple
+
+
+class SlotDurationIndex:
+    """
+    Slot durations sorted once, so the slots that fit a duration are found
+    with one bisect instead of a scan over every slot.
+
+    Feasible slot lists are cached per distinct duration: groups sharing the
+    usual 120/150/180 minute values all share one tuple. Slots are returned
+    as positions in the original order, ascending.
+
+    Usage:
+        index = SlotDurationIndex(slot_durations)
+        index.count(120)      # how many slots fit 120 minutes
+        index.slots_for(120)  # (t0, t1, ...) in calendar order
+    """
+
+    def __init__(self, slot_durations: Iterable[int]):
+        self._durations = [int(d) for d in slot_durations]
+        order = sorted(range(len(self._durations)), key=self._durations.__getitem__)
+        self._sorted_durations = [self._durations[t] for t in order]
+        self._sorted_slots = order
+        self._cache: Dict[int, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._durations)
+
+    def _first_fit(self, duration: int) -> int:
+        return bisect_left(self._sorted_durations, int(duration))
+
+    def count(self, duration: int) -> int:
+        """Number of slots at least `duration` minutes long."""
+        return len(self._durations) - self._first_fit(duration)
+
+    def slots_for(self, duration: int) -> Tuple[int, ...]:
+        """Positions of the slots at least `duration` minutes long (cached per duration)."""
+        duration = int(duration)
+        slots = self._cache.get(duration)
+        if slots is None:
+            slots = tuple(sorted(self._sorted_slots[self._first_fit(duration):]))
+            self._cache[duration] = slots
+        return slots
+
+    def fits(self, slot: int, duration: int) -> bool:
+        """True if slot position `slot` is long enough for `duration`."""
+        return self._durations[slot] >= int(duration)
@@ -0,0 +1,115 @@
+"""
+Business Layer - Exam Model Presolve
+Substitutes fixed exam groups as constants and hints the conflict-free ones
+"""
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+def split_trivial_groups(
+    nodes: Sequence[str],
+    student_groups: Dict[str, Sequence[str]],
+    fixed_map: Dict[str, int],
+    keep_fixed: bool = False,
+) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Returns (constant_slots, free_groups):
+      constant_slots - fixed groups, substituted as constants (unless keep_fixed)
+      free_groups    - groups sharing no student with any other group; they only
+                       touch the soft capacity/day-balance terms, so a greedy
+                       placement makes a good solver hint for them
+    """
+    in_conflict = set()
+    for glist in student_groups.values():
+        if len(glist) >= 2:
+            in_conflict.update(glist)
+
+    constant_slots = {} if keep_fixed else dict(fixed_map)
+    free_groups = [n for n in nodes if n not in in_conflict and n not in fixed_map]
+    return constant_slots, free_groups
+
+
+def slots_blocked_by_constants(
+    student_groups: Dict[str, Sequence[str]],
+    constant_slots: Dict[str, int],
+    clashing_slots: Dict[int, Set[int]],
+    node_of: Dict[str, str],
+) -> Dict[str, Set[int]]:
+    """
+    Node -> slots it cannot use because a constant (fixed) group of one of its
+    students sits in that slot or one overlapping it. Dropping these x
+    variables replaces the clash constraints that involved the constant group.
+    """
+    blocked: Dict[str, Set[int]] = {}
+    if not constant_slots:
+        return blocked
+    for glist in student_groups.values():
+        fixed_here = [g for g in glist if g in constant_slots]
+        if not fixed_here or len(glist) < 2:
+            continue
+        taken = set()
+        for f in fixed_here:
+            taken |= clashing_slots[constant_slots[f]]
+        for g in glist:
+            if g not in constant_slots:
+                blocked.setdefault(node_of[g], set()).update(taken)
+    return blocked
+
+
+def place_free_groups(
+    free_groups: Sequence[str],
+    feasible_slots_for_g: Dict[str, Sequence[int]],
+    group_students: Dict[str, int],
+    used: List[int],
+    capacities: Sequence[int],
+    slot_day: Sequence[int],
+    n_days: int,
+    w_capacity: int = 50,
+    w_spread: int = 5,
+    max_passes: int = 10,
+) -> Dict[str, int]:
+    """
+    Place conflict-free groups around the slots already `used`, scoring slots with
+    the model's own soft terms (w_capacity * overage + w_spread * day-load
+    spread). Greedy, largest group first, then single-group moves while they
+    improve the score. `used` (students per slot) is updated in place.
+    """
+    day_load = [0] * n_days
+    for t, u in enumerate(used):
+        day_load[slot_day[t]] += u
+
+    def over(t: int, students: int) -> int:
+        return max(0, students - int(capacities[t]))
+
+    def cost_if(t: int, n: int):
+        """Score after adding n students to slot t (n may be negative)."""
+        d = slot_day[t]
+        day_load[d] += n
+        spread = max(day_load) - min(day_load)
+        day_load[d] -= n
+        extra_over = over(t, used[t] + n) - over(t, used[t])
+        return w_capacity * extra_over + w_spread * spread
+
+    def move(t: int, n: int):
+        used[t] += n
+        day_load[slot_day[t]] += n
+
+    placed = {}
+    for g in sorted(free_groups, key=lambda g: (-int(group_students.get(g, 0)), str(g))):
+        n = int(group_students.get(g, 0))
+        best = min(feasible_slots_for_g[g], key=lambda t: (cost_if(t, n), day_load[slot_day[t]], t))
+        placed[g] = best
+        move(best, n)
+
+    for _ in range(max_passes):
+        improved = False
+        for g, current in placed.items():
+            n = int(group_students.get(g, 0))
+            move(current, -n)
+            best = min(feasible_slots_for_g[g], key=lambda t: (cost_if(t, n), t != current, t))
+            if best != current:
+                improved = True
+                placed[g] = best
+            move(best, n)
+        if not improved:
+            break
+    return placed
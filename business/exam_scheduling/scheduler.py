@@ -10,10 +10,33 @@ from typing import Dict, List, Tuple, Any, Optional
 
 # pandas is optional at import-time (GUI shows friendly install hint)
 try:
+    import numpy as np
     import pandas as pd
 except Exception:
+    np = None
     pd = None
 
+from data.writers.excel_writer import StreamingExcelWriter, write_excel_sheets
+from business.exam_scheduling.feasibility import SlotDurationIndex
+from business.exam_scheduling.presolve import place_free_groups, slots_blocked_by_constants, split_trivial_groups
+from business.exam_scheduling.cohorts import (
+    group_student_sets,
+    mergeable_groups,
+    strict_subsets,
+    student_set_relations_df,
+)
+from business.exam_scheduling.symmetry import (
+    add_symmetry_breaking,
+    identical_slot_classes,
+    interchangeable_group_classes,
+)
+from business.validators.exam_prechecks import check_exam_feasibility, precheck_errors_message
+from business.solver.explain import AssumptionGuards, InfeasibleModelError, format_conflicts
+from business.solver.early_stop import StopCriteria, solve_with_early_stop
+from business.solver.progress import ProgressCallback, as_reporter
+from business.solver.tuning import choose_solver_settings, model_size, record_solver_run
+from utils.interval_utils import overlap_cliques
+
 
 # ----------------------------- Helpers -----------------------------
 
@@ -106,23 +129,76 @@ class DiagnosticsResult:
 
 # ----------------------------- Loaders -----------------------------
 
-def _load_inputs(
+@dataclass
+class ExamInputs:
+    """
+    Normalized exam-scheduling inputs, parsed and expanded once.
+
+    The same object can be handed to generate_courses_report and
+    run_final_exam_scheduler (diagnostics or solve), so the Excel files are read,
+    normalized and expanded to enrollments a single time. Optional inputs that
+    were not provided (calendar, capacity, constraints) are empty frames.
+    Consumers treat the frames as read-only.
+    """
+    regs_df: "pd.DataFrame"
+    courses_df: "pd.DataFrame"          # active courses only (terminated removed)
+    cal_df: "pd.DataFrame"
+    cap_df: "pd.DataFrame"
+    fixed_df: "pd.DataFrame"
+    balance_df: "pd.DataFrame"
+    terminated_courses: set             # {(CourseCode, Program)}
+    enroll_df: "pd.DataFrame"           # StudentID, Program, CourseCode, CourseName, ExamGroup, DurationMin
+    missing_df: "pd.DataFrame"          # MissingCourseCode
+
+
+def _read_sheet(path: Optional[str], sheet_name: str) -> Optional["pd.DataFrame"]:
+    """Read one input sheet, or None if no path was given."""
+    if not path:
+        return None
+    return pd.read_excel(path, sheet_name=sheet_name)
+
+
+def _read_inputs(
     regs_path: str,
     courses_master_path: str,
-    calendar_path: str,
-    slot_capacity_path: str,
-    constraints_path: str,
+    calendar_path: Optional[str] = None,
+    slot_capacity_path: Optional[str] = None,
+    constraints_path: Optional[str] = None,
 ):
+    """Read the raw input sheets from Excel; optional files that are not given come back as None."""
     require_pandas()
 
     regs_df = pd.read_excel(regs_path, sheet_name="Regs")
     courses_df = pd.read_excel(courses_master_path, sheet_name="Courses")
-    cal_df = pd.read_excel(calendar_path, sheet_name="Calendar")
-    cap_df = pd.read_excel(slot_capacity_path, sheet_name="SlotCapacity")
-    fixed_df = pd.read_excel(constraints_path, sheet_name="FixedAssignments")
+    cal_df = _read_sheet(calendar_path, "Calendar")
+    cap_df = _read_sheet(slot_capacity_path, "SlotCapacity")
+    fixed_df = _read_sheet(constraints_path, "FixedAssignments")
     try:
-        balance_df = pd.read_excel(constraints_path, sheet_name="BalanceSettings")
+        balance_df = _read_sheet(constraints_path, "BalanceSettings")
     except Exception:
+        balance_df = None
+
+    return regs_df, courses_df, cal_df, cap_df, fixed_df, balance_df
+
+
+def _normalize_inputs(
+    regs_df: "pd.DataFrame",
+    courses_df: "pd.DataFrame",
+    cal_df: Optional["pd.DataFrame"] = None,
+    cap_df: Optional["pd.DataFrame"] = None,
+    fixed_df: Optional["pd.DataFrame"] = None,
+    balance_df: Optional["pd.DataFrame"] = None,
+):
+    require_pandas()
+
+    # Optional inputs default to empty frames with the expected columns
+    if cal_df is None:
+        cal_df = pd.DataFrame(columns=["Date", "SlotID", "Start", "End"])
+    if cap_df is None:
+        cap_df = pd.DataFrame(columns=["Date", "SlotID", "CapacityStudents"])
+    if fixed_df is None:
+        fixed_df = pd.DataFrame(columns=["ExamGroup", "Date", "SlotID"])
+    if balance_df is None:
         balance_df = pd.DataFrame()
 
     # Required columns checks
@@ -241,21 +317,24 @@ def _build_enrollments(regs_df, courses_df, terminated_courses=None) -> Tuple["p
     if terminated_courses is None:
         terminated_courses = set()
 
-    rows = []
-    for _, r in regs_df.iterrows():
-        sid = str(r["ID"]).strip()
-        prog = normalize_program(r["Program"])
-        for cc in split_courses(r["COURSES"]):
-            course_code = str(cc).strip()
-            # Skip enrollments in terminated courses (check specific program OR fallback to ALL)
-            if (course_code, prog) in terminated_courses:
-                continue
-            if (course_code, "ALL") in terminated_courses:
-                continue
-                
-            rows.append({"StudentID": sid, "Program": prog, "CourseCode": course_code})
-
-    enroll = pd.DataFrame(rows)
+    # Vectorized split_courses(): one row per (student, course), empty / nan / none parts dropped
+    cells = regs_df["COURSES"]
+    cells = cells.where(cells.notna(), "").astype(str)
+    enroll = pd.DataFrame({
+        "StudentID": regs_df["ID"].astype(str).str.strip(),
+        "Program": regs_df["Program"].astype(str).str.strip().str.upper(),
+        "CourseCode": cells.str.split(","),
+    }).explode("CourseCode", ignore_index=True)
+    enroll["CourseCode"] = enroll["CourseCode"].fillna("").astype(str).str.strip()
+    keep = (enroll["CourseCode"] != "") & ~enroll["CourseCode"].str.lower().isin(["nan", "none"])
+
+    # Skip enrollments in terminated courses (check specific program OR fallback to ALL)
+    if terminated_courses:
+        term = pd.MultiIndex.from_tuples(sorted(terminated_courses))
+        keep &= ~pd.MultiIndex.from_arrays([enroll["CourseCode"], enroll["Program"]]).isin(term)
+        keep &= ~enroll["CourseCode"].isin({cc for cc, prog in terminated_courses if prog == "ALL"})
+
+    enroll = enroll.loc[keep].reset_index(drop=True)
     if enroll.empty:
         raise ValueError("No enrollments parsed from regs.xlsx (COURSES might be empty).")
 
@@ -291,6 +370,54 @@ def _build_enrollments(regs_df, courses_df, terminated_courses=None) -> Tuple["p
     return enroll, missing_df
 
 
+def prepare_exam_inputs(
+    regs_df: "pd.DataFrame",
+    courses_df: "pd.DataFrame",
+    calendar_df: Optional["pd.DataFrame"] = None,
+    capacity_df: Optional["pd.DataFrame"] = None,
+    fixed_df: Optional["pd.DataFrame"] = None,
+    balance_df: Optional["pd.DataFrame"] = None,
+) -> ExamInputs:
+    """
+    Build ExamInputs from in-memory DataFrames shaped like the Excel sheets
+    (Regs, Courses, Calendar, SlotCapacity, FixedAssignments, BalanceSettings).
+    Nothing is read from or written to disk; the given frames are not modified.
+    Only regs and courses are required.
+    """
+    regs_df, courses_df, cal_df, cap_df, fixed_df, balance_df, terminated_courses = _normalize_inputs(
+        regs_df, courses_df, calendar_df, capacity_df, fixed_df, balance_df
+    )
+    enroll_df, missing_df = _build_enrollments(regs_df, courses_df, terminated_courses)
+    return ExamInputs(
+        regs_df=regs_df,
+        courses_df=courses_df,
+        cal_df=cal_df,
+        cap_df=cap_df,
+        fixed_df=fixed_df,
+        balance_df=balance_df,
+        terminated_courses=terminated_courses,
+        enroll_df=enroll_df,
+        missing_df=missing_df,
+    )
+
+
+def load_exam_inputs(
+    regs_path: str,
+    courses_master_path: str,
+    calendar_path: Optional[str] = None,
+    slot_capacity_path: Optional[str] = None,
+    constraints_path: Optional[str] = None,
+) -> ExamInputs:
+    """
+    Read, normalize and expand all exam inputs once.
+    Only regs and courses master are required; the rest may be omitted
+    (e.g. for the courses report) and are then empty.
+    """
+    return prepare_exam_inputs(*_read_inputs(
+        regs_path, courses_master_path, calendar_path, slot_capacity_path, constraints_path
+    ))
+
+
 # ----------------------------- Diagnostics -----------------------------
 
 def _compute_diagnostics(
@@ -326,12 +453,12 @@ def _compute_diagnostics(
     # ExamGroup stats
     g_students = enroll_df.groupby("ExamGroup")["StudentID"].nunique().to_dict()
     g_duration = enroll_df.groupby("ExamGroup")["DurationMin"].max().to_dict()
-    slot_dur_map = dict(zip(slots["SlotKey"], slots["SlotDurationMin"]))
+    dur_index = SlotDurationIndex(slots["SlotDurationMin"])
 
     eg_rows = []
     for g in examgroups:
         dur = int(g_duration.get(g, 120))
-        feasible = sum(1 for sk in slot_keys if int(slot_dur_map.get(sk, 0)) >= dur)
+        feasible = dur_index.count(dur)
         eg_rows.append({
             "ExamGroup": g,
             "Students": int(g_students.get(g, 0)),
@@ -364,6 +491,30 @@ def _compute_diagnostics(
                 fixed_issues_rows.append({"ExamGroup": eg, "SlotKey": sk, "Issue": issue})
     fixed_issues_df = pd.DataFrame(fixed_issues_rows)
 
+    # Exam groups with identical / nested student sets (identical ones are merged in the model)
+    cohorts_df = student_set_relations_df(group_student_sets(enroll_df))
+
+    # Pre-solve screening (same checks the scheduler runs before building the model)
+    precheck_df = pd.DataFrame()
+    if n_slots:
+        sk_to_t = {k: i for i, k in enumerate(slot_keys)}
+        fixed_slots = {}
+        if fixed_df is not None and not fixed_df.empty:
+            for eg, sk in zip(fixed_df["ExamGroup"].map(normalize_str), fixed_df["SlotKey"].map(normalize_str)):
+                if eg in eg_set and sk in sk_to_t:
+                    fixed_slots[eg] = sk_to_t[sk]
+        cap_map = dict(zip(cap_df["SlotKey"], cap_df["CapacityStudents"]))
+        precheck_df = check_exam_feasibility(
+            student_groups,
+            {g: int(g_duration.get(g, 120)) for g in examgroups},
+            g_students,
+            slots["SlotDurationMin"].tolist(),
+            [int(cap_map.get(k, 10**9)) for k in slot_keys],
+            fixed_slots,
+            slot_labels=slot_keys,
+            slot_intervals=list(zip(slots["DateN"], slots["StartMin"], slots["EndMin"])),
+        )
+
     diag = {
         "students": int(n_students),
         "programs": int(n_programs),
@@ -378,6 +529,10 @@ def _compute_diagnostics(
         "max_exams_per_student": int(max_exams_student),
         "total_pairwise_exam_pairs": int(total_pairs),
         "fixed_assignment_issues": int(len(fixed_issues_df)) if fixed_issues_df is not None and not fixed_issues_df.empty else 0,
+        "precheck_errors": int((precheck_df["Severity"] == "ERROR").sum()) if not precheck_df.empty else 0,
+        "precheck_warnings": int((precheck_df["Severity"] == "WARNING").sum()) if not precheck_df.empty else 0,
+        "identical_student_set_pairs": int((cohorts_df["Relation"] == "SameStudentsAs").sum()),
+        "nested_student_set_pairs": int((cohorts_df["Relation"] == "ContainedIn").sum()),
     }
 
     dfs = {
@@ -385,6 +540,8 @@ def _compute_diagnostics(
         "MissingCourseCodes": (missing_df.copy() if missing_df is not None else pd.DataFrame()),
         "ExamGroupStats": eg_stats.copy(),
         "FixedAssignmentIssues": fixed_issues_df.copy(),
+        "PrecheckIssues": precheck_df.copy(),
+        "ExamGroupCohorts": cohorts_df,
         "SlotStats": slot_stats.copy(),
     }
     return DiagnosticsResult(diag=diag, dfs=dfs)
@@ -392,118 +549,107 @@ def _compute_diagnostics(
 
 def save_diagnostics_excel(dfs: Dict[str, "pd.DataFrame"], output_path: str):
     require_pandas()
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        for name, df in dfs.items():
-            df.to_excel(writer, index=False, sheet_name=safe_sheet_name(name))
+    write_excel_sheets(output_path, {safe_sheet_name(name): df for name, df in dfs.items()})
 
 
 # ----------------------------- Courses Report -----------------------------
 
-def generate_courses_report(regs_path: str, courses_master_path: str) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+def _mode_nonempty_by_code(key_codes, n_keys: int, values: "pd.Series") -> List[str]:
+    """
+    Most common non-empty value per key (ties -> smallest value), like
+    Series.mode().iloc[0] per group, but computed with one value_counts-style pass
+    over integer codes instead of a Python list per group. Keys with no
+    non-empty value get "".
+    """
+    vals = values.astype(str)
+    ok = ((vals.str.strip() != "") & ~vals.str.lower().isin(["nan", "none"])).to_numpy()
+    out = np.full(n_keys, "", dtype=object)
+    if not ok.any():
+        return out.tolist()
+
+    # sort=True -> value codes follow string order, so the lowest code wins ties
+    val_codes, val_uniques = pd.factorize(vals[ok], sort=True)
+    n_vals = len(val_uniques)
+    pairs, counts = np.unique(key_codes[ok].astype(np.int64) * n_vals + val_codes, return_counts=True)
+    pair_key, pair_val = np.divmod(pairs, n_vals)
+
+    # rank per key: highest count first, then smallest value; keep the top row of each key
+    order = np.lexsort((pair_val, -counts, pair_key))
+    ranked_keys = pair_key[order]
+    top = order[np.r_[True, ranked_keys[1:] != ranked_keys[:-1]]]
+    out[pair_key[top]] = np.asarray(val_uniques, dtype=object)[pair_val[top]]
+    return out.tolist()
+
+
+def _distinct_student_counts(key_codes, n_keys: int, student_codes, n_students: int):
+    """Number of distinct students per integer key (vectorized nunique)."""
+    pairs = np.unique(key_codes.astype(np.int64) * n_students + student_codes)
+    return np.bincount(pairs // n_students, minlength=n_keys)
+
+
+def generate_courses_report(
+    regs_path: Optional[str] = None,
+    courses_master_path: Optional[str] = None,
+    inputs: Optional[ExamInputs] = None,
+    program_counts: str = "wide",
+):
     """
+    Pass either the two file paths or an already loaded ExamInputs.
+
+    program_counts:
+      "wide" - one count column per program in report_df (default)
+      "long" - no per-program columns; a third frame (CourseCode, Program, Students)
+               holding only non-zero counts is returned instead. Use it when there
+               are hundreds of programs.
+
     Returns:
       report_df: CourseCode, ResolvedCourseName, ResolvedExamGroup, DurationMin, TotalStudents, + per-program counts
       issues_df: rows where NOT TITLED and/or NOT GROUPED and/or MissingInMaster
+      (+ program_counts_df when program_counts="long")
     """
     require_pandas()
+    if program_counts not in ("wide", "long"):
+        raise ValueError("program_counts must be 'wide' or 'long'.")
 
-    regs_df = pd.read_excel(regs_path, sheet_name="Regs")
-    courses_df = pd.read_excel(courses_master_path, sheet_name="Courses")
-
-    req_regs = {"ID", "Program", "COURSES"}
-    req_courses = {"CourseCode", "Program", "ExamGroup"}
-    if not req_regs.issubset(regs_df.columns):
-        raise ValueError(f"regs.xlsx (Regs) must include columns: {sorted(req_regs)}")
-    if not req_courses.issubset(courses_df.columns):
-        raise ValueError(f"courses_master.xlsx (Courses) must include columns: {sorted(req_courses)}")
-
-    regs_df = regs_df.copy()
-    courses_df = courses_df.copy()
-
-    regs_df["ID"] = regs_df["ID"].astype(str).str.strip()
-    regs_df["Program"] = regs_df["Program"].apply(normalize_program)
-
-    courses_df["CourseCode"] = courses_df["CourseCode"].astype(str).str.strip()
-    courses_df["Program"] = courses_df["Program"].apply(normalize_program)
-    courses_df["ExamGroup"] = courses_df["ExamGroup"].apply(normalize_str)
-    
-    # Handle Terminated column (optional) - track before filtering
-    terminated_courses = set()
-    if "Terminated" not in courses_df.columns:
-        courses_df["Terminated"] = False
-    else:
-        courses_df["Terminated"] = courses_df["Terminated"].apply(
-            lambda x: str(x).strip().upper() in ("YES", "TRUE", "1", "Y", "TERMINATED")
-        )
-        # Store terminated (CourseCode, Program) keys
-        terminated_courses = set(
-            zip(courses_df[courses_df["Terminated"]]["CourseCode"], 
-                courses_df[courses_df["Terminated"]]["Program"])
-        )
-    # Filter out terminated courses
-    courses_df = courses_df[~courses_df["Terminated"]].copy()
-    
-    if "CourseName" not in courses_df.columns:
-        courses_df["CourseName"] = ""
-    courses_df["CourseName"] = courses_df["CourseName"].apply(normalize_str)
-    if "DurationMin" not in courses_df.columns:
-        courses_df["DurationMin"] = 120
-    courses_df["DurationMin"] = pd.to_numeric(courses_df["DurationMin"], errors="coerce").fillna(120).astype(int)
-
-    # enrollments expansion
-    rows = []
-    for _, r in regs_df.iterrows():
-        sid = str(r["ID"]).strip()
-        prog = normalize_program(r["Program"])
-        for cc in split_courses(r["COURSES"]):
-            course_code = str(cc).strip()
-            # Skip enrollments in terminated courses (program-specific or ALL)
-            if (course_code, prog) in terminated_courses:
-                continue
-            if (course_code, "ALL") in terminated_courses:
-                continue
-                
-            rows.append({"StudentID": sid, "Program": prog, "CourseCode": course_code})
-    enroll = pd.DataFrame(rows)
-    if enroll.empty:
-        raise ValueError("No enrollments parsed from regs.xlsx.")
-
-    # Resolve master fields with same join rule
-    courses_exact = courses_df[courses_df["Program"] != "ALL"][["CourseCode", "Program", "CourseName", "ExamGroup", "DurationMin"]]
-    courses_all = courses_df[courses_df["Program"] == "ALL"][["CourseCode", "CourseName", "ExamGroup", "DurationMin"]]
+    if inputs is None:
+        inputs = load_exam_inputs(regs_path, courses_master_path)
+    courses_df = inputs.courses_df
+    merged = inputs.enroll_df
 
-    merged = enroll.merge(courses_exact, on=["CourseCode", "Program"], how="left")
-    missing_mask = merged["ExamGroup"].isna() | (merged["ExamGroup"].astype(str).str.strip() == "")
-    if missing_mask.any():
-        fb = merged.loc[missing_mask, ["CourseCode"]].merge(courses_all, on="CourseCode", how="left")
-        merged.loc[missing_mask, "CourseName"] = fb["CourseName"].values
-        merged.loc[missing_mask, "ExamGroup"] = fb["ExamGroup"].values
-        merged.loc[missing_mask, "DurationMin"] = fb["DurationMin"].values
-
-    merged["CourseName"] = merged["CourseName"].fillna("").astype(str)
-    merged["ExamGroup"] = merged["ExamGroup"].fillna("").astype(str)
-    merged["DurationMin"] = pd.to_numeric(merged["DurationMin"], errors="coerce").fillna(120).astype(int)
+    # Integer-code the key columns once; everything below is array arithmetic
+    course_codes, course_uniques = pd.factorize(merged["CourseCode"], sort=True)
+    student_codes, student_uniques = pd.factorize(merged["StudentID"])
+    prog_codes, prog_uniques = pd.factorize(merged["Program"], sort=True)
+    n_courses, n_students, n_progs = len(course_uniques), len(student_uniques), len(prog_uniques)
 
     # Counts
-    total_counts = merged.groupby("CourseCode")["StudentID"].nunique().rename("TotalStudents").reset_index()
-    by_prog = merged.groupby(["CourseCode", "Program"])["StudentID"].nunique().reset_index()
-    pivot = by_prog.pivot(index="CourseCode", columns="Program", values="StudentID").fillna(0).astype(int).reset_index()
+    total_students = _distinct_student_counts(course_codes, n_courses, student_codes, n_students)
+    course_prog = course_codes.astype(np.int64) * n_progs + prog_codes
+    prog_counts = _distinct_student_counts(course_prog, n_courses * n_progs, student_codes, n_students)
 
     # Resolved fields per course (pick the most common non-empty name/group if multiple)
-    def mode_nonempty(s):
-        s2 = [x for x in s.astype(str).tolist() if str(x).strip() != "" and str(x).lower() not in ("nan", "none")]
-        if not s2:
-            return ""
-        return pd.Series(s2).mode().iloc[0]
-
-    fields = merged.groupby("CourseCode").agg(
-        ResolvedCourseName=("CourseName", mode_nonempty),
-        ResolvedExamGroup=("ExamGroup", mode_nonempty),
-        DurationMin=("DurationMin", "max"),
-    ).reset_index()
-
-    report = fields.merge(total_counts, on="CourseCode", how="left").merge(pivot, on="CourseCode", how="left")
-    report["TotalStudents"] = report["TotalStudents"].fillna(0).astype(int)
+    duration = np.zeros(n_courses, dtype=np.int64)
+    np.maximum.at(duration, course_codes, merged["DurationMin"].to_numpy(dtype=np.int64))
+
+    report = pd.DataFrame({
+        "CourseCode": np.asarray(course_uniques, dtype=object),
+        "ResolvedCourseName": _mode_nonempty_by_code(course_codes, n_courses, merged["CourseName"]),
+        "ResolvedExamGroup": _mode_nonempty_by_code(course_codes, n_courses, merged["ExamGroup"]),
+        "DurationMin": duration,
+        "TotalStudents": total_students,
+    })
+
+    program_counts_df = None
+    if program_counts == "wide":
+        wide = pd.DataFrame(prog_counts.reshape(n_courses, n_progs), columns=list(prog_uniques))
+        report = pd.concat([report, wide], axis=1)
+    else:
+        nz = np.flatnonzero(prog_counts)
+        program_counts_df = pd.DataFrame({
+            "CourseCode": np.asarray(course_uniques, dtype=object)[nz // n_progs],
+            "Program": np.asarray(prog_uniques, dtype=object)[nz % n_progs],
+            "Students": prog_counts[nz],
+        })
 
     # Flags
     report["NOT_TITLED"] = report["ResolvedCourseName"].astype(str).str.strip().eq("")
@@ -523,96 +669,120 @@ def generate_courses_report(regs_path: str, courses_master_path: str) -> Tuple["
     report = report.sort_values(["TotalStudents", "CourseCode"], ascending=[False, True]).reset_index(drop=True)
     issues = issues.sort_values(["MISSING_IN_MASTER", "NOT_GROUPED", "NOT_TITLED", "TotalStudents"], ascending=[False, False, False, False]).reset_index(drop=True)
 
+    if program_counts_df is not None:
+        return report, issues, program_counts_df
     return report, issues
 
 
-def save_courses_report_excel(report_df: "pd.DataFrame", issues_df: "pd.DataFrame", output_path: str):
+def save_courses_report_excel(
+    report_df: "pd.DataFrame",
+    issues_df: "pd.DataFrame",
+    output_path: str,
+    program_counts_df: Optional["pd.DataFrame"] = None,
+):
     """
     Saves a Courses Report Excel and highlights problematic rows.
+    program_counts_df (long per-program counts) is written as a ProgramCounts sheet when given.
+    Highlighting is written as conditional formatting in the same pass:
+      - MISSING_IN_MASTER            -> light red
+      - NOT_TITLED or NOT_GROUPED    -> light yellow
     """
     require_pandas()
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        report_df.to_excel(writer, index=False, sheet_name="CoursesReport")
-        issues_df.to_excel(writer, index=False, sheet_name="Issues")
-
-    # Highlight using openpyxl
-    try:
-        from openpyxl import load_workbook
-        from openpyxl.styles import PatternFill
-
-        wb = load_workbook(output_path)
-        ws = wb["CoursesReport"]
-
-        # Find flag columns
-        headers = [c.value for c in ws[1]]
-        def col_idx(name: str) -> Optional[int]:
-            try:
-                return headers.index(name) + 1
-            except ValueError:
-                return None
-
-        c_not_titled = col_idx("NOT_TITLED")
-        c_not_grouped = col_idx("NOT_GROUPED")
-        c_missing = col_idx("MISSING_IN_MASTER")
-
-        fill_warn = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")  # light yellow
-        fill_bad = PatternFill(start_color="F8CBAD", end_color="F8CBAD", fill_type="solid")   # light red
-
-        for r in range(2, ws.max_row + 1):
-            nt = bool(ws.cell(r, c_not_titled).value) if c_not_titled else False
-            ng = bool(ws.cell(r, c_not_grouped).value) if c_not_grouped else False
-            ms = bool(ws.cell(r, c_missing).value) if c_missing else False
-
-            if ms:
-                for c in range(1, ws.max_column + 1):
-                    ws.cell(r, c).fill = fill_bad
-            elif nt or ng:
-                for c in range(1, ws.max_column + 1):
-                    ws.cell(r, c).fill = fill_warn
-
-        wb.save(output_path)
-    except Exception:
-        # If highlighting fails, keep the Excel content at least
-        pass
+    row_fills = [
+        (["MISSING_IN_MASTER"], "#F8CBAD"),             # light red
+        (["NOT_TITLED", "NOT_GROUPED"], "#FFF2CC"),     # light yellow
+    ]
+    with StreamingExcelWriter(output_path) as writer:
+        writer.write_dataframe(report_df, "CoursesReport", row_fills=row_fills)
+        writer.write_dataframe(issues_df, "Issues")
+        if program_counts_df is not None:
+            writer.write_dataframe(program_counts_df, "ProgramCounts")
 
 
 # ----------------------------- Main Scheduler -----------------------------
 
-def run_final_exam_scheduler(
-    regs_path: str,
-    courses_master_path: str,
-    calendar_path: str,
-    slot_capacity_path: str,
-    constraints_path: str,
-    output_path: str = "Final_Exam_Schedule.xlsx",
-    rest_days: int = 1,
-    time_limit_sec: int = 40,
-    workers: int = 8,
-    diagnostics_only: bool = False,
-):
-    """
-    If diagnostics_only=True:
-      - DO NOT import OR-Tools
-      - DO NOT build model
-      - DO NOT solve
-      Return (DiagnosticsDict, DiagnosticsDataFrames)
+@dataclass
+class ExamScheduleResult:
+    """In-memory result of solve_exam_schedule (nothing written to disk)."""
+    master_df: "pd.DataFrame"
+    program_sheets: Dict[str, "pd.DataFrame"]
+    capacity_report_df: "pd.DataFrame"
+    rest_violations_df: "pd.DataFrame"
+    summary_df: "pd.DataFrame"
 
-    If diagnostics_only=False:
-      Solve and write output excel.
-      Return (master_df, program_sheets, cap_report_df, rest_viol_df, summary_df)
+    def as_tuple(self):
+        """(master_df, program_sheets, cap_report_df, rest_viol_df, summary_df) as returned by run_final_exam_scheduler."""
+        return (self.master_df, self.program_sheets, self.capacity_report_df,
+                self.rest_violations_df, self.summary_df)
+
+
+def compute_diagnostics(inputs: ExamInputs) -> Tuple[Dict[str, Any], Dict[str, "pd.DataFrame"]]:
+    """
+    Diagnostics on loaded inputs: no OR-Tools, no model, no files.
+    Never raises for missing course codes; they are reported instead.
+    Returns (DiagnosticsDict, DiagnosticsDataFrames).
     """
     require_pandas()
-
-    regs_df, courses_df, cal_df, cap_df, fixed_df, balance_df, terminated_courses = _load_inputs(
-        regs_path, courses_master_path, calendar_path, slot_capacity_path, constraints_path
+    diag_res = _compute_diagnostics(
+        inputs.regs_df, inputs.courses_df, inputs.cal_df, inputs.cap_df,
+        inputs.fixed_df, inputs.enroll_df, inputs.missing_df,
     )
-    enroll_df, missing_df = _build_enrollments(regs_df, courses_df, terminated_courses)
+    return diag_res.diag, diag_res.dfs
 
-    diag_res = _compute_diagnostics(regs_df, courses_df, cal_df, cap_df, fixed_df, enroll_df, missing_df)
 
-    # In diagnostics mode: do NOT raise; just return diagnostics even if missing exists
-    if diagnostics_only:
-        return diag_res.diag, diag_res.dfs
+def solve_exam_schedule(
+    inputs: ExamInputs,
+    rest_days: int = 1,
+    time_limit_sec: Optional[float] = None,
+    workers: Optional[int] = None,
+    explain: bool = False,
+    break_symmetries: bool = True,
+    merge_identical: bool = True,
+    presolve: bool = True,
+    history_path: Optional[str] = None,
+    early_stop: Optional[StopCriteria] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> ExamScheduleResult:
+    """
+    Build and solve the CP-SAT exam model on loaded inputs (see prepare_exam_inputs /
+    load_exam_inputs) and return the result DataFrames without touching disk.
+    Use save_schedule_excel to write them.
+
+    explain=True guards the fixed assignments (per group) and the student clash
+    constraints (per distinct exam set) with assumption literals. If no schedule
+    exists, the raised InfeasibleModelError then carries the conflicting
+    constraints in .conflicts and lists them in its message. Pre-check errors
+    are then printed instead of raised.
+
+    break_symmetries=True orders interchangeable exam groups and identical slots
+    (see business/exam_scheduling/symmetry.py); it only removes equivalent
+    permutations of a schedule, never better ones.
+
+    merge_identical=True models exam groups with exactly the same students and
+    duration (and no fixed slot) as one node taking k slots, then expands the
+    result back to one MasterSchedule row per group.
+
+    presolve=True substitutes fixed groups as constants (their slots are removed
+    from the groups they clash with) and hints the groups sharing no student
+    with another group with a greedy placement around them, scored with the
+    same capacity/spread weights. Both keep the model exact: the hinted groups
+    stay variables, and the status and objective cover the whole schedule.
+
+    time_limit_sec / workers left as None are chosen from the model size and
+    the cores available to this process (see business/solver/tuning.py).
+    history_path: optional JSON file of past runs; similar earlier runs then
+    shorten or stretch the automatic time limit, and this run is appended.
+    early_stop: when to stop before the time limit (gap / no improvement);
+    None stops once the objective stagnates, StopCriteria() runs to the limit.
+    progress: called with SolverProgress (business/solver/progress.py) at each
+    stage and for every solution found, from the solver's threads.
+    """
+    require_pandas()
+    progress = as_reporter(progress)
+
+    cal_df, cap_df = inputs.cal_df, inputs.cap_df
+    fixed_df, balance_df = inputs.fixed_df, inputs.balance_df
+    enroll_df, missing_df = inputs.enroll_df, inputs.missing_df
 
     # In solve mode: missing course codes is a hard stop
     if missing_df is not None and not missing_df.empty:
@@ -627,6 +797,9 @@ def run_final_exam_scheduler(
               "- Make sure ExamGroup is set."
         )
 
+    if cal_df.empty:
+        raise ValueError("exam_calendar.xlsx (Calendar) is required to build a schedule.")
+
     # OR-Tools import only here
     try:
         from ortools.sat.python import cp_model
@@ -638,6 +811,7 @@ def run_final_exam_scheduler(
         )
 
     # ---------------- Build CP-SAT model ----------------
+    progress.stage("Building exam model")
     examgroups = sorted([g for g in enroll_df["ExamGroup"].unique().tolist() if str(g).strip() != ""])
     programs = sorted(enroll_df["Program"].unique().tolist())
 
@@ -665,10 +839,12 @@ def run_final_exam_scheduler(
     g_coursecodes = enroll_df.groupby("ExamGroup")["CourseCode"].apply(lambda s: ", ".join(sorted(set(map(str, s))))).to_dict()
     g_coursenames = enroll_df.groupby("ExamGroup")["CourseName"].apply(lambda s: ", ".join(sorted(set(map(str, s))))).to_dict()
 
+    # groups with the same duration share one cached slot tuple
+    dur_index = SlotDurationIndex(slot_dur)
     feasible_slots_for_g = {}
     for g in examgroups:
         dur = int(g_duration.get(g, 120))
-        feasible = [t for t in range(T) if int(slot_dur[t]) >= dur]
+        feasible = dur_index.slots_for(dur)
         if not feasible:
             raise ValueError(
                 f"ExamGroup '{g}' duration {dur} min cannot fit in any slot.\n"
@@ -692,10 +868,27 @@ def run_final_exam_scheduler(
             if sk not in sk_to_t:
                 raise ValueError(f"FixedAssignments: slot not found in calendar: {sk}")
             tfix = sk_to_t[sk]
-            if tfix not in feasible_slots_for_g[eg]:
+            if not dur_index.fits(tfix, g_duration.get(eg, 120)):
                 raise ValueError(f"FixedAssignments: slot duration too short for ExamGroup: {eg}")
             fixed_map[eg] = tfix
 
+    # Fail fast on instances that cannot be feasible, before building the model
+    precheck_df = check_exam_feasibility(
+        student_groups, {g: int(g_duration.get(g, 120)) for g in examgroups}, g_students,
+        slot_dur, capacities, fixed_map, slot_labels=slot_keys,
+        slot_intervals=list(zip(slot_date, slot_start, slot_end)),
+    )
+    if (precheck_df["Severity"] == "ERROR").any():
+        message = (
+            "The schedule cannot be feasible; pre-checks found:\n\n"
+            + precheck_errors_message(precheck_df)
+            + "\n\nFix: add or lengthen slots, or change FixedAssignments / ExamGroups."
+        )
+        if not explain:
+            raise ValueError(message)
+        # explain mode goes on to the solver for its conflict set
+        print(message)
+
     # Weights
     w_capacity, w_rest, w_spread = 50, 30, 5
     if balance_df is not None and not balance_df.empty:
@@ -705,33 +898,111 @@ def run_final_exam_scheduler(
         w_spread = int(row0.get("WeightSpread", w_spread))
 
     model = cp_model.CpModel()
+    guards = AssumptionGuards(model) if explain else None
+
+    # Exam groups with exactly the same students (and duration) are one node that takes
+    # k distinct slots; the node is keyed by its first member, so x keys stay group names
+    node_members = {g: [g] for g in examgroups}
+    if merge_identical:
+        for members in mergeable_groups(group_student_sets(enroll_df), g_duration, fixed_map):
+            node_members[members[0]] = members
+            for g in members[1:]:
+                del node_members[g]
+    nodes = [g for g in examgroups if g in node_members]
+    node_of = {g: n for n, members in node_members.items() for g in members}
+
+    # slot -> slots that clash with it (itself + same-day time overlaps)
+    slot_cliques = overlap_cliques(list(zip(slot_date, slot_start, slot_end)))
+    clashing_slots = {t: {t} for t in range(T)}
+    for clique in slot_cliques:
+        for t in clique:
+            clashing_slots[t].update(clique)
+
+    # Presolve: fixed groups become constants (kept as variables in explain mode so
+    # they can be reported), conflict-free groups get a greedy hint before the solve
+    constant_slots, free_groups = {}, []
+    if presolve:
+        constant_slots, free_groups = split_trivial_groups(nodes, student_groups, fixed_map, keep_fixed=explain)
+        nodes = [n for n in nodes if n not in constant_slots]
+    blocked = slots_blocked_by_constants(student_groups, constant_slots, clashing_slots, node_of)
+    node_slots = {}
+    for n in nodes:
+        node_slots[n] = [t for t in feasible_slots_for_g[n] if t not in blocked.get(n, ())]
+        if len(node_slots[n]) < len(node_members[n]):
+            raise ValueError(
+                f"ExamGroup(s) {', '.join(node_members[n])}: not enough slots left; the long-enough "
+                "slots clash with fixed exams of the same students.\n"
+                "Fix: change FixedAssignments or add slots."
+            )
 
     x = {}
-    for g in examgroups:
-        for t in feasible_slots_for_g[g]:
-            x[(g, t)] = model.NewBoolVar(f"x_{g}_{t}")
+    for n in nodes:
+        for t in node_slots[n]:
+            x[(n, t)] = model.NewBoolVar(f"x_{n}_{t}")
 
-    for g in examgroups:
-        model.Add(sum(x[(g, t)] for t in feasible_slots_for_g[g]) == 1)
+    for n in nodes:
+        model.Add(sum(x[(n, t)] for t in node_slots[n]) == len(node_members[n]))
 
     for g, tfix in fixed_map.items():
-        model.Add(x[(g, tfix)] == 1)
-
-    # day vars
-    day_var = {}
-    for g in examgroups:
-        dv = model.NewIntVar(0, D - 1, f"day_{g}")
-        model.Add(dv == sum(int(slot_day[t]) * x[(g, t)] for t in feasible_slots_for_g[g]))
-        day_var[g] = dv
-
-    # Hard: no 2 exams same slot per student
-    for sid, glist in student_groups.items():
-        if len(glist) < 2:
+        if g in constant_slots:
             continue
-        for t in range(T):
-            terms = [x[(g, t)] for g in glist if (g, t) in x]
+        ct = model.Add(x[(g, tfix)] == 1)
+        if guards is not None:
+            ct.OnlyEnforceIf(guards.guard("FixedAssignment", g, f"fixed to {slot_keys[tfix]}"))
+
+    # day vars (per exam group; members of a merged node are numbered in day order)
+    day_var = {g: int(slot_day[t]) for g, t in constant_slots.items()}
+    for n in nodes:
+        members = node_members[n]
+        if len(members) == 1:
+            dv = model.NewIntVar(0, D - 1, f"day_{n}")
+            model.Add(dv == sum(int(slot_day[t]) * x[(n, t)] for t in node_slots[n]))
+            day_var[n] = dv
+            continue
+        # e[i][d]: the i-th member sits on day d; per day, as many members as node slots used
+        e = [[model.NewBoolVar(f"e_{n}_{i}_{d}") for d in range(D)] for i in range(len(members))]
+        for i, g in enumerate(members):
+            model.AddExactlyOne(e[i])
+            day_var[g] = model.NewIntVar(0, D - 1, f"day_{g}")
+            model.Add(day_var[g] == sum(d * e[i][d] for d in range(D)))
+        for d in range(D):
+            model.Add(
+                sum(e[i][d] for i in range(len(members)))
+                == sum(x[(n, t)] for t in node_slots[n] if slot_day[t] == d)
+            )
+        for a, b in zip(members, members[1:]):
+            model.Add(day_var[a] <= day_var[b])
+
+    # Hard: no 2 exams same slot per student, where "same slot" is any group of slots
+    # overlapping in time on one day (a singleton when nothing overlaps it).
+    # Students with the same exam set need the same constraints, so add them once per set.
+    # Constant groups are already handled by dropping the slots they block.
+    signature_students = {}
+    for glist in student_groups.values():
+        if len(glist) >= 2:
+            sig = tuple(sorted({node_of[g] for g in glist if g not in constant_slots}))
+            signature_students[sig] = signature_students.get(sig, 0) + 1
+    # a merged node never puts two of its members in clashing slots
+    for n in nodes:
+        if len(node_members[n]) >= 2:
+            signature_students.setdefault((n,), 0)
+    # an exam set nested in another one only repeats part of its cliques: add it
+    # through the superset (explain mode keeps every set, each has its own guard)
+    if guards is None:
+        for inner, _ in strict_subsets({sig: sig for sig in signature_students}):
+            signature_students.pop(inner, None)
+    for sig, n_sig in sorted(signature_students.items()):
+        if not sig:
+            continue
+        lit = None
+        if guards is not None:
+            lit = guards.guard("StudentClash", ", ".join(map(str, sig)), f"{n_sig} student(s) sit all of these exams")
+        for clique in slot_cliques:
+            terms = [x[(n, t)] for n in sig for t in clique if (n, t) in x]
             if len(terms) >= 2:
-                model.Add(sum(terms) <= 1)
+                ct = model.Add(sum(terms) <= 1)
+                if lit is not None:
+                    ct.OnlyEnforceIf(lit)
 
     # Soft: rest day violations (gap >= rest_days+1 desired)
     rest_violations = []
@@ -753,19 +1024,20 @@ def run_final_exam_scheduler(
                 rest_violations.append(viol)
 
     # Soft: capacity overage
-    used_students_slot = []
+    constant_used = [0] * T
+    for g, t in constant_slots.items():
+        constant_used[t] += int(g_students[g])
     over_vars = []
     for t in range(T):
         used = model.NewIntVar(0, 10**9, f"used_{t}")
-        terms = [int(g_students[g]) * x[(g, t)] for g in examgroups if (g, t) in x]
-        model.Add(used == (sum(terms) if terms else 0))
+        terms = [int(g_students[n]) * x[(n, t)] for n in nodes if (n, t) in x]
+        model.Add(used == sum(terms) + constant_used[t])
 
         cap = int(capacities[t])
         over = model.NewIntVar(0, 10**9, f"over_{t}")
         model.Add(over >= used - cap)
         model.Add(over >= 0)
 
-        used_students_slot.append(used)
         over_vars.append(over)
 
     # Soft: balance across days
@@ -773,13 +1045,15 @@ def run_final_exam_scheduler(
     for d in range(D):
         load = model.NewIntVar(0, 10**9, f"dayload_{d}")
         terms = []
+        constant_load = 0
         for t in range(T):
             if int(slot_day[t]) != d:
                 continue
-            for g in examgroups:
-                if (g, t) in x:
-                    terms.append(int(g_students[g]) * x[(g, t)])
-        model.Add(load == (sum(terms) if terms else 0))
+            constant_load += constant_used[t]
+            for n in nodes:
+                if (n, t) in x:
+                    terms.append(int(g_students[n]) * x[(n, t)])
+        model.Add(load == sum(terms) + constant_load)
         day_load.append(load)
 
     max_load = model.NewIntVar(0, 10**9, "max_dayload")
@@ -797,33 +1071,90 @@ def run_final_exam_scheduler(
     obj.append(w_spread * spread)
     model.Minimize(sum(obj))
 
+    group_classes = []
+    if break_symmetries:
+        group_classes = interchangeable_group_classes(
+            [n for n in nodes if len(node_members[n]) == 1], student_groups, g_students, g_duration,
+            fixed_map, group_slots=node_slots,
+        )
+        add_symmetry_breaking(
+            model, x, nodes, node_slots, group_classes,
+            identical_slot_classes(slot_day, slot_start, slot_end, capacities, slot_cliques, set(fixed_map.values())),
+        )
+
+    # Presolve hint: conflict-free groups placed around the constants, taking their
+    # slots in class order so the group ordering above accepts it
+    if free_groups:
+        hinted = place_free_groups(
+            free_groups, node_slots, g_students, list(constant_used), capacities, slot_day, D,
+            w_capacity=w_capacity, w_spread=w_spread,
+        )
+        for cls in group_classes:
+            members = [g for g in cls if g in hinted]
+            for g, t in zip(members, sorted(hinted[g] for g in members)):
+                hinted[g] = t
+        for g, t_hint in hinted.items():
+            for t in node_slots[g]:
+                model.AddHint(x[(g, t)], int(t == t_hint))
+
+    if guards is not None:
+        guards.activate()
+
     # ---------------- Solve ----------------
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = float(time_limit_sec)
-    solver.parameters.num_search_workers = int(workers)
+    size = model_size(model)
+    settings = choose_solver_settings(
+        "exam", size, time_limit_sec=time_limit_sec, workers=workers,
+        early_stop=early_stop, history_path=history_path,
+    )
+    solver = settings.apply(cp_model.CpSolver())
 
-    status = solver.Solve(model)
+    progress.stage("Solving exam model", settings.time_limit_sec, size)
+    status, stop_reason = solve_with_early_stop(solver, model, settings.stop, progress)
     status_name = solver.StatusName(status)
+    record_solver_run(
+        history_path, "exam", size, settings, status_name, solver.WallTime(),
+        solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None,
+        stop_reason=stop_reason,
+    )
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        raise RuntimeError(
-            f"No feasible solution. Status={status_name}\n\n"
-            "Try:\n"
-            "- Add more days/slots\n"
-            "- Increase capacities\n"
-            "- Reduce fixed constraints\n"
-            "- Add longer slots for long exams"
-        )
-
-    # assignment
-    assign = {}
-    for g in examgroups:
-        chosen = None
-        for t in feasible_slots_for_g[g]:
-            if solver.Value(x[(g, t)]) == 1:
-                chosen = t
-                break
-        assign[g] = chosen if chosen is not None else feasible_slots_for_g[g][0]
+        # only a proven infeasible model has a conflict set to extract
+        conflicts = []
+        if guards is not None and status == cp_model.INFEASIBLE:
+            conflicts = guards.explain(settings.time_limit_sec)
+        if status == cp_model.UNKNOWN:
+            message = (
+                f"The time limit ({settings.time_limit_sec:g}s) ran out before any schedule was found. "
+                f"Status={status_name}\n\n"
+                "Try:\n"
+                "- Increase time_limit_sec\n"
+                "- Give the solver more workers (or leave workers=None)"
+            )
+        else:
+            message = (
+                f"No feasible solution. Status={status_name}\n\n"
+                "Try:\n"
+                "- Add more days/slots\n"
+                "- Increase capacities\n"
+                "- Reduce fixed constraints\n"
+                "- Add longer slots for long exams"
+            )
+        if conflicts:
+            message += "\n\nThese constraints cannot all hold together:\n" + format_conflicts(conflicts)
+        elif guards is None and status == cp_model.INFEASIBLE:
+            message += "\n\nRun again with explain=True to list the conflicting constraints."
+        raise InfeasibleModelError(message, conflicts, status=status_name)
+
+    # assignment (members of a merged node take its slots in day order, matching day_var)
+    assign = dict(constant_slots)
+    for n in nodes:
+        chosen = [t for t in node_slots[n] if solver.Value(x[(n, t)]) == 1]
+        for i, g in enumerate(node_members[n]):
+            assign[g] = chosen[i] if i < len(chosen) else node_slots[n][0]
+
+    used_final = [0] * T
+    for g, t in assign.items():
+        used_final[t] += int(g_students[g])
 
     # MasterSchedule
     master_rows = []
@@ -846,7 +1177,7 @@ def run_final_exam_scheduler(
     # CapacityReport
     cap_rows = []
     for t in range(T):
-        used = int(solver.Value(used_students_slot[t]))
+        used = int(used_final[t])
         cap = int(capacities[t])
         over = max(0, used - cap) if cap < 10**9 else 0
         cap_rows.append({
@@ -913,20 +1244,94 @@ def run_final_exam_scheduler(
         "WeightSpread": int(w_spread),
         "SlotsOverCapacity": int((cap_report_df["Over"] > 0).sum()) if not cap_report_df.empty else 0,
         "RestViolationsPairs": int(len(rest_viol_df)) if not rest_viol_df.empty else 0,
+        "PresolvedExamGroups": int(len(constant_slots)),
+        "HintedExamGroups": int(len(free_groups)),
+        "SolverWorkers": int(settings.workers),
+        "SolverTimeLimitSec": float(settings.time_limit_sec),
+        "SolverWallTimeSec": round(float(solver.WallTime()), 2),
+        "SolverStopReason": stop_reason or "",
     }
     summary_df = pd.DataFrame([summary])
 
-    # Save output
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        master_df.to_excel(writer, index=False, sheet_name="MasterSchedule")
-        cap_report_df.to_excel(writer, index=False, sheet_name="CapacityReport")
-        summary_df.to_excel(writer, index=False, sheet_name="Summary")
+    return ExamScheduleResult(
+        master_df=master_df,
+        program_sheets=prog_sheets,
+        capacity_report_df=cap_report_df,
+        rest_violations_df=rest_viol_df,
+        summary_df=summary_df,
+    )
+
 
+def save_schedule_excel(result: ExamScheduleResult, output_path: str):
+    """Write a schedule result to Excel (streamed sheet by sheet, rows flushed as written)."""
+    require_pandas()
+    with StreamingExcelWriter(output_path) as writer:
+        writer.write_dataframe(result.master_df, "MasterSchedule")
+        writer.write_dataframe(result.capacity_report_df, "CapacityReport")
+        writer.write_dataframe(result.summary_df, "Summary")
+
+        rest_viol_df = result.rest_violations_df
         if rest_viol_df is not None and not rest_viol_df.empty:
-            rest_viol_df.to_excel(writer, index=False, sheet_name="StudentRestViolations")
+            writer.write_dataframe(rest_viol_df, "StudentRestViolations")
 
-        for prog, dfp in prog_sheets.items():
-            dfp.to_excel(writer, index=False, sheet_name=safe_sheet_name(f"Program_{prog}"))
+        for prog, dfp in result.program_sheets.items():
+            writer.write_dataframe(dfp, safe_sheet_name(f"Program_{prog}"))
 
-    return master_df, prog_sheets, cap_report_df, rest_viol_df, summary_df
 
+def run_final_exam_scheduler(
+    regs_path: Optional[str] = None,
+    courses_master_path: Optional[str] = None,
+    calendar_path: Optional[str] = None,
+    slot_capacity_path: Optional[str] = None,
+    constraints_path: Optional[str] = None,
+    output_path: Optional[str] = "Final_Exam_Schedule.xlsx",
+    rest_days: int = 1,
+    time_limit_sec: Optional[float] = None,
+    workers: Optional[int] = None,
+    diagnostics_only: bool = False,
+    inputs: Optional[ExamInputs] = None,
+    explain: bool = False,
+    history_path: Optional[str] = None,
+    early_stop: Optional[StopCriteria] = None,
+    progress: Optional[ProgressCallback] = None,
+):
+    """
+    File-based wrapper around compute_diagnostics / solve_exam_schedule.
+    Pass either the input file paths or an already loaded ExamInputs
+    (see load_exam_inputs / prepare_exam_inputs); the latter skips reading and expanding again.
+
+    If diagnostics_only=True:
+      - DO NOT import OR-Tools
+      - DO NOT build model
+      - DO NOT solve
+      Return (DiagnosticsDict, DiagnosticsDataFrames)
+
+    If diagnostics_only=False:
+      Solve and write output excel (skipped when output_path is None).
+      Return (master_df, program_sheets, cap_report_df, rest_viol_df, summary_df)
+      explain=True: on infeasibility, report the conflicting constraints (see solve_exam_schedule).
+      time_limit_sec / workers: None picks them automatically; history_path feeds that choice.
+      early_stop: stop criteria before the time limit (see solve_exam_schedule).
+      progress: SolverProgress callback (see solve_exam_schedule).
+    """
+    require_pandas()
+    progress = as_reporter(progress)
+
+    if inputs is None:
+        progress.stage("Loading exam inputs")
+        inputs = load_exam_inputs(
+            regs_path, courses_master_path, calendar_path, slot_capacity_path, constraints_path
+        )
+
+    # In diagnostics mode: do NOT raise; just return diagnostics even if missing exists
+    if diagnostics_only:
+        return compute_diagnostics(inputs)
+
+    result = solve_exam_schedule(
+        inputs, rest_days=rest_days, time_limit_sec=time_limit_sec, workers=workers, explain=explain,
+        history_path=history_path, early_stop=early_stop, progress=progress,
+    )
+    if output_path:
+        progress.stage("Saving Excel")
+        save_schedule_excel(result, output_path)
+    return result.as_tuple()
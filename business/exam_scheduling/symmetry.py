@@ -0,0 +1,136 @@
+"""
+Business Layer - Exam Model Symmetry Breaking
+Detects interchangeable exam groups / identical slots and orders them
+"""
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+
+def interchangeable_group_classes(
+    examgroups: Sequence[str],
+    student_groups: Dict[str, Sequence[str]],
+    group_students: Dict[str, int],
+    group_duration: Dict[str, int],
+    fixed_groups,
+    group_slots: Optional[Dict[str, Sequence[int]]] = None,
+) -> List[List[str]]:
+    """
+    Exam groups the model cannot tell apart: same size and duration (and the
+    same allowed slots, if group_slots is given), and swapping any two of them
+    maps the students' exam sets onto themselves (e.g. two electives, each
+    taken by the same number of students next to the same core exams). Every
+    clash, rest-day and capacity term then sees them the same way, so any
+    permutation of their slots is an equivalent schedule. Groups sharing no
+    student with any other group are the simplest case; symmetric groups
+    inside one clash neighbourhood are the ones that are hard to spot.
+
+    A class holds the groups that swap with its first member (the swaps then
+    generate every permutation). Fixed groups are left out. Classes keep the
+    examgroups order.
+    """
+    set_count = Counter(frozenset(gl) for gl in student_groups.values() if len(gl))
+    sets_of: Dict[str, List[frozenset]] = {}
+    for sig in set_count:
+        for g in sig:
+            sets_of.setdefault(g, []).append(sig)
+
+    def swaps(g, h):
+        for sig in set(sets_of.get(g, ())) | set(sets_of.get(h, ())):
+            if (g in sig) != (h in sig):
+                swapped = (sig - {g, h}) | ({h} if g in sig else {g})
+                if set_count.get(swapped, 0) != set_count[sig]:
+                    return False
+        return True
+
+    buckets: Dict[tuple, List[List[str]]] = {}
+    for g in examgroups:
+        if g in fixed_groups:
+            continue
+        key = (
+            int(group_students.get(g, 0)),
+            int(group_duration.get(g, 120)),
+            tuple(group_slots[g]) if group_slots is not None else None,
+            tuple(sorted((len(sig), set_count[sig]) for sig in sets_of.get(g, ()))),
+        )
+        classes = buckets.setdefault(key, [])
+        for cls in classes:
+            if swaps(cls[0], g):
+                cls.append(g)
+                break
+        else:
+            classes.append([g])
+    position = {g: k for k, g in enumerate(examgroups)}
+    found = [c for classes in buckets.values() for c in classes if len(c) >= 2]
+    return sorted(found, key=lambda c: position[c[0]])
+
+
+def identical_slot_classes(
+    slot_day: Sequence[int],
+    slot_start: Sequence[int],
+    slot_end: Sequence[int],
+    capacities: Sequence[int],
+    slot_cliques: Sequence[Sequence[int]],
+    fixed_targets,
+) -> List[List[int]]:
+    """
+    Slots the model cannot tell apart: same day, duration and capacity, and the
+    same clash cliques (either overlapping nothing, or with identical start/end).
+    A typical calendar has several such slots per day (Morning/Afternoon with
+    equal length and capacity). Slots used by fixed assignments are left out.
+    """
+    overlapping = {t for c in slot_cliques if len(c) >= 2 for t in c}
+
+    classes: Dict[tuple, List[int]] = {}
+    for t in range(len(slot_day)):
+        if t in fixed_targets:
+            continue
+        dur = int(slot_end[t]) - int(slot_start[t])
+        clash_key = (int(slot_start[t]), int(slot_end[t])) if t in overlapping else None
+        key = (int(slot_day[t]), dur, int(capacities[t]), clash_key)
+        classes.setdefault(key, []).append(t)
+    return [c for c in classes.values() if len(c) >= 2]
+
+
+def add_symmetry_breaking(model, x, examgroups, feasible_slots_for_g, group_classes, slot_classes) -> int:
+    """
+    Add ordering constraints for the given classes; returns how many were added.
+
+    Interchangeable groups: slot index non-decreasing along the class
+    (sum_t t * x[g, t] <= sum_t t * x[g', t]).
+
+    Identical slots t1 < t2 < ...: value precedence in examgroups order, i.e. a
+    group may take t(k+1) only if it or an earlier group took t(k). Prefix
+    "used so far" booleans keep this linear in the number of groups.
+
+    Both use the same group order, which keeps them compatible: every schedule
+    can be permuted into one that satisfies all of them.
+    """
+    added = 0
+
+    for cls in group_classes:
+        slot_index = [sum(t * x[(g, t)] for t in feasible_slots_for_g[g]) for g in cls]
+        for a, b in zip(slot_index, slot_index[1:]):
+            model.Add(a <= b)
+            added += 1
+
+    for cls in slot_classes:
+        users = [g for g in examgroups if (g, cls[0]) in x]
+        if len(users) < 2:
+            continue
+        for t_prev, t_next in zip(cls, cls[1:]):
+            # used: some node up to and including this one took t_prev (a merged
+            # node taking several slots may open both itself)
+            used = None
+            for i, g in enumerate(users):
+                took = x[(g, t_prev)]
+                if used is None:
+                    used = took
+                else:
+                    nxt = model.NewBoolVar(f"symused_{t_prev}_{i}")
+                    model.AddBoolOr([used, took]).OnlyEnforceIf(nxt)
+                    model.AddImplication(used, nxt)
+                    model.AddImplication(took, nxt)
+                    used = nxt
+                model.AddImplication(x[(g, t_next)], used)
+                added += 1
+    return added
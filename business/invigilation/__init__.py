@@ -2,8 +2,27 @@
 Business Layer - Invigilation Scheduling Package
 Exports the main invigilation scheduling function
 """
-from business.invigilation.scheduler import run_optimization
+from business.invigilation.scheduler import (
+    run_optimization,
+    InvigilationInputs,
+    prepare_invigilation_inputs,
+    load_invigilation_inputs,
+    parse_engagements,
+    schedule_frames,
+)
+from business.invigilation.availability import EngagementIndex
+from business.invigilation.flow_engine import flow_assignment
+from business.invigilation.repair import repair_invigilation, apply_availability_changes
 
 __all__ = [
     'run_optimization',
+    'InvigilationInputs',
+    'prepare_invigilation_inputs',
+    'load_invigilation_inputs',
+    'parse_engagements',
+    'schedule_frames',
+    'EngagementIndex',
+    'flow_assignment',
+    'repair_invigilation',
+    'apply_availability_changes',
 ]
@@ -0,0 +1,121 @@
+"""
+Business Layer - Invigilation Availability
+Interval index over staff engagements (Engagement = 1 rows)
+"""
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+# sessions x engagements cells compared per NumPy block in blocked_pairs
+_JOIN_BLOCK_CELLS = 4_000_000
+
+
+class EngagementIndex:
+    """
+    Busy intervals [start, end) in minutes, indexed two ways:
+
+      per (staff, date) - sorted starts with a running max of ends, so
+                          busy(staff, date, start, end) is one bisect
+      per date          - NumPy arrays for a vectorized join against many
+                          sessions at once (blocked_pairs)
+
+    Overlap follows the scheduler's rule: start < other_end and other_start < end.
+    """
+
+    def __init__(
+        self,
+        staff_ids: Sequence[str],
+        date_keys: Sequence[Hashable],
+        starts: Sequence[int],
+        ends: Sequence[int],
+    ):
+        staff = pd.Series(staff_ids, dtype=object).astype(str).to_numpy(dtype=object)
+        start = np.asarray(starts, dtype=np.int64)
+        end = np.asarray(ends, dtype=np.int64)
+        date_codes, date_names = pd.factorize(pd.Series(list(date_keys), dtype=object))
+        staff_codes, _ = pd.factorize(staff)
+        order = np.lexsort((start, staff_codes, date_codes))
+        staff, start, end = staff[order], start[order], end[order]
+        date_codes, staff_codes = date_codes[order], staff_codes[order]
+
+        self._by_date: Dict[Hashable, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        date_bounds = np.flatnonzero(np.diff(date_codes)) + 1
+        for lo, hi in zip(np.r_[0, date_bounds], np.r_[date_bounds, len(order)]):
+            if hi > lo:
+                self._by_date[date_names[date_codes[lo]]] = (staff[lo:hi], start[lo:hi], end[lo:hi])
+
+        # (staff, date) runs: sorted starts and the running max of their ends
+        self._by_staff_date: Dict[Tuple[str, Hashable], Tuple[List[int], List[int]]] = {}
+        key_bounds = np.flatnonzero(np.diff(date_codes) | np.diff(staff_codes)) + 1
+        start_list, end_list = start.tolist(), end.tolist()
+        for lo, hi in zip(np.r_[0, key_bounds].tolist(), np.r_[key_bounds, len(order)].tolist()):
+            if hi > lo:
+                key = (staff[lo], date_names[date_codes[lo]])
+                self._by_staff_date[key] = (start_list[lo:hi], list(accumulate(end_list[lo:hi], max)))
+        self.size = len(order)
+
+    @classmethod
+    def from_frame(cls, engage_df: "pd.DataFrame") -> "EngagementIndex":
+        """From rows with StaffID, DateKey, Start_min and End_min (already filtered to busy rows)."""
+        return cls(
+            engage_df["StaffID"], engage_df["DateKey"], engage_df["Start_min"], engage_df["End_min"]
+        )
+
+    def busy(self, staff_id: str, date_key: Hashable, start: int, end: int) -> bool:
+        """True if the staff member has an engagement overlapping [start, end) on that date."""
+        entry = self._by_staff_date.get((str(staff_id), date_key))
+        if entry is None:
+            return False
+        starts, max_end = entry
+        k = bisect_left(starts, end)  # engagements starting before `end`
+        return k > 0 and max_end[k - 1] > start
+
+    def staff_on(self, date_key: Hashable) -> Set[str]:
+        """Staff with at least one engagement on that date."""
+        entry = self._by_date.get(date_key)
+        return set() if entry is None else set(entry[0].tolist())
+
+    def blocked_pairs(
+        self,
+        session_ids: Sequence[Hashable],
+        date_keys: Sequence[Hashable],
+        starts: Sequence[int],
+        ends: Sequence[int],
+        staff_filter: Optional[Iterable[str]] = None,
+    ) -> Set[Tuple[str, Hashable]]:
+        """
+        (staff_id, session_id) pairs where the staff member is busy during the
+        session. One broadcast comparison per date (in blocks) instead of a
+        Python loop over every engagement for every session.
+        """
+        allowed = None if staff_filter is None else set(staff_filter)
+        sessions = pd.DataFrame({
+            "SessionID": list(session_ids),
+            "DateKey": list(date_keys),
+            "Start": np.asarray(starts, dtype=np.int64),
+            "End": np.asarray(ends, dtype=np.int64),
+        })
+
+        blocked: Set[Tuple[str, Hashable]] = set()
+        for date, part in sessions.groupby("DateKey", sort=False):
+            entry = self._by_date.get(date)
+            if entry is None:
+                continue
+            e_staff, e_start, e_end = entry
+            s_ids = part["SessionID"].to_numpy(dtype=object)
+            s_start = part["Start"].to_numpy()
+            s_end = part["End"].to_numpy()
+
+            step = max(1, _JOIN_BLOCK_CELLS // max(1, len(e_start)))
+            for lo in range(0, len(s_ids), step):
+                hit = (e_start[None, :] < s_end[lo:lo + step, None]) & (s_start[lo:lo + step, None] < e_end[None, :])
+                rows, cols = np.nonzero(hit)
+                pairs = zip(e_staff[cols].tolist(), s_ids[lo + rows].tolist())
+                if allowed is None:
+                    blocked.update(pairs)
+                else:
+                    blocked.update(p for p in pairs if p[0] in allowed)
+        return blocked
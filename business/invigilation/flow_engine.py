@@ -0,0 +1,125 @@
+"""
+Business Layer - Invigilation Flow Engine
+Polynomial min-cost-flow assignment of invigilators (no CP-SAT)
+"""
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from ortools.graph.python import min_cost_flow
+
+from business.invigilation.staff_classes import rebalance_loads
+from utils.interval_utils import overlap_blocks
+
+
+def flow_assignment(
+    session_ids: Sequence[Hashable],
+    staff_ids: Sequence[str],
+    inv_needed: Dict[Hashable, int],
+    duration: Dict[Hashable, int],
+    date_key: Dict[Hashable, Hashable],
+    start_min: Dict[Hashable, int],
+    end_min: Dict[Hashable, int],
+    blocked: Set[Tuple[str, Hashable]],
+    load_weight: Dict[str, int],
+    max_minutes: Dict[str, int],
+    max_rounds: int = 50,
+) -> Optional[Tuple[Dict[Hashable, List[str]], Dict[str, int]]]:
+    """
+    Assign invigilators with one min-cost flow:
+
+      source -> session (capacity InvigilatorsNeeded)
+             -> (staff, overlap block) (capacity 1: one session per block)
+             -> staff -> sink through unit arcs costing w, 2w, 3w, ...
+
+    The rising arc costs are a convex cost on each person's weighted session
+    count, so the optimum spreads sessions evenly. One session per block
+    never double-books anyone; it is exact for fixed exam periods and
+    conservative when sessions chain into longer blocks. MaxHours caps the
+    session count by the shortest session; anyone still over their minutes
+    loses the arc to their longest session and the flow is re-solved.
+    A final rebalance evens out the minutes (see rebalance_loads).
+
+    Returns (session -> staff, staff -> minutes), or None if the flow cannot
+    cover every session (then CP-SAT decides feasibility).
+    """
+    staff_ids = list(dict.fromkeys(staff_ids))
+    session_ids = list(session_ids)
+    block_of = overlap_blocks(session_ids, date_key, start_min, end_min)
+    n_sessions, n_staff = len(session_ids), len(staff_ids)
+    need = np.array([int(inv_needed[s]) for s in session_ids], dtype=np.int64)
+    minutes = np.array([int(duration[s]) for s in session_ids], dtype=np.int64)
+    block_ids = {b: k for k, b in enumerate(dict.fromkeys(block_of[s] for s in session_ids))}
+    block = np.array([block_ids[block_of[s]] for s in session_ids], dtype=np.int64)
+    total_demand = int(need.sum())
+
+    # availability matrix (staff x session): every pair not blocked by an engagement
+    staff_pos = {d: i for i, d in enumerate(staff_ids)}
+    session_pos = {s: j for j, s in enumerate(session_ids)}
+    available = np.ones((n_staff, n_sessions), dtype=bool)
+    for d, s in blocked:
+        if d in staff_pos and s in session_pos:
+            available[staff_pos[d], session_pos[s]] = False
+    pair_staff, pair_session = np.nonzero(available)
+
+    # nodes: source, sink, sessions, staff, then one per (staff, overlap block) in use
+    source, sink = 0, 1
+    session_node = 2 + np.arange(n_sessions, dtype=np.int64)
+    staff_node = 2 + n_sessions + np.arange(n_staff, dtype=np.int64)
+    used_blocks, pair_block = np.unique(pair_staff * len(block_ids) + block[pair_session], return_inverse=True)
+    block_node = 2 + n_sessions + n_staff + np.arange(len(used_blocks), dtype=np.int64)
+    block_staff = used_blocks // len(block_ids)
+
+    # convex staff -> sink arcs; count caps from MaxHours and the shortest session
+    counts = np.bincount(block_staff, minlength=n_staff)
+    shortest = np.where(available, minutes, np.iinfo(np.int64).max).min(axis=1, initial=np.iinfo(np.int64).max)
+    for i, d in enumerate(staff_ids):
+        if d in max_minutes and counts[i]:
+            counts[i] = min(counts[i], max_minutes[d] // shortest[i])
+    weight = np.array([int(load_weight.get(d, 1)) for d in staff_ids], dtype=np.int64)
+    sink_staff = np.repeat(np.arange(n_staff), counts)
+    rank = np.arange(len(sink_staff)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+
+    # arcs in order: source -> session, (staff, block) -> staff, session -> (staff, block), staff -> sink
+    first_pair_arc = n_sessions + len(used_blocks)
+    tails = np.concatenate([
+        np.full(n_sessions, source), block_node, session_node[pair_session], staff_node[sink_staff],
+    ])
+    heads = np.concatenate([
+        session_node, staff_node[block_staff], block_node[pair_block], np.full(len(sink_staff), sink),
+    ])
+    caps = np.concatenate([need, np.ones(len(used_blocks) + len(pair_staff) + len(sink_staff), dtype=np.int64)])
+    costs = np.concatenate([
+        np.zeros(first_pair_arc + len(pair_staff), dtype=np.int64), weight[sink_staff] * rank,
+    ])
+    pair_arcs = first_pair_arc + np.arange(len(pair_staff), dtype=np.int32)
+
+    flow = min_cost_flow.SimpleMinCostFlow()
+    flow.add_arcs_with_capacity_and_unit_cost(
+        tails.astype(np.int32), heads.astype(np.int32), caps.astype(np.int64), costs.astype(np.int64),
+    )
+    flow.set_node_supply(source, total_demand)
+    flow.set_node_supply(sink, -total_demand)
+
+    for _ in range(max_rounds):
+        if flow.solve_max_flow_with_min_cost() != flow.OPTIMAL or flow.maximum_flow() < total_demand:
+            return None
+
+        assigned: Dict[Hashable, List[str]] = {s: [] for s in session_ids}
+        loads = {d: 0 for d in staff_ids}
+        longest = {}
+        for k in np.flatnonzero(flow.flows(pair_arcs)).tolist():
+            d, s = staff_ids[pair_staff[k]], session_ids[pair_session[k]]
+            assigned[s].append(d)
+            loads[d] += int(duration[s])
+            if d not in longest or duration[s] > duration[longest[d][1]]:
+                longest[d] = (int(pair_arcs[k]), s)
+
+        over = [d for d in staff_ids if d in max_minutes and loads[d] > max_minutes[d]]
+        if not over:
+            rebalance_loads(
+                assigned, loads, blocked, date_key, start_min, end_min, duration, load_weight, max_minutes,
+            )
+            return assigned, loads
+        for d in over:
+            flow.set_arc_capacity(longest[d][0], 0)
+    return None
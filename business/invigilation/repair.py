@@ -0,0 +1,287 @@
+"""
+Business Layer - Invigilation Repair
+Re-staff only the sessions that a change in availability or demand touches
+"""
+from dataclasses import replace
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from data.writers.excel_writer import write_excel_sheets
+from business.invigilation.availability import EngagementIndex
+from business.invigilation.scheduler import InvigilationInputs, parse_engagements, schedule_frames
+from business.solver.explain import InfeasibleModelError
+from business.solver.early_stop import solve_with_early_stop
+from business.solver.tuning import choose_solver_settings, model_size, record_solver_run
+from utils.interval_utils import overlap_cliques
+
+# repairs are small models; a full run's automatic limit would be far too long
+REPAIR_TIME_LIMIT_SEC = 5
+
+
+def _split_ids(value) -> List[str]:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def previous_assignment(previous) -> Dict[str, List[str]]:
+    """
+    SessionID -> staff IDs from an earlier run: the merged frame returned by
+    run_optimization, or the path of the workbook it saved.
+    """
+    if isinstance(previous, str):
+        previous = pd.read_excel(previous, sheet_name="SessionsWithInvigilators")
+    if not {"SessionID", "Invigilators_IDs"}.issubset(previous.columns):
+        raise ValueError("Previous schedule must contain SessionID and Invigilators_IDs columns")
+    return {
+        str(s): _split_ids(ids)
+        for s, ids in zip(previous["SessionID"], previous["Invigilators_IDs"])
+    }
+
+
+def apply_availability_changes(
+    inputs: InvigilationInputs,
+    new_engagements: Optional[pd.DataFrame] = None,
+    removed_staff: Iterable = (),
+    invigilators_needed: Optional[Dict[str, int]] = None,
+) -> InvigilationInputs:
+    """
+    Inputs with a delta applied: extra engagement rows (engagement.xlsx
+    columns; Engagement defaults to 1), staff taken off the roster, and new
+    InvigilatorsNeeded per SessionID. `inputs` itself is not modified.
+    """
+    sessions_df = inputs.sessions_df
+    if invigilators_needed:
+        unknown = set(invigilators_needed) - set(sessions_df["SessionID"])
+        if unknown:
+            raise ValueError(f"Unknown SessionID(s) in invigilators_needed: {sorted(unknown)}")
+        sessions_df = sessions_df.copy()
+        changed = sessions_df["SessionID"].map(invigilators_needed)
+        sessions_df["InvigilatorsNeeded"] = changed.fillna(sessions_df["InvigilatorsNeeded"]).astype(int)
+
+    removed = {str(d) for d in removed_staff}
+    staff_df = inputs.staff_df[~inputs.staff_df["StaffID"].isin(removed)]
+
+    engage_df = inputs.engage_df
+    engagements = inputs.engagements
+    if new_engagements is not None and len(new_engagements):
+        if not {"StaffID", "Date", "Start"}.issubset(new_engagements.columns):
+            raise ValueError("New engagements must contain columns: StaffID, Date, Start")
+        extra = new_engagements.copy()
+        extra["StaffID"] = extra["StaffID"].astype(str)
+        if "Engagement" not in extra.columns:
+            extra["Engagement"] = 1
+        parse_engagements(extra)
+        engage_df = pd.concat([engage_df, extra], ignore_index=True)
+        engagements = EngagementIndex.from_frame(engage_df[engage_df["Engagement"] == 1])
+
+    return replace(
+        inputs, sessions_df=sessions_df, staff_df=staff_df, engage_df=engage_df, engagements=engagements
+    )
+
+
+def repair_invigilation(
+    previous,
+    inputs: InvigilationInputs,
+    new_engagements: Optional[pd.DataFrame] = None,
+    removed_staff: Iterable = (),
+    invigilators_needed: Optional[Dict[str, int]] = None,
+    output_path: Optional[str] = None,
+    time_limit_sec=None,
+    workers=None,
+    history_path=None,
+    early_stop=None,
+):
+    """
+    Patch an earlier invigilation schedule after availability changes
+    instead of re-running run_optimization.
+
+    previous: run_optimization's merged frame or saved workbook. inputs: the
+    InvigilationInputs it was built from; the delta (new_engagements,
+    removed_staff, invigilators_needed) is applied to them, or pass inputs
+    that already contain the changes. A session is affected when one of its
+    invigilators is gone or now engaged, or its demand changed. Only those
+    sessions are re-solved, with every other assignment fixed, keeping as
+    many previous invigilators as possible (ties go to the least loaded
+    staff). If that is infeasible, the sessions overlapping them are freed
+    too, and then the affected dates as a whole. time_limit_sec defaults to
+    REPAIR_TIME_LIMIT_SEC per attempt. Returns (merged, summary) like
+    run_optimization; the workbook is written only if output_path is given.
+    """
+    inputs = apply_availability_changes(inputs, new_engagements, removed_staff, invigilators_needed)
+    prev = previous_assignment(previous)
+
+    sessions_df = inputs.sessions_df
+    session_ids = sessions_df["SessionID"].tolist()
+    unknown = set(prev) - set(session_ids)
+    if unknown:
+        raise ValueError(f"Previous schedule has sessions not in the inputs: {sorted(unknown)[:10]}")
+    staff_ids = list(dict.fromkeys(inputs.staff_df["StaffID"]))
+    on_roster = set(staff_ids)
+
+    duration = dict(zip(sessions_df["SessionID"], sessions_df["DurationMinutes"].astype(int)))
+    need = dict(zip(sessions_df["SessionID"], sessions_df["InvigilatorsNeeded"].astype(int)))
+    date_key = dict(zip(sessions_df["SessionID"], sessions_df["DateKey"]))
+    start_min = dict(zip(sessions_df["SessionID"], sessions_df["Start_min"]))
+    end_min = dict(zip(sessions_df["SessionID"], sessions_df["End_min"]))
+
+    # previous invigilators still on the roster and free
+    kept = {
+        s: [
+            d for d in prev.get(s, ())
+            if d in on_roster and not inputs.engagements.busy(d, date_key[s], start_min[s], end_min[s])
+        ]
+        for s in session_ids
+    }
+    affected = {s for s in session_ids if len(kept[s]) != len(prev.get(s, ())) or len(kept[s]) != need[s]}
+    print(f"=== Repair: {len(affected)} affected session(s) ===")
+
+    cliques = [
+        [session_ids[k] for k in clique]
+        for clique in overlap_cliques([(date_key[s], start_min[s], end_min[s]) for s in session_ids])
+        if len(clique) >= 2
+    ]
+
+    def neighbourhood(sessions: Set[Hashable]) -> Set[Hashable]:
+        free = set(sessions)
+        for clique in cliques:
+            if free.intersection(clique):
+                free.update(clique)
+        return free
+
+    affected_dates = {date_key[s] for s in affected}
+    attempts = [
+        affected,
+        neighbourhood(affected),
+        {s for s in session_ids if date_key[s] in affected_dates},
+    ]
+
+    if time_limit_sec is None:
+        time_limit_sec = REPAIR_TIME_LIMIT_SEC
+    assigned = None
+    if affected:
+        for k, free in enumerate(attempts):
+            if k and free == attempts[k - 1]:
+                continue
+            assigned = _resolve(
+                free, kept, inputs, session_ids, staff_ids, duration, need, date_key, start_min, end_min,
+                cliques, time_limit_sec, workers, history_path, early_stop,
+            )
+            if assigned is not None:
+                break
+        if assigned is None:
+            raise InfeasibleModelError(
+                "No repair found even re-solving the affected dates "
+                f"({', '.join(sorted(map(str, affected_dates)))}). Run the full optimization instead.",
+                [],
+            )
+    else:
+        assigned = kept
+
+    changes = sum(len(set(assigned[s]).symmetric_difference(prev.get(s, ()))) for s in session_ids)
+    print(f"Changed assignments: {changes}")
+    load_minutes = {d: 0 for d in staff_ids}
+    for s, people in assigned.items():
+        for d in people:
+            load_minutes[d] += duration[s]
+
+    merged, summary_df = schedule_frames(inputs, assigned, load_minutes)
+    if output_path:
+        print("=== Saving Excel ===")
+        write_excel_sheets(output_path, {
+            "SessionsWithInvigilators": merged,
+            "StaffLoadSummary": summary_df,
+        })
+        print("Done, saved to:", output_path)
+    return merged, summary_df
+
+
+def _resolve(
+    free, kept, inputs, session_ids, staff_ids, duration, need, date_key, start_min, end_min,
+    cliques, time_limit_sec, workers, history_path, early_stop,
+):
+    """
+    CP-SAT over the `free` sessions with all others fixed to `kept`.
+    Returns session -> staff, or None if the free sessions cannot be staffed.
+    """
+    fixed = {s: kept[s] for s in session_ids if s not in free}
+    fixed_load = {d: 0 for d in staff_ids}
+    for s, people in fixed.items():
+        for d in people:
+            fixed_load[d] += duration[s]
+
+    # staff already sitting in a fixed session that overlaps a free one
+    taken: Dict[Hashable, Set[str]] = {s: set() for s in free}
+    for clique in cliques:
+        in_free = [s for s in clique if s in free]
+        if in_free:
+            busy = {d for s in clique if s in fixed for d in fixed[s]}
+            for s in in_free:
+                taken[s] |= busy
+
+    free_ids = [s for s in session_ids if s in free]
+    blocked = inputs.engagements.blocked_pairs(
+        free_ids, [date_key[s] for s in free_ids], [start_min[s] for s in free_ids],
+        [end_min[s] for s in free_ids], staff_filter=staff_ids,
+    )
+
+    model = cp_model.CpModel()
+    x = {}
+    for s in free_ids:
+        for d in staff_ids:
+            if (d, s) not in blocked and d not in taken[s]:
+                x[(d, s)] = model.NewBoolVar(f"x_{d}_{s}")
+    for s in free_ids:
+        model.Add(sum(x[(d, s)] for d in staff_ids if (d, s) in x) == need[s])
+    for clique in cliques:
+        in_free = [s for s in clique if s in free]
+        if len(in_free) >= 2:
+            for d in staff_ids:
+                terms = [x[(d, s)] for s in in_free if (d, s) in x]
+                if len(terms) >= 2:
+                    model.AddAtMostOne(terms)
+    for d, cap in inputs.max_hours_map.items():
+        if d in fixed_load:
+            terms = [duration[s] * x[(d, s)] for s in free_ids if (d, s) in x]
+            if terms:
+                model.Add(fixed_load[d] + sum(terms) <= cap)
+
+    # minimal change first; then the rise in squared weighted load (hours)
+    dropped = []
+    rise = []
+    for (d, s), var in x.items():
+        w = inputs.load_weight.get(d, 1)
+        if d in kept[s]:
+            dropped.append(1 - var)
+            model.AddHint(var, 1)
+        else:
+            a = w * duration[s]
+            rise.append(((2 * w * fixed_load[d] + a) * a // 3600, var))
+    bound = 1 + sum(cf for cf, _ in rise)
+    model.Minimize(bound * sum(dropped) + sum(cf * var for cf, var in rise))
+
+    size = model_size(model)
+    settings = choose_solver_settings(
+        "invigilation", size, time_limit_sec=time_limit_sec, workers=workers,
+        early_stop=early_stop, history_path=history_path,
+    )
+    print(f"Repair model: {len(free_ids)} session(s), {len(x)} variable(s)")
+    solver = settings.apply(cp_model.CpSolver())
+    status, stop_reason = solve_with_early_stop(solver, model, settings.stop)
+    print("Solver status:", solver.StatusName(status))
+    record_solver_run(
+        history_path, "invigilation", size, settings, solver.StatusName(status), solver.WallTime(),
+        solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None,
+        stop_reason=stop_reason,
+    )
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+
+    assigned = dict(fixed)
+    for s in free_ids:
+        assigned[s] = [d for d in staff_ids if (d, s) in x and solver.Value(x[(d, s)])]
+    return assigned
@@ -2,9 +2,31 @@
 import os
 import sys
 import ctypes
+from dataclasses import dataclass, replace
+import math
+import time
+from fractions import Fraction
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
 import pandas as pd
 from ortools.sat.python import cp_model
 
+from data.writers.excel_writer import write_excel_sheets
+from business.invigilation.availability import EngagementIndex
+from business.invigilation.flow_engine import flow_assignment
+from business.invigilation.staff_classes import rebalance_loads, split_class_counts, staff_classes
+from business.solver.explain import AssumptionGuards, InfeasibleModelError, format_conflicts
+from business.solver.early_stop import solve_with_early_stop
+from business.solver.fairness import bisect_spread
+from business.solver.progress import as_reporter
+from business.validators.invigilation_prechecks import (
+    check_invigilation_feasibility,
+    invigilation_precheck_message,
+)
+from business.solver.tuning import choose_solver_settings, is_large_model, model_size, record_solver_run
+from utils.interval_utils import overlap_cliques
+
 
 # ===================== OR-Tools DLL Fix =====================
 
@@ -96,24 +118,66 @@ def _intervals_overlap(a_start, a_end, b_start, b_end):
     return (a_start < b_end) and (b_start < a_end)
 
 
-# ===================== Main Optimization Function =====================
+# ===================== Inputs =====================
 
-def run_optimization(
-    sessions_path,
-    staff_path,
-    engagement_path,
-    output_path="invigilation_schedule.xlsx",
-):
-    print("=== Loading data ===")
-    print("sessions:", sessions_path)
-    print("staff:", staff_path)
-    print("engagement:", engagement_path)
+@dataclass
+class InvigilationInputs:
+    """
+    Parsed invigilation inputs. Sessions carry SessionID, DateKey, Start_min,
+    End_min and DurationMinutes; StaffID is a string everywhere. Consumers
+    treat the frames as read-only.
+    """
+    sessions_df: pd.DataFrame
+    staff_df: pd.DataFrame
+    engage_df: pd.DataFrame             # all rows, Engagement as 0/1
+    has_max_hours: bool
+    load_weight: Dict[str, int]         # StaffID -> 2 for half load, else 1
+    max_hours_map: Dict[str, int]       # StaffID -> max minutes (staff with MaxHours only)
+    engagements: EngagementIndex        # Engagement = 1 rows
+
+
+def _map_distinct(series, func):
+    """
+    func applied once per distinct value and spread back over the column.
+    Date and time columns repeat a handful of values, so this replaces a
+    per-row .map/.apply with a factorize plus one take.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    parsed = pd.Series([func(v) for v in uniques], dtype=object)
+    out = parsed.to_numpy()[codes] if len(codes) else parsed.to_numpy()[:0]
+    return pd.Series(out, index=series.index)
+
+
+def _normalize_date_column(series):
+    return _map_distinct(series, _normalize_date)
+
+
+def _parse_time_column(series):
+    return _map_distinct(series, _parse_time_to_min).astype("int64")
+
+
+def parse_engagements(engage_df):
+    """Add Engagement (0/1), DateKey, Start_min and End_min to engage_df in place."""
+    # نحول Engagement لـ 0/1 أرقام عشان المقارنة تبقى مظبوطة
+    engage_df["Engagement"] = pd.to_numeric(
+        engage_df["Engagement"], errors="coerce"
+    ).fillna(0).astype(int)
+
+    engage_df["DateKey"] = _normalize_date_column(engage_df["Date"])
+    engage_df["Start_min"] = _parse_time_column(engage_df["Start"])
+    # هل فيه End في الـ engagement؟
+    if "End" in engage_df.columns:
+        engage_df["End_min"] = _parse_time_column(engage_df["End"])
+    else:
+        # لو مفيش End هنفترض ساعه واحدة
+        engage_df["End_min"] = engage_df["Start_min"] + 60
 
-    # ---- Load data ----
-    sessions_df = pd.read_excel(sessions_path)
-    staff_df = pd.read_excel(staff_path)
-    engage_df = pd.read_excel(engagement_path)
 
+def prepare_invigilation_inputs(sessions_df, staff_df, engage_df) -> InvigilationInputs:
+    """
+    Validate and parse in-memory frames shaped like sessions.xlsx, staff.xlsx
+    and engagement.xlsx. The given frames are not modified.
+    """
     # Required columns
     req_sessions = {"Room", "Date", "Start", "End", "Duration", "InvigilatorsNeeded"}
     req_staff = {"StaffID", "Name"}
@@ -128,9 +192,6 @@ def run_optimization(
             f"engagement.xlsx must contain at least columns: {req_engage_base}"
         )
 
-    # هل فيه End في الـ engagement؟
-    has_eng_end = "End" in engage_df.columns
-
     sessions_df = sessions_df.copy()
     staff_df = staff_df.copy()
     engage_df = engage_df.copy()
@@ -148,21 +209,20 @@ def run_optimization(
         staff_df["MaxHours"] = pd.to_numeric(staff_df["MaxHours"], errors="coerce")
 
     # LoadType → weight
-    load_weight = {}
-    for _, row in staff_df.iterrows():
-        sid = row["StaffID"]
-        lt = str(row["LoadType"]).strip().lower()
-        load_weight[sid] = 2 if lt == "half" else 1
+    is_half = staff_df["LoadType"].map(str).str.strip().str.lower() == "half"
+    load_weight = dict(zip(staff_df["StaffID"], np.where(is_half, 2, 1).tolist()))
 
     # ---- Sessions preprocessing ----
-    sessions_df["SessionID"] = ["S" + str(i + 1) for i in range(len(sessions_df))]
+    sessions_df["SessionID"] = "S" + pd.Series(
+        np.arange(1, len(sessions_df) + 1), index=sessions_df.index
+    ).astype(str)
 
     # DateKey من الشهر/اليوم فقط
-    sessions_df["DateKey"] = sessions_df["Date"].map(_normalize_date)
+    sessions_df["DateKey"] = _normalize_date_column(sessions_df["Date"])
 
     # Start/End as minutes
-    sessions_df["Start_min"] = sessions_df["Start"].apply(_parse_time_to_min)
-    sessions_df["End_min"] = sessions_df["End"].apply(_parse_time_to_min)
+    sessions_df["Start_min"] = _parse_time_column(sessions_df["Start"])
+    sessions_df["End_min"] = _parse_time_column(sessions_df["End"])
 
     # DurationMinutes من الفرق بين Start/End
     sessions_df["DurationMinutes"] = (
@@ -177,177 +237,507 @@ def run_optimization(
             f"Rows:\n{bad[['Room','Date','Start','End']].to_string(index=False)}"
         )
 
-    # Maps
-    session_ids = sessions_df["SessionID"].tolist()
-    staff_ids = staff_df["StaffID"].tolist()
-
-    duration_map = dict(
-        zip(sessions_df["SessionID"], sessions_df["DurationMinutes"])
-    )
-    inv_needed = dict(zip(sessions_df["SessionID"], sessions_df["InvigilatorsNeeded"]))
-    date_key_map = dict(zip(sessions_df["SessionID"], sessions_df["DateKey"]))
-    start_min_map = dict(zip(sessions_df["SessionID"], sessions_df["Start_min"]))
-    end_min_map = dict(zip(sessions_df["SessionID"], sessions_df["End_min"]))
-
-    id_to_name = dict(zip(staff_df["StaffID"], staff_df["Name"]))
-
     # ---- Engagement preprocessing ----
-    # نحول Engagement لـ 0/1 أرقام عشان المقارنة تبقى مظبوطة
-    engage_df["Engagement"] = pd.to_numeric(
-        engage_df["Engagement"], errors="coerce"
-    ).fillna(0).astype(int)
-
-    engage_df["DateKey"] = engage_df["Date"].map(_normalize_date)
-    engage_df["Start_min"] = engage_df["Start"].apply(_parse_time_to_min)
-    if has_eng_end:
-        engage_df["End_min"] = engage_df["End"].apply(_parse_time_to_min)
-    else:
-        # لو مفيش End هنفترض ساعه واحدة
-        engage_df["End_min"] = engage_df["Start_min"] + 60
+    parse_engagements(engage_df)
 
     # نشتغل على صفوف Engagement = 1 بس
-    engage_busy = engage_df[engage_df["Engagement"] == 1].copy()
-
-    # حوّل لـ list عشان التعامل يبقى أسهل
-    busy_intervals = []
-    for _, r in engage_busy.iterrows():
-        busy_intervals.append(
-            dict(
-                staff_id=str(r["StaffID"]),
-                date_key=r["DateKey"],
-                start_min=int(r["Start_min"]),
-                end_min=int(r["End_min"]),
-            )
-        )
+    engagements = EngagementIndex.from_frame(engage_df[engage_df["Engagement"] == 1])
 
     # ---- MaxHours (in minutes) ----
     max_hours_map = {}
     if has_max_hours:
-        for _, row in staff_df.iterrows():
-            sid = row["StaffID"]
-            mh = row["MaxHours"]
-            if pd.notna(mh):
-                max_hours_map[sid] = int(float(mh) * 60)
+        limited = staff_df[staff_df["MaxHours"].notna()]
+        minutes = (limited["MaxHours"].astype(float) * 60).astype("int64")
+        max_hours_map = dict(zip(limited["StaffID"], minutes.tolist()))
+
+    return InvigilationInputs(
+        sessions_df=sessions_df,
+        staff_df=staff_df,
+        engage_df=engage_df,
+        has_max_hours=has_max_hours,
+        load_weight=load_weight,
+        max_hours_map=max_hours_map,
+        engagements=engagements,
+    )
 
-    # ============== Diagnostics ==============
-    print("=== Diagnostics ===")
-    print(f"Number of sessions: {len(sessions_df)}")
-    print(f"Number of staff   : {len(staff_df)}")
-    total_demand = sessions_df["InvigilatorsNeeded"].sum()
-    print(f"Total invigilator slots (sessions): {total_demand}")
 
-    # ============== OR-Tools model ==============
+def load_invigilation_inputs(sessions_path, staff_path, engagement_path) -> InvigilationInputs:
+    """Read the three input workbooks and parse them (see prepare_invigilation_inputs)."""
+    return prepare_invigilation_inputs(
+        pd.read_excel(sessions_path),
+        pd.read_excel(staff_path),
+        pd.read_excel(engagement_path),
+    )
+
+
+# ===================== Model =====================
+
+@dataclass
+class _ModelData:
+    """Session/staff maps shared by the model builders."""
+    session_ids: List[str]
+    duration_map: Dict[str, int]
+    inv_needed: Dict[str, int]
+    date_key_map: Dict[str, str]
+    start_min_map: Dict[str, int]
+    end_min_map: Dict[str, int]
+    room_map: Dict[str, str]
+    id_to_name: Dict[str, str]
+    load_weight: Dict[str, int]
+    max_hours_map: Dict[str, int]
+    blocked: Set[Tuple[str, str]]          # (StaffID, SessionID) busy by engagement
+    session_cliques: List[List[str]]       # maximal sets of overlapping sessions
+
+
+def _solve_assignment(
+    data,
+    units,
+    explain=False,
+    time_limit_sec=None,
+    workers=None,
+    history_path=None,
+    early_stop=None,
+    hint=None,
+    carry=None,
+    fairness="spread",
+    progress=None,
+    stage="invigilation model",
+    presolve=True,
+):
+    """
+    Build and solve the CP-SAT model over `units`: lists of interchangeable
+    staff (singletons for the per-person model). A unit of k staff gets an
+    integer "how many of them take session s" instead of k booleans; its
+    overlap, MaxHours and fairness rules apply to the unit total (k times the
+    per-person bound). hint (session -> staff, e.g. from the flow engine)
+    seeds the search. carry (staff -> minutes already assigned elsewhere,
+    e.g. on earlier days) counts towards MaxHours and fairness. fairness:
+    "spread" minimizes max - min directly, "bisect" searches it with
+    feasibility solves (see bisect_spread; not used with explain). With
+    class units the bisection only proves the class-average bounds tight,
+    so it reports FEASIBLE, never OPTIMAL. Returns
+    (session -> staff, staff -> minutes including carry), or (None, None)
+    if a unit's counts cannot be split within MaxHours. The model only
+    bounds class averages, so a split whose spread exceeds that bound is
+    solved again per person from the split as a hint. progress
+    (ProgressReporter) hears "Building <stage>" / "Solving <stage>" and
+    every solution. presolve=False lets a complete hint be taken as the
+    first solution at once (presolve can take seconds on large models and
+    may cut the hinted solution off); only the single-shot solve uses it.
+    """
+    progress = as_reporter(progress)
+    progress.stage(f"Building {stage}")
+    session_ids = data.session_ids
     model = cp_model.CpModel()
+    guards = AssumptionGuards(model) if explain else None
+
+    def label(members):
+        name = data.id_to_name[members[0]]
+        return name if len(members) == 1 else f"{name} (+{len(members) - 1} alike, each)"
 
-    # Decision vars
+    # Decision vars (available pairs only)
     x = {}
-    for d in staff_ids:
-        for s in session_ids:
-            x[(d, s)] = model.NewBoolVar(f"x_{d}_{s}")
+    units_for_session = {s: [] for s in session_ids}
+    sessions_for_unit = []
+    for u, members in enumerate(units):
+        available = [s for s in session_ids if (members[0], s) not in data.blocked]
+        sessions_for_unit.append(available)
+        for s in available:
+            if len(members) == 1:
+                x[(u, s)] = model.NewBoolVar(f"x_{members[0]}_{s}")
+            else:
+                ub = max(0, min(len(members), int(data.inv_needed[s])))
+                x[(u, s)] = model.NewIntVar(0, ub, f"x_c{u}_{s}")
+            units_for_session[s].append(u)
 
     # 1) exact invigilators per session
     for s in session_ids:
-        model.Add(sum(x[(d, s)] for d in staff_ids) == int(inv_needed[s]))
-
-    # جهز info عن الجلسات عشان التداخلات
-    sessions_info = []
-    for s in session_ids:
-        sessions_info.append(
-            dict(
-                id=s,
-                date_key=date_key_map[s],
-                start_min=start_min_map[s],
-                end_min=end_min_map[s],
-            )
-        )
+        ct = model.Add(sum(x[(u, s)] for u in units_for_session[s]) == int(data.inv_needed[s]))
+        if guards is not None:
+            start = data.start_min_map[s]
+            ct.OnlyEnforceIf(guards.guard(
+                "SessionDemand", s,
+                f"{data.room_map[s]} "
+                f"{data.date_key_map[s]} {start // 60:02d}:{start % 60:02d} "
+                f"needs {int(data.inv_needed[s])} invigilator(s)",
+            ))
 
     # 2) ممنوع نفس الشخص في لجان متداخلة في نفس اليوم
-    for i in range(len(sessions_info)):
-        si = sessions_info[i]
-        for j in range(i + 1, len(sessions_info)):
-            sj = sessions_info[j]
-            if si["date_key"] != sj["date_key"]:
-                continue
-            if not _intervals_overlap(
-                si["start_min"], si["end_min"], sj["start_min"], sj["end_min"]
-            ):
-                continue
-            # متداخلين في نفس اليوم → نفس الشخص ما ينفعش ياخد الاتنين
-            for d in staff_ids:
-                model.Add(x[(d, si["id"])] + x[(d, sj["id"])] <= 1)
-
-    # 3) ممنوع يوضع في لجنة وهو عنده Engagement متداخل معها
-    for s in sessions_info:
-        sid = s["id"]
-        s_date = s["date_key"]
-        s_start = s["start_min"]
-        s_end = s["end_min"]
-
-        for bi in busy_intervals:
-            if bi["date_key"] != s_date:
+    # one AtMostOne per staff member and maximal clique of overlapping sessions
+    # (a class may fill at most as many of them as it has members)
+    for clique in data.session_cliques:
+        for u, members in enumerate(units):
+            terms = [x[(u, s)] for s in clique if (u, s) in x]
+            if len(terms) < 2:
                 continue
-            if not _intervals_overlap(
-                s_start, s_end, bi["start_min"], bi["end_min"]
-            ):
-                continue
-            d = bi["staff_id"]
-            if d in staff_ids:
-                model.Add(x[(d, sid)] == 0)
+            if len(members) == 1:
+                model.AddAtMostOne(terms)
+            else:
+                model.Add(sum(terms) <= len(members))
+
+    # 3) Engagement overlaps are already excluded from x (see EngagementIndex.blocked_pairs)
 
     # 4) load minutes + MaxHours
-    max_total = sum(sessions_df["DurationMinutes"])
+    carry = carry or {}
+    max_total = sum(data.duration_map.values())
     load_minutes = {}
-    for d in staff_ids:
-        load_minutes[d] = model.NewIntVar(0, max_total, f"load_{d}")
+    for u, members in enumerate(units):
+        k = len(members)
+        load_minutes[u] = model.NewIntVar(0, max_total * k, f"load_{members[0] if k == 1 else f'c{u}'}")
         model.Add(
-            load_minutes[d]
-            == sum(duration_map[s] * x[(d, s)] for s in session_ids)
+            load_minutes[u]
+            == sum(carry.get(d, 0) for d in members)
+            + sum(data.duration_map[s] * x[(u, s)] for s in sessions_for_unit[u])
         )
-        if d in max_hours_map:
-            model.Add(load_minutes[d] <= max_hours_map[d])
+        d = members[0]
+        if d in data.max_hours_map:
+            ct = model.Add(load_minutes[u] <= k * data.max_hours_map[d])
+            if guards is not None:
+                ct.OnlyEnforceIf(guards.guard(
+                    "MaxHours", d, f"{label(members)} at most {data.max_hours_map[d] / 60:g} h"
+                ))
 
     # 5) normalized load (حسب LoadType) + fairness
     max_norm = model.NewIntVar(0, max_total * 2, "max_norm")
     min_norm = model.NewIntVar(0, max_total * 2, "min_norm")
     norm_load = {}
-    for d in staff_ids:
-        w = load_weight[d]
-        norm_load[d] = model.NewIntVar(0, max_total * 2, f"norm_{d}")
-        model.Add(norm_load[d] == load_minutes[d] * w)
-        model.Add(norm_load[d] <= max_norm)
-        model.Add(norm_load[d] >= min_norm)
+    for u, members in enumerate(units):
+        k = len(members)
+        w = data.load_weight[members[0]]
+        norm_load[u] = model.NewIntVar(0, max_total * 2 * k, f"norm_{members[0] if k == 1 else f'c{u}'}")
+        model.Add(norm_load[u] == load_minutes[u] * w)
+        model.Add(norm_load[u] <= k * max_norm)
+        model.Add(norm_load[u] >= k * min_norm)
 
     spread = model.NewIntVar(0, max_total * 2, "spread")
     model.Add(spread == max_norm - min_norm)
-    model.Minimize(spread)
+    # fairness="bisect" has no objective: bisect_spread bounds max_norm / min_norm
+    bisect = fairness == "bisect" and guards is None
+    if carry and not bisect:
+        # rolling days: among equally fair days, prefer handing sessions to
+        # whoever has the least so far (each assignment costs the rise in the
+        # square of that person's weighted load, in hours)
+        rise = []
+        for u, members in enumerate(units):
+            w = data.load_weight[members[0]]
+            c = w * max(carry.get(d, 0) for d in members)
+            for s in sessions_for_unit[u]:
+                a = w * int(data.duration_map[s])
+                ub = min(len(members), int(data.inv_needed[s]))
+                rise.append(((2 * c + a) * a // 3600, ub, x[(u, s)]))
+        bound = 1 + sum(cf * ub for cf, ub, _ in rise)
+        model.Minimize(spread * bound + sum(cf * var for cf, _, var in rise))
+    elif not bisect:
+        model.Minimize(spread)
+
+    if hint is not None:
+        # a complete hint (loads and bounds too) can be taken as the first solution
+        hinted_norm = []
+        for u, members in enumerate(units):
+            unit = set(members)
+            minutes = sum(carry.get(d, 0) for d in members)
+            for s in sessions_for_unit[u]:
+                count = sum(1 for d in hint.get(s, ()) if d in unit)
+                model.AddHint(x[(u, s)], count)
+                minutes += data.duration_map[s] * count
+            w = data.load_weight[members[0]]
+            model.AddHint(load_minutes[u], minutes)
+            model.AddHint(norm_load[u], minutes * w)
+            hinted_norm.append((minutes * w, len(members)))
+        if hinted_norm:
+            top = max(-(-n // k) for n, k in hinted_norm)
+            bottom = min(n // k for n, k in hinted_norm)
+            model.AddHint(max_norm, top)
+            model.AddHint(min_norm, bottom)
+            model.AddHint(spread, top - bottom)
+
+    if guards is not None:
+        guards.activate()
 
     # ============== Solve ==============
     print("=== Solving model ===")
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 25
-    solver.parameters.num_search_workers = 8
+    size = model_size(model)
+    settings = choose_solver_settings(
+        "invigilation", size, time_limit_sec=time_limit_sec, workers=workers,
+        early_stop=early_stop, history_path=history_path,
+    )
+    print(f"Solver: {settings.workers} worker(s), {settings.time_limit_sec:g}s limit ({settings.reason})")
+    solve_started = time.monotonic()
+    if bisect:
+        # average weighted load: no one can stay below it, no one must exceed it
+        total = sum(carry.values()) + sum(
+            int(data.duration_map[s]) * int(data.inv_needed[s]) for s in session_ids
+        )
+        per_norm = sum(
+            Fraction(1, data.load_weight[d]) for members in units for d in members
+        )
+        average = Fraction(total) / per_norm if per_norm else Fraction(0)
 
-    status = solver.Solve(model)
-    print("Solver status:", solver.StatusName(status))
+        def measure(solved):
+            # a unit of k staff is held to k * max_norm: its average, rounded outwards
+            per_unit = [
+                (solved.Value(norm_load[u]), len(members)) for u, members in enumerate(units)
+            ]
+            return (
+                max((-(-n // k) for n, k in per_unit), default=0),
+                min((n // k for n, k in per_unit), default=0),
+            )
+
+        # with one person per unit every load is a multiple of this gcd
+        step = math.gcd(*[int(m) for m in data.duration_map.values()], *carry.values())
+        progress.stage(f"Fairness bisection ({stage})", settings.time_limit_sec, size)
+        search = bisect_spread(
+            model, max_norm, min_norm, list(x.values()), measure, settings,
+            max_lower=math.ceil(average), min_upper=math.floor(average),
+            granularity=step if all(len(members) == 1 for members in units) else 1,
+            progress=progress,
+        )
+        solver, status, stop_reason = search.solver, search.status, search.stop_reason
+        print(f"Fairness bisection: {search.probes} probe(s), {search.wall_time_sec:.1f}s")
+        if status == cp_model.OPTIMAL and any(len(members) > 1 for members in units):
+            # tight for the class averages only, not for the people in them
+            status = cp_model.FEASIBLE
+        print("Solver status:", solver.StatusName(status))
+        record_solver_run(
+            history_path, "invigilation", size, settings, solver.StatusName(status), search.wall_time_sec,
+            search.spread, stop_reason=stop_reason,
+        )
+    else:
+        solver = settings.apply(cp_model.CpSolver())
+        if not presolve:
+            solver.parameters.cp_model_presolve = False
+        progress.stage(f"Solving {stage}", settings.time_limit_sec, size)
+        status, stop_reason = solve_with_early_stop(solver, model, settings.stop, progress)
+        print("Solver status:", solver.StatusName(status))
+        if stop_reason:
+            print("Stopped early:", stop_reason)
+        record_solver_run(
+            history_path, "invigilation", size, settings, solver.StatusName(status), solver.WallTime(),
+            solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None,
+            stop_reason=stop_reason,
+        )
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        raise RuntimeError(
-            f"No feasible solution. OR-Tools status = {solver.StatusName(status)}.\n"
-            "Check:\n"
-            "- InvigilatorsNeeded too high for overlapped sessions.\n"
-            "- Too many Engagement=1 intervals.\n"
-            "- MaxHours too small for all staff combined."
+        # only a proven infeasible model has a conflict set to extract
+        conflicts = []
+        if guards is not None and status == cp_model.INFEASIBLE:
+            conflicts = guards.explain()
+        if status == cp_model.UNKNOWN:
+            message = (
+                f"The time limit ({settings.time_limit_sec:g}s) ran out before any assignment was found. "
+                f"OR-Tools status = {solver.StatusName(status)}.\n"
+                "Increase time_limit_sec, or try engine=\"flow\" or decompose_by_day=True."
+            )
+        else:
+            message = (
+                f"No feasible solution. OR-Tools status = {solver.StatusName(status)}.\n"
+                "Check:\n"
+                "- InvigilatorsNeeded too high for overlapped sessions.\n"
+                "- Too many Engagement=1 intervals.\n"
+                "- MaxHours too small for all staff combined."
+            )
+        if conflicts:
+            message += "\n\nThese demands/limits cannot all hold together:\n" + format_conflicts(conflicts)
+        elif guards is None and status == cp_model.INFEASIBLE:
+            message += "\nRun again with explain=True to list the conflicting demands/limits."
+        raise InfeasibleModelError(message, conflicts, status=solver.StatusName(status))
+
+    # ============== Unit values -> people ==============
+    assigned = {s: [] for s in session_ids}
+    loads = {}
+    for u, members in enumerate(units):
+        if len(members) == 1:
+            d = members[0]
+            for s in sessions_for_unit[u]:
+                if solver.Value(x[(u, s)]) == 1:
+                    assigned[s].append(d)
+            loads[d] = int(solver.Value(load_minutes[u]))
+            continue
+
+        counts = {s: int(solver.Value(x[(u, s)])) for s in sessions_for_unit[u]}
+        cap = data.max_hours_map.get(members[0])
+        split, member_loads = split_class_counts(
+            members, counts, data.date_key_map, data.start_min_map, data.end_min_map,
+            data.duration_map,
+            max_minutes=None if cap is None else cap - max(carry.get(d, 0) for d in members),
         )
+        member_loads = {d: minutes + carry.get(d, 0) for d, minutes in member_loads.items()}
+        if cap is not None and max(member_loads.values()) > cap:
+            return None, None
+        for s, people in split.items():
+            assigned[s].extend(people)
+        loads.update(member_loads)
 
-    # ============== Build outputs ==============
+    if any(len(members) > 1 for members in units):
+        rebalance_loads(
+            assigned, loads, data.blocked, data.date_key_map, data.start_min_map,
+            data.end_min_map, data.duration_map, data.load_weight, data.max_hours_map,
+        )
+        # the model only bounds class averages: if the split is less fair than
+        # that bound, polish it per person from the split as a hint
+        bound = int(solver.Value(max_norm)) - int(solver.Value(min_norm))
+        left = settings.time_limit_sec - (time.monotonic() - solve_started)
+        if guards is None and _load_spread(loads, data.load_weight) > bound:
+            if left < 1.0:
+                print("No time left to polish the class split per person")
+            else:
+                print(f"Class split is less fair than the class bound ({bound}); polishing per person")
+                try:
+                    polished, polished_loads = _solve_assignment(
+                        data, [[d] for members in units for d in members], time_limit_sec=left,
+                        workers=workers, history_path=history_path, early_stop=early_stop, hint=assigned,
+                        carry=carry, fairness=fairness, progress=progress, stage=f"{stage} per person",
+                    )
+                except InfeasibleModelError:
+                    polished = None
+                if polished is not None and (
+                    _load_spread(polished_loads, data.load_weight) < _load_spread(loads, data.load_weight)
+                ):
+                    assigned, loads = polished, polished_loads
+    return assigned, loads
+
+
+def _load_spread(load_minutes, load_weight):
+    """Max minus min weighted load over staff."""
+    norm = [minutes * load_weight[d] for d, minutes in load_minutes.items()]
+    return max(norm, default=0) - min(norm, default=0)
+
+
+def _solve_by_day(data, staff_ids, time_limit_sec=None, aggregate_staff=True, **solve_opts):
+    """
+    Rolling decomposition: one model per date, in date order, each carrying
+    the minutes assigned on earlier dates into its MaxHours and fairness
+    terms, with ties broken towards the least loaded staff. Dates only
+    interact through those totals, so each model stays the size of a single
+    day. With aggregate_staff (decided by the caller from the size of the
+    whole per-person model), staff classes are formed per day (same carried
+    minutes too).
+
+    time_limit_sec (if given) is the budget for all dates: each gets an even
+    share of what is left, so time a date does not use goes to later ones.
+    A date that times out without a solution is tried once more with twice
+    its share (capped by what is left, keeping 0.1 s for each later date)
+    and, when solve_opts has a `hint`, without presolve so the hint is taken
+    at once. With a hint, each date is seeded from a flow over that date
+    alone (see flow_engine.py) within the MaxHours its staff have left,
+    falling back to the given hint if that flow cannot cover the date; a
+    date that still has no solution after the retry keeps its flow seed.
+
+    Returns (session -> staff, staff -> minutes), or (None, None) if some
+    date is proven infeasible with what earlier dates left over, or has
+    neither a solution nor a flow seed.
+    """
+    by_date: Dict[str, List[str]] = {}
+    for s in data.session_ids:
+        by_date.setdefault(data.date_key_map[s], []).append(s)
+    dates = sorted(by_date, key=str)
+    deadline = None if time_limit_sec is None else time.monotonic() + time_limit_sec
+
+    people = list(dict.fromkeys(staff_ids))
+    assigned: Dict[str, List[str]] = {}
+    carry = {d: 0 for d in people}
+    retry = {}
+    for k, date in enumerate(dates):
+        day_sessions = set(by_date[date])
+        day = replace(
+            data,
+            session_ids=by_date[date],
+            session_cliques=[c for c in data.session_cliques if c[0] in day_sessions],
+        )
+        units = [[d] for d in people]
+        if aggregate_staff:
+            day_blocked = {(d, s) for d, s in data.blocked if s in day_sessions}
+            classes = [
+                group
+                for members in staff_classes(people, data.load_weight, data.max_hours_map, day_blocked)
+                for group in _group_by(members, carry.get)
+            ]
+            if len(classes) * 2 <= len(units):
+                units = classes
+        print(f"--- Day {date}: {len(day_sessions)} session(s), {len(units)} staff unit(s) ---")
+
+        day_opts = solve_opts
+        seed = None
+        if solve_opts.get("hint") is not None:
+            # re-seed from a flow over this date within what MaxHours has left
+            seed = flow_assignment(
+                day.session_ids, people, data.inv_needed, data.duration_map, data.date_key_map,
+                data.start_min_map, data.end_min_map, data.blocked, data.load_weight,
+                {d: cap - carry.get(d, 0) for d, cap in data.max_hours_map.items()},
+            )
+            if seed is not None:
+                day_opts = dict(solve_opts, hint=seed[0])
+
+        day_limit = None
+        if deadline is not None:
+            day_limit = max(0.1, (deadline - time.monotonic()) / (len(dates) - k))
+        day_assigned = None
+        for attempt in range(2):
+            try:
+                day_assigned, day_carry = _solve_assignment(
+                    day, units, time_limit_sec=day_limit, carry=carry, stage=f"day {date}",
+                    **day_opts, **retry,
+                )
+                break
+            except InfeasibleModelError as e:
+                # a proof ends the decomposition; a timeout gets one more try
+                # (and later dates start the way the retry is made)
+                if e.status == "INFEASIBLE":
+                    return None, None
+                if attempt:
+                    break
+                if deadline is not None:
+                    left = deadline - time.monotonic() - 0.1 * (len(dates) - k - 1)
+                    day_limit = max(0.1, min(2 * day_limit, left))
+                # without presolve a complete hint is the first solution at once
+                if solve_opts.get("hint") is not None:
+                    retry = {"presolve": False}
+                print(f"Day {date}: no solution in time; retrying"
+                      + (f" with {day_limit:.1f}s" if day_limit else "")
+                      + (" from the hint without presolve" if retry else ""))
+        if day_assigned is None:
+            if seed is None:
+                return None, None
+            # the flow seed is itself a valid assignment for this date
+            print(f"Day {date}: keeping the flow assignment")
+            day_assigned = seed[0]
+            day_carry = {d: carry[d] + seed[1].get(d, 0) for d in people}
+        carry = day_carry
+        assigned.update(day_assigned)
+    return assigned, carry
+
+
+def _per_person_variables(staff_ids, session_ids, blocked):
+    """Variables of the per-person model: one per available pair, plus loads."""
+    people = len(dict.fromkeys(staff_ids))
+    sessions = set(session_ids)
+    busy = sum(1 for _, s in blocked if s in sessions)
+    return people * len(sessions) - busy + 2 * people
+
+
+def _group_by(items, key):
+    """Split items into lists sharing key(item), in first-seen order."""
+    groups: Dict[object, List[str]] = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return list(groups.values())
+
+
+def schedule_frames(inputs, assigned, load_minutes):
+    """
+    The SessionsWithInvigilators and StaffLoadSummary frames for an
+    assignment (session -> staff IDs, staff -> minutes).
+    """
+    sessions_df = inputs.sessions_df
+    staff_df = inputs.staff_df
+    staff_ids = staff_df["StaffID"].tolist()
+    id_to_name = dict(zip(staff_df["StaffID"], staff_df["Name"]))
+
+    staff_pos = {d: k for k, d in reversed(list(enumerate(staff_ids)))}
     rows = []
-    for s in session_ids:
-        ids = []
-        names = []
-        for d in staff_ids:
-            if solver.Value(x[(d, s)]) == 1:
-                ids.append(d)
-                names.append(id_to_name[d])
+    for s in sessions_df["SessionID"]:
+        ids = sorted(assigned.get(s, ()), key=staff_pos.get)
+        names = [id_to_name[d] for d in ids]
         rows.append(
             {
                 "SessionID": s,
@@ -359,26 +749,295 @@ def run_optimization(
 
     merged = sessions_df.merge(out_df, on="SessionID", how="left")
 
-    # Summary
-    summary_rows = []
-    for d in staff_ids:
-        hours = round(solver.Value(load_minutes[d]) / 60.0, 2)
-        staff_row = staff_df.loc[staff_df["StaffID"] == d].iloc[0]
-        summary_rows.append(
-            {
-                "StaffID": d,
-                "Name": staff_row["Name"],
-                "LoadType": staff_row["LoadType"],
-                "MaxHours": staff_row["MaxHours"] if has_max_hours else None,
-                "TotalHours": hours,
-            }
+    # Summary (first staff row per StaffID, looked up by index)
+    staff_first = staff_df.drop_duplicates("StaffID").set_index("StaffID")
+    summary_df = pd.DataFrame({
+        "StaffID": staff_ids,
+        "Name": staff_first["Name"].reindex(staff_ids).to_numpy(),
+        "LoadType": staff_first["LoadType"].reindex(staff_ids).to_numpy(),
+        "MaxHours": (
+            staff_first["MaxHours"].reindex(staff_ids).to_numpy()
+            if inputs.has_max_hours else [None] * len(staff_ids)
+        ),
+        "TotalHours": [round(load_minutes.get(d, 0) / 60.0, 2) for d in staff_ids],
+    })
+    return merged, summary_df
+
+
+# ===================== Main Optimization Function =====================
+
+def run_optimization(
+    sessions_path,
+    staff_path,
+    engagement_path,
+    output_path="invigilation_schedule.xlsx",
+    explain=False,
+    time_limit_sec=None,
+    workers=None,
+    history_path=None,
+    early_stop=None,
+    inputs=None,
+    aggregate_staff=True,
+    engine="cpsat",
+    decompose_by_day=False,
+    fairness="spread",
+    progress=None,
+):
+    """
+    Before any model is built, pre-checks (see invigilation_prechecks.py)
+    compare demand with the staff free per session and overlap window, with
+    MaxHours, and with a max-flow bound; a failure raises ValueError naming
+    the windows.
+
+    explain=True: guard each session's invigilator demand and each staff
+    member's MaxHours with assumption literals, so an infeasible instance
+    raises InfeasibleModelError listing the demands/limits that clash. The
+    pre-check findings are then printed instead of raised.
+
+    time_limit_sec / workers: None picks them from the model size and the
+    available cores; history_path (JSON of past runs) refines the time limit.
+    early_stop: StopCriteria (gap / no improvement); None stops once the
+    spread stagnates, StopCriteria() runs to the time limit.
+    inputs: an InvigilationInputs (see load_invigilation_inputs /
+    prepare_invigilation_inputs) to skip reading and parsing the files again.
+
+    aggregate_staff=True models interchangeable staff (same LoadType, MaxHours
+    and engagement-blocked sessions) as one class with integer counts per
+    session; fairness and MaxHours then hold for the class average, and the
+    counts are split into people afterwards (see staff_classes.py). Used only
+    when the per-person model falls in the large tier of solver/tuning.py
+    and the classes at least halve the staff count. A split less fair than
+    the class bound is polished per person, hinted from the split, in the
+    time left; if a split would break someone's MaxHours the instance is
+    solved per person instead.
+
+    engine: "cpsat" (default) solves the fairness model above; "flow" assigns
+    with one min-cost flow (see flow_engine.py), fast on large pools but only
+    an approximation of the smallest spread; "flow+cpsat" hands the flow
+    result to CP-SAT as a starting hint. If the flow cannot cover every
+    session, CP-SAT is used. explain=True always uses CP-SAT.
+
+    decompose_by_day=True solves one date at a time, carrying each person's
+    minutes forward (see _solve_by_day), seeded with the flow engine's
+    assignment, then polishes the whole model from that assignment as a hint
+    and keeps the better of the two. The dates and the polish share
+    time_limit_sec (the polish gets one share plus whatever the dates left),
+    but the polish still builds the full model once, so memory and model
+    building stay those of the full model. If a date is infeasible with what
+    earlier dates left (or finds nothing even after a retry), the whole model
+    is solved instead. Ignored with explain=True.
+
+    fairness="bisect" replaces the single max - min minimization by a
+    bisection over feasibility solves: lower the maximum load, raise the
+    minimum, then shrink the spread until a smaller one is proven impossible
+    (see business/solver/fairness.py), starting from the flow engine's
+    assignment. It always runs per person (aggregate_staff is ignored), as
+    class units would only prove the class averages tight. Ignored with
+    explain=True.
+
+    progress: called with SolverProgress (business/solver/progress.py) at
+    each stage (loading, pre-checks, flow, each model built and solved,
+    saving) and for every solution found, from the solver's threads.
+    """
+    progress = as_reporter(progress)
+    if fairness not in ("spread", "bisect"):
+        raise ValueError(f"Unknown fairness mode: {fairness!r} (use 'spread' or 'bisect')")
+    if engine not in ("cpsat", "flow", "flow+cpsat"):
+        raise ValueError(f"Unknown invigilation engine: {engine!r} (use 'cpsat', 'flow' or 'flow+cpsat')")
+
+    if inputs is None:
+        progress.stage("Loading invigilation inputs")
+        print("=== Loading data ===")
+        print("sessions:", sessions_path)
+        print("staff:", staff_path)
+        print("engagement:", engagement_path)
+        inputs = load_invigilation_inputs(sessions_path, staff_path, engagement_path)
+
+    sessions_df = inputs.sessions_df
+    staff_df = inputs.staff_df
+    load_weight = inputs.load_weight
+    max_hours_map = inputs.max_hours_map
+    engagements = inputs.engagements
+
+    # Maps
+    session_ids = sessions_df["SessionID"].tolist()
+    staff_ids = staff_df["StaffID"].tolist()
+
+    duration_map = dict(
+        zip(sessions_df["SessionID"], sessions_df["DurationMinutes"])
+    )
+    inv_needed = dict(zip(sessions_df["SessionID"], sessions_df["InvigilatorsNeeded"]))
+    date_key_map = dict(zip(sessions_df["SessionID"], sessions_df["DateKey"]))
+    start_min_map = dict(zip(sessions_df["SessionID"], sessions_df["Start_min"]))
+    end_min_map = dict(zip(sessions_df["SessionID"], sessions_df["End_min"]))
+
+    id_to_name = dict(zip(staff_df["StaffID"], staff_df["Name"]))
+
+    # ============== Diagnostics ==============
+    print("=== Diagnostics ===")
+    print(f"Number of sessions: {len(sessions_df)}")
+    print(f"Number of staff   : {len(staff_df)}")
+    total_demand = sessions_df["InvigilatorsNeeded"].sum()
+    print(f"Total invigilator slots (sessions): {total_demand}")
+
+    # جهز info عن الجلسات عشان التداخلات
+    sessions_info = []
+    for s in session_ids:
+        sessions_info.append(
+            dict(
+                id=s,
+                date_key=date_key_map[s],
+                start_min=start_min_map[s],
+                end_min=end_min_map[s],
+            )
+        )
+
+    # Availability: staff blocked by an overlapping Engagement never get a variable
+    blocked = engagements.blocked_pairs(
+        session_ids, sessions_df["DateKey"], sessions_df["Start_min"], sessions_df["End_min"],
+        staff_filter=staff_ids,
+    )
+    print(f"Staff/session pairs: {len(staff_ids) * len(session_ids)} total, {len(blocked)} blocked by engagements")
+
+    # Overlapping sessions (sweep line per DateKey): maximal cliques
+    session_cliques = [
+        [session_ids[k] for k in clique]
+        for clique in overlap_cliques(
+            [(si["date_key"], si["start_min"], si["end_min"]) for si in sessions_info]
         )
-    summary_df = pd.DataFrame(summary_rows)
+        if len(clique) >= 2
+    ]
+
+    room_map = dict(zip(sessions_df["SessionID"], sessions_df["Room"]))
+
+    # Fail fast on demand the staff cannot cover, before building the model
+    progress.stage("Pre-checks")
+    started = time.perf_counter()
+    precheck_df = check_invigilation_feasibility(
+        session_ids, staff_ids, inv_needed, duration_map, date_key_map, start_min_map, end_min_map,
+        blocked, max_hours_map, session_labels={s: f"{s} ({room_map[s]})" for s in session_ids},
+    )
+    print(f"Pre-checks: {len(precheck_df)} issue(s) in {(time.perf_counter() - started) * 1000:.0f} ms")
+    if not precheck_df.empty:
+        message = (
+            "The invigilation schedule cannot be feasible; pre-checks found:\n\n"
+            + invigilation_precheck_message(precheck_df)
+            + "\n\nFix: lower InvigilatorsNeeded, add staff, or relax engagements / MaxHours."
+        )
+        if not explain:
+            raise ValueError(message)
+        # explain mode goes on to the solver for its conflict set
+        print(message)
+
+    data = _ModelData(
+        session_ids=session_ids,
+        duration_map=duration_map,
+        inv_needed=inv_needed,
+        date_key_map=date_key_map,
+        start_min_map=start_min_map,
+        end_min_map=end_min_map,
+        room_map=room_map,
+        id_to_name=id_to_name,
+        load_weight=load_weight,
+        max_hours_map=max_hours_map,
+        blocked=blocked,
+        session_cliques=session_cliques,
+    )
+    solve_opts = dict(
+        explain=explain, time_limit_sec=time_limit_sec, workers=workers,
+        history_path=history_path, early_stop=early_stop, fairness=fairness,
+        progress=progress,
+    )
+
+    # the flow result is also the starting point of the bisection probes
+    flow_result = None
+    if (engine != "cpsat" or fairness == "bisect" or decompose_by_day) and not explain:
+        progress.stage("Flow engine")
+        started = time.perf_counter()
+        flow_result = flow_assignment(
+            session_ids, staff_ids, inv_needed, duration_map, date_key_map, start_min_map,
+            end_min_map, blocked, load_weight, max_hours_map,
+        )
+        if flow_result is None and engine != "cpsat":
+            print("Flow engine could not cover every session; using CP-SAT")
+        elif flow_result is not None:
+            print(f"Flow engine: {time.perf_counter() - started:.2f}s")
+
+    units = [[d] for d in staff_ids]
+    # the per-person model is small enough to solve exactly: no classes, by day
+    # either; the bisection proves a tight spread only over people
+    aggregate_staff = (
+        aggregate_staff and fairness != "bisect"
+        and is_large_model(_per_person_variables(staff_ids, session_ids, blocked))
+    )
+    if aggregate_staff:
+        classes = staff_classes(staff_ids, load_weight, max_hours_map, blocked)
+        # classes trade exact per-person fairness for a smaller model; only
+        # worth it when the per-person model is large and they at least
+        # halve the number of staff units
+        if len(classes) * 2 <= len(units):
+            print(f"Staff classes: {len(classes)} for {len(dict.fromkeys(staff_ids))} staff")
+            units = classes
+
+    if flow_result is not None and engine == "flow":
+        assigned, load_minutes = flow_result
+    else:
+        if flow_result is not None:
+            solve_opts["hint"] = flow_result[0]
+        daily = (None, None)
+        polish = True
+        if decompose_by_day and not explain:
+            # the dates and the final polish share the budget: one share each
+            deadline = None if time_limit_sec is None else time.monotonic() + time_limit_sec
+            n_dates = len(set(date_key_map.values()))
+            day_opts = dict(solve_opts)
+            if deadline is not None:
+                day_opts["time_limit_sec"] = time_limit_sec * n_dates / (n_dates + 1)
+            daily = _solve_by_day(data, staff_ids, aggregate_staff=aggregate_staff, **day_opts)
+            left = None if deadline is None else deadline - time.monotonic()
+            if daily[0] is None:
+                print("A day could not be staffed from the carried-over loads; solving all days together")
+                if left is not None:
+                    solve_opts["time_limit_sec"] = max(1.0, left)
+            elif left is not None and left < 1.0:
+                print("No time left to polish all days together")
+                polish = False
+            else:
+                print("=== Polishing all days together ===")
+                solve_opts["hint"] = daily[0]
+                if left is not None:
+                    solve_opts["time_limit_sec"] = left
+
+        assigned = None
+        if polish:
+            try:
+                assigned, load_minutes = _solve_assignment(data, units, **solve_opts)
+                if assigned is None:
+                    # a class total could not be split within MaxHours: solve per person
+                    print("Class split exceeded MaxHours; solving per staff member")
+                    assigned, load_minutes = _solve_assignment(data, [[d] for d in staff_ids], **solve_opts)
+            except InfeasibleModelError as e:
+                # a polish that runs out of time leaves the daily assignment
+                if daily[0] is None or e.status == "INFEASIBLE":
+                    raise
+                print("Polish found no solution in time; keeping the day-by-day assignment")
+        if daily[0] is not None and (
+            assigned is None
+            or _load_spread(daily[1], load_weight) < _load_spread(load_minutes, load_weight)
+        ):
+            assigned, load_minutes = daily
+
+    print(f"Load spread (weighted minutes): {_load_spread(load_minutes, load_weight)}")
+
+    # ============== Build outputs ==============
+    merged, summary_df = schedule_frames(inputs, assigned, load_minutes)
 
+    progress.stage("Saving Excel")
     print("=== Saving Excel ===")
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        merged.to_excel(writer, index=False, sheet_name="SessionsWithInvigilators")
-        summary_df.to_excel(writer, index=False, sheet_name="StaffLoadSummary")
+    write_excel_sheets(output_path, {
+        "SessionsWithInvigilators": merged,
+        "StaffLoadSummary": summary_df,
+    })
 
     print("Done, saved to:", output_path)
     return merged, summary_df
@@ -0,0 +1,213 @@
+"""
+Business Layer - Invigilation Staff Classes
+Interchangeable staff grouped into classes, and the split of class counts back to people
+"""
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+
+def staff_classes(
+    staff_ids: Sequence[str],
+    load_weight: Dict[str, int],
+    max_hours_map: Dict[str, int],
+    blocked: Set[Tuple[str, Hashable]],
+) -> List[List[str]]:
+    """
+    Staff the model cannot tell apart: same load weight, same MaxHours and
+    the same sessions blocked by engagements (e.g. assistants without any
+    engagement). Classes keep the staff_ids order; duplicate IDs count once.
+    """
+    blocked_by_staff: Dict[str, List[Hashable]] = {}
+    for d, s in blocked:
+        blocked_by_staff.setdefault(d, []).append(s)
+
+    classes: Dict[tuple, List[str]] = {}
+    for d in dict.fromkeys(staff_ids):
+        key = (
+            load_weight.get(d, 1),
+            max_hours_map.get(d),
+            frozenset(blocked_by_staff.get(d, ())),
+        )
+        classes.setdefault(key, []).append(d)
+    return list(classes.values())
+
+
+def split_class_counts(
+    members: Sequence[str],
+    counts: Dict[Hashable, int],
+    date_key: Dict[Hashable, Hashable],
+    start_min: Dict[Hashable, int],
+    end_min: Dict[Hashable, int],
+    duration: Dict[Hashable, int],
+    max_minutes: Optional[int] = None,
+    max_passes: int = 10,
+) -> Tuple[Dict[Hashable, List[str]], Dict[str, int]]:
+    """
+    Turn "counts[s] members of this class invigilate session s" into names.
+
+    Sessions are taken in time order and each goes to the least-loaded members
+    free at that time. If the counts respect the class clique bound (at most
+    len(members) in any set of overlapping sessions), a free member always
+    exists: everyone busy sits in a session containing this start time.
+    Members still under max_minutes are preferred, and single moves to a less
+    loaded member (within max_minutes) then narrow the spread.
+    Returns (session -> members, member -> minutes).
+    """
+    load = {m: 0 for m in members}
+    busy_until: Dict[str, Dict[Hashable, List[Tuple[int, int]]]] = {m: {} for m in members}
+    assigned: Dict[Hashable, List[str]] = {}
+
+    def free(m, s):
+        s_start, s_end = start_min[s], end_min[s]
+        return all(
+            not (a < s_end and s_start < b)
+            for a, b in busy_until[m].get(date_key[s], ())
+        )
+
+    def take(m, s):
+        busy_until[m].setdefault(date_key[s], []).append((start_min[s], end_min[s]))
+        load[m] += int(duration[s])
+
+    def release(m, s):
+        busy_until[m][date_key[s]].remove((start_min[s], end_min[s]))
+        load[m] -= int(duration[s])
+
+    def fits(m, s):
+        return max_minutes is None or load[m] + int(duration[s]) <= max_minutes
+
+    order = sorted((s for s, k in counts.items() if k > 0), key=lambda s: (str(date_key[s]), start_min[s], str(s)))
+    for s in order:
+        candidates = sorted((m for m in members if free(m, s)), key=lambda m: (not fits(m, s), load[m]))
+        chosen = candidates[: int(counts[s])]
+        if len(chosen) < int(counts[s]):
+            raise ValueError(f"Class of {len(members)} staff cannot cover {counts[s]} invigilators for session {s}")
+        assigned[s] = chosen
+        for m in chosen:
+            take(m, s)
+
+    # moving s from m to a less loaded member strictly lowers the sum of
+    # squared loads, so these passes always terminate
+    for _ in range(max_passes):
+        improved = False
+        for s in order:
+            for i, m in enumerate(assigned[s]):
+                release(m, s)
+                others = [o for o in members if o not in assigned[s] and free(o, s) and fits(o, s)]
+                best = min(others, key=lambda o: load[o], default=m)
+                if best != m and load[best] < load[m]:
+                    improved = True
+                    assigned[s][i] = best
+                    take(best, s)
+                else:
+                    take(m, s)
+        if not improved:
+            break
+    return assigned, load
+
+
+def rebalance_loads(
+    assigned: Dict[Hashable, List[str]],
+    loads: Dict[str, int],
+    blocked: Set[Tuple[str, Hashable]],
+    date_key: Dict[Hashable, Hashable],
+    start_min: Dict[Hashable, int],
+    end_min: Dict[Hashable, int],
+    duration: Dict[Hashable, int],
+    load_weight: Dict[str, int],
+    max_minutes: Dict[str, int],
+    max_moves: Optional[int] = None,
+) -> int:
+    """
+    Even out weighted loads after the class counts were split, across classes
+    too: a more loaded member hands one session to a less loaded one, or swaps
+    a longer session for a shorter one, when both end up strictly between
+    their old loads (so the overall max never rises and the min never drops).
+    Most loaded staff are tried first. Moves keep engagements, overlaps and
+    MaxHours intact. `assigned` and `loads` are updated in place; returns the
+    number of moves. Staff are kept in one list ordered by weighted load
+    (ties in `loads` order), re-positioned by bisection after each move.
+    """
+    sessions_of: Dict[str, List[Hashable]] = {d: [] for d in loads}
+    for s, people in assigned.items():
+        for d in people:
+            sessions_of[d].append(s)
+
+    def norm(d, minutes=None):
+        return load_weight.get(d, 1) * (loads[d] if minutes is None else minutes)
+
+    # smallest load change a move can make: a session, or a swap of two lengths
+    lengths = sorted({int(duration[s]) for s in assigned})
+    step = min([lengths[0]] + [y - x for x, y in zip(lengths, lengths[1:])]) if lengths else 0
+
+    order = {d: k for k, d in enumerate(loads)}
+    ranked = sorted((norm(d), order[d], d) for d in loads)  # least loaded first
+
+    def most_loaded():
+        """Staff by descending load, ties in `loads` order (a snapshot per load level)."""
+        end = len(ranked)
+        while end:
+            start = bisect_left(ranked, (ranked[end - 1][0],))
+            yield from ranked[start:end]
+            end = start
+
+    def free(d, s, ignoring=None):
+        s_start, s_end = start_min[s], end_min[s]
+        return all(
+            t == ignoring or date_key[t] != date_key[s] or not (start_min[t] < s_end and s_start < end_min[t])
+            for t in sessions_of[d]
+        )
+
+    def can_take(d, s, gives_up=None):
+        if d in assigned[s] or (d, s) in blocked:
+            return False
+        return free(d, s, ignoring=gives_up)
+
+    def transfer(a, b, s, t):
+        """a takes over nothing / t from b, b takes s from a."""
+        for d in (a, b):
+            del ranked[bisect_left(ranked, (norm(d), order[d]))]
+        assigned[s][assigned[s].index(a)] = b
+        sessions_of[a].remove(s)
+        sessions_of[b].append(s)
+        loads[a] -= int(duration[s])
+        loads[b] += int(duration[s])
+        if t is not None:
+            assigned[t][assigned[t].index(b)] = a
+            sessions_of[b].remove(t)
+            sessions_of[a].append(t)
+            loads[b] -= int(duration[t])
+            loads[a] += int(duration[t])
+        for d in (a, b):
+            insort(ranked, (norm(d), order[d], d))
+
+    def improve(a):
+        high = norm(a)
+        for low, _, b in ranked:
+            # b only gets more loaded further on: stop once a cannot give up `step`
+            if low >= high or norm(a, loads[a] - step) <= low:
+                return False
+            if norm(b, loads[b] + step) >= high:
+                continue
+            options = [(s, None) for s in sessions_of[a]]
+            options += [(s, t) for s in sessions_of[a] for t in sessions_of[b] if duration[s] > duration[t]]
+            for s, t in options:
+                delta = int(duration[s]) - (int(duration[t]) if t is not None else 0)
+                if not (norm(b, loads[b] + delta) < high and norm(a, loads[a] - delta) > low):
+                    continue
+                if b in max_minutes and loads[b] + delta > max_minutes[b]:
+                    continue
+                if not can_take(b, s, gives_up=t) or (t is not None and not can_take(a, t, gives_up=s)):
+                    continue
+                transfer(a, b, s, t)
+                return True
+        return False
+
+    # each change replaces the pair's higher load by two smaller ones, so the
+    # descending sorted loads shrink lexicographically and this terminates
+    limit = max_moves if max_moves is not None else 20 * max(1, len(loads))
+    moves = 0
+    while moves < limit:
+        if not any(improve(a) for _, _, a in most_loaded()):
+            break
+        moves += 1
+    return moves
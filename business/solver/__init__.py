@@ -0,0 +1,49 @@
+"""
+Business Layer - Solver Support Package
+Shared CP-SAT helpers used by the exam and invigilation schedulers
+"""
+from business.solver.explain import (
+    InfeasibleModelError,
+    AssumptionGuards,
+    format_conflicts
+)
+from business.solver.early_stop import (
+    StopCriteria,
+    EarlyStopCallback,
+    solve_with_early_stop
+)
+from business.solver.fairness import (
+    SpreadSearchResult,
+    bisect_spread
+)
+from business.solver.progress import (
+    SolverProgress,
+    ProgressReporter
+)
+from business.solver.tuning import (
+    SolverSettings,
+    ModelSize,
+    choose_solver_settings,
+    model_size,
+    record_solver_run,
+    default_history_path
+)
+
+__all__ = [
+    'InfeasibleModelError',
+    'AssumptionGuards',
+    'format_conflicts',
+    'StopCriteria',
+    'EarlyStopCallback',
+    'solve_with_early_stop',
+    'SpreadSearchResult',
+    'bisect_spread',
+    'SolverProgress',
+    'ProgressReporter',
+    'SolverSettings',
+    'ModelSize',
+    'choose_solver_settings',
+    'model_size',
+    'record_solver_run',
+    'default_history_path',
+]
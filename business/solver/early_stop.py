@@ -0,0 +1,146 @@
+"""
+Business Layer - Solver Early Stopping
+Stops a CP-SAT search once the gap is small enough or the objective stagnates
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from ortools.sat.python import cp_model
+
+
+@dataclass
+class StopCriteria:
+    """
+    When to stop an optimization before its time limit. Any satisfied criterion
+    stops the search; 0 / None disables it.
+
+      relative_gap             - |objective - bound| / max(1, |objective|) at most this
+      absolute_gap             - |objective - bound| at most this
+      no_improvement_sec       - no better solution for this many seconds
+      no_improvement_solutions - this many solutions in a row without improvement
+    """
+    relative_gap: float = 0.0
+    absolute_gap: float = 0.0
+    no_improvement_sec: Optional[float] = None
+    no_improvement_solutions: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(
+            self.relative_gap > 0 or self.absolute_gap > 0
+            or self.no_improvement_sec or self.no_improvement_solutions
+        )
+
+
+class EarlyStopCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Solution callback applying StopCriteria. Gap and solution-count criteria are
+    checked on every solution; the time criterion needs a watchdog thread since
+    no callback fires while the search stagnates (see solve_with_early_stop).
+    on_solution(objective, bound, solutions), if given, sees every solution
+    (progress reporting).
+    """
+
+    def __init__(
+        self,
+        criteria: StopCriteria,
+        maximize: bool = False,
+        on_solution: Optional[Callable[[float, float, int], None]] = None,
+    ):
+        super().__init__()
+        self.criteria = criteria
+        self.on_solution = on_solution
+        self.sign = -1.0 if maximize else 1.0
+        self.best: Optional[float] = None
+        self.last_improvement = time.monotonic()
+        self.solutions_since_improvement = 0
+        self.solutions = 0
+        self.stop_reason: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def on_solution_callback(self):
+        objective = self.ObjectiveValue()
+        bound = self.BestObjectiveBound()
+        with self._lock:
+            self.solutions += 1
+            if self.best is None or self.sign * objective < self.sign * self.best:
+                self.best = objective
+                self.last_improvement = time.monotonic()
+                self.solutions_since_improvement = 0
+            else:
+                self.solutions_since_improvement += 1
+            solutions = self.solutions
+        if self.on_solution is not None:
+            self.on_solution(objective, bound, solutions)
+
+        gap = abs(objective - bound)
+        c = self.criteria
+        if c.absolute_gap > 0 and gap <= c.absolute_gap:
+            self._stop(f"absolute gap {gap:g} <= {c.absolute_gap:g}")
+        elif c.relative_gap > 0 and gap / max(1.0, abs(objective)) <= c.relative_gap:
+            self._stop(f"relative gap {gap / max(1.0, abs(objective)):.4f} <= {c.relative_gap:g}")
+        elif c.no_improvement_solutions and self.solutions_since_improvement >= c.no_improvement_solutions:
+            self._stop(f"{self.solutions_since_improvement} solutions without improvement")
+
+    def stagnant_for(self) -> Optional[float]:
+        """Seconds since the last improving solution, or None before the first one."""
+        with self._lock:
+            if self.best is None:
+                return None
+            return time.monotonic() - self.last_improvement
+
+    def _stop(self, reason: str):
+        if self.stop_reason is None:
+            self.stop_reason = reason
+        self.StopSearch()
+
+
+def _is_maximization(model) -> bool:
+    proto = model.Proto()
+    if proto.has_floating_point_objective():
+        return bool(proto.floating_point_objective.maximize)
+    return proto.objective.scaling_factor < 0
+
+
+def solve_with_early_stop(solver, model, criteria: Optional[StopCriteria], progress=None):
+    """
+    solver.Solve(model) honouring `criteria`. Returns (status, stop_reason);
+    stop_reason is None when the search ended on its own (optimal, infeasible
+    or time limit). progress: a ProgressReporter (business/solver/progress.py)
+    told about every solution.
+    """
+    if criteria is None or not criteria.enabled:
+        if not progress:
+            return solver.Solve(model), None
+        criteria = StopCriteria()
+
+    callback = EarlyStopCallback(
+        criteria, maximize=_is_maximization(model),
+        on_solution=progress.solution if progress else None,
+    )
+    done = threading.Event()
+    watchdog = None
+    if criteria.no_improvement_sec:
+        window = float(criteria.no_improvement_sec)
+
+        def watch():
+            while not done.wait(min(1.0, window / 4)):
+                idle = callback.stagnant_for()
+                if idle is not None and idle >= window:
+                    if callback.stop_reason is None:
+                        callback.stop_reason = f"no improvement for {window:g}s"
+                    solver.StopSearch()
+                    return
+
+        watchdog = threading.Thread(target=watch, name="cp-sat-early-stop", daemon=True)
+        watchdog.start()
+
+    try:
+        status = solver.Solve(model, callback)
+    finally:
+        done.set()
+        if watchdog is not None:
+            watchdog.join()
+    return status, callback.stop_reason
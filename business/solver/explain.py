@@ -0,0 +1,94 @@
+"""
+Business Layer - Infeasibility Explanation
+Assumption literals on hard constraint families, mapped back to readable conflicts
+"""
+from typing import Any, Dict, List, Optional
+
+
+class InfeasibleModelError(RuntimeError):
+    """
+    Raised when a schedule model has no solution.
+
+    conflicts: list of {"Constraint", "Entity", "Details"} dicts forming a set of
+    hard constraints that cannot all hold together (empty unless explain mode
+    was used or no conflict set could be extracted).
+    status: the solver status name when known ("INFEASIBLE" is a proof,
+    "UNKNOWN" means the time limit ran out before any solution).
+    """
+
+    def __init__(
+        self,
+        message: str,
+        conflicts: Optional[List[Dict[str, Any]]] = None,
+        status: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.conflicts = list(conflicts or [])
+        self.status = status
+
+    def conflicts_df(self):
+        import pandas as pd
+        return pd.DataFrame(self.conflicts, columns=["Constraint", "Entity", "Details"])
+
+
+class AssumptionGuards:
+    """
+    Guard constraint families with assumption literals so CP-SAT can name the
+    ones responsible for infeasibility.
+
+    Usage:
+        guards = AssumptionGuards(model)
+        lit = guards.guard("FixedAssignment", "G1", "fixed to 05-20 | AM")
+        model.Add(x[...] == 1).OnlyEnforceIf(lit)
+        ...
+        guards.activate()              # after all guards are created
+        conflicts = guards.explain()   # only when the solve came back INFEASIBLE
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._literals = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def guard(self, constraint: str, entity: Any, details: str = ""):
+        """New literal standing for one constraint (or one family of constraints)."""
+        lit = self.model.NewBoolVar(f"assume_{constraint}_{len(self._entries)}")
+        self._entries[lit.Index()] = {"Constraint": constraint, "Entity": str(entity), "Details": details}
+        self._literals.append(lit)
+        return lit
+
+    def activate(self):
+        """Register every guard literal as a solver assumption."""
+        if self._literals:
+            self.model.AddAssumptions(self._literals)
+
+    def explain(self, time_limit_sec: float = 30.0) -> List[Dict[str, Any]]:
+        """
+        Re-solve as a pure feasibility problem on one worker (core extraction is
+        only reliable there) and return the sufficient assumptions for
+        infeasibility as conflict rows. Clears the model objective.
+        """
+        from ortools.sat.python import cp_model
+
+        if not self._entries:
+            return []
+        self.model.ClearObjective()
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = float(time_limit_sec)
+        solver.parameters.num_workers = 1
+        if solver.Solve(self.model) != cp_model.INFEASIBLE:
+            return []
+        core = solver.SufficientAssumptionsForInfeasibility()
+        return [self._entries[i] for i in core if i in self._entries]
+
+
+def format_conflicts(conflicts: List[Dict[str, Any]], limit: int = 25) -> str:
+    """Bullet list of conflict rows for error messages."""
+    lines = [f"- [{c['Constraint']}] {c['Entity']}" + (f": {c['Details']}" if c.get("Details") else "")
+             for c in conflicts[:limit]]
+    if len(conflicts) > limit:
+        lines.append(f"... and {len(conflicts) - limit} more")
+    return "\n".join(lines)
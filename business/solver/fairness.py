@@ -0,0 +1,165 @@
+"""
+Business Layer - Solver Fairness Search
+Max/min load spread tightened by bisection over feasibility solves
+"""
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from ortools.sat.python import cp_model
+
+
+@dataclass
+class SpreadSearchResult:
+    """
+    Outcome of bisect_spread. `solver` holds the best solution found (read
+    the original model's variables with solver.Value); status is OPTIMAL
+    when every probe finished, i.e. no smaller spread exists.
+    """
+    status: int
+    solver: Optional[cp_model.CpSolver]
+    max_value: Optional[int] = None
+    min_value: Optional[int] = None
+    probes: int = 0
+    wall_time_sec: float = 0.0
+    stop_reason: Optional[str] = None
+
+    @property
+    def spread(self) -> Optional[int]:
+        return None if self.max_value is None else self.max_value - self.min_value
+
+
+def bisect_spread(
+    model: cp_model.CpModel,
+    max_var: cp_model.IntVar,
+    min_var: cp_model.IntVar,
+    hint_vars: Sequence[cp_model.IntVar],
+    measure: Callable[[cp_model.CpSolver], Tuple[int, int]],
+    settings,
+    max_lower: int = 0,
+    min_upper: Optional[int] = None,
+    granularity: int = 1,
+    probes_per_limit: int = 8,
+    presolve: bool = False,
+    progress=None,
+) -> SpreadSearchResult:
+    """
+    Minimize max_var - min_var without an objective: each probe is a
+    feasibility solve of a copy of `model` with extra bounds, hinted with
+    the last solution. max_var / min_var only bound the loads, so
+    measure(solver) returns the actual (largest, smallest) load of a
+    solution.
+
+      0. any solution (no extra bound)
+      1. lower the maximum  (max_var <= b), bisecting from max_lower up to
+         the incumbent's
+      2. raise the minimum  (min_var >= b, maximum kept), up to min_upper
+      3. bisect the spread  (max_var - min_var <= b) to prove it tight,
+         since the best spread may need a higher maximum than step 1 found;
+         it starts from max_lower - min_upper (rounded to granularity),
+         which needs no probe
+
+    Bounds move in steps of `granularity` (e.g. the gcd of all weighted
+    durations, when every load is a multiple of it). `settings`
+    (SolverSettings) gives the workers and the total time limit; each probe
+    after the first gets at most 1/probes_per_limit of it, and one that runs
+    out of time counts as "no" and leaves the result FEASIBLE instead of
+    OPTIMAL. Probes skip presolve unless asked: on large models it can take
+    longer than a whole probe, and a complete hint is usable without it.
+    progress (ProgressReporter) gets the incumbent spread after every probe,
+    with the proven lower bound once step 3 has one.
+    """
+    started = time.monotonic()
+    deadline = started + settings.time_limit_sec
+    probe_limit = max(1.0, settings.time_limit_sec / probes_per_limit)
+    g = max(1, int(granularity))
+    result = SpreadSearchResult(status=cp_model.UNKNOWN, solver=None)
+    values: List[int] = []
+    proven = True
+    spread_floor = None
+
+    def probe(*bounds, capped=True):
+        nonlocal values, proven
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            proven = False
+            return False
+        trial = model.Clone()
+        trial.ClearObjective()
+        for bound in bounds:
+            trial.Add(bound)
+        if values:
+            trial.ClearHints()
+            for var, value in zip(hint_vars, values):
+                trial.AddHint(var, value)
+        solver = settings.apply(cp_model.CpSolver())
+        solver.parameters.cp_model_presolve = presolve
+        solver.parameters.max_time_in_seconds = min(remaining, probe_limit) if capped else remaining
+        status = solver.Solve(trial)
+        result.probes += 1
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        if found:
+            values = [solver.Value(var) for var in hint_vars]
+            result.solver = solver
+            result.max_value, result.min_value = measure(solver)
+        elif status == cp_model.INFEASIBLE and not bounds:
+            result.status = cp_model.INFEASIBLE
+        elif status != cp_model.INFEASIBLE:
+            proven = False
+        if progress and result.solver is not None:
+            progress.solution(result.spread, spread_floor, result.probes)
+        return found
+
+    def finish():
+        if result.solver is None:
+            result.solver = cp_model.CpSolver()
+        elif result.status != cp_model.INFEASIBLE:
+            result.status = cp_model.OPTIMAL if proven else cp_model.FEASIBLE
+            if not proven:
+                result.stop_reason = "probe time limit reached during bisection"
+            if progress:
+                floor = result.spread if proven else spread_floor
+                progress.solution(result.spread, floor, result.probes)
+        result.wall_time_sec = time.monotonic() - started
+        return result
+
+    def up(value):
+        return -(-value // g)
+
+    # any solution first (uncapped), so that timed-out probes still leave one
+    if not probe(capped=False):
+        return finish()
+
+    # 1) maximum: bisect between the lower bound and the incumbent (units of g)
+    lo, hi = up(max_lower), up(result.max_value)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if probe(max_var <= mid * g):
+            hi = up(result.max_value)
+        else:
+            lo = mid + 1
+    best_max = hi * g
+
+    # 2) minimum: bisect between the incumbent and the upper bound
+    top = best_max if min_upper is None else min(min_upper, best_max)
+    lo, hi = result.min_value // g, top // g
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if probe(max_var <= best_max, min_var >= mid * g):
+            lo = result.min_value // g
+        else:
+            hi = mid - 1
+
+    # 3) spread: bisect down to a proven bound; no maximum is below max_lower
+    #    and no minimum above min_upper (both in steps of g), so the spread
+    #    is at least their gap
+    lo = 0 if min_upper is None else max(0, up(max_lower) - min_upper // g)
+    hi = up(result.spread)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        spread_floor = lo * g
+        if probe(max_var - min_var <= mid * g):
+            hi = up(result.spread)
+        else:
+            lo = mid + 1
+    return finish()
@@ -0,0 +1,99 @@
+"""
+Business Layer - Solver Progress
+Stage, model size, incumbent, bound and time budget reported while a run goes on
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from business.solver.tuning import ModelSize
+
+
+@dataclass(frozen=True)
+class SolverProgress:
+    """
+    One progress report. elapsed_sec and time_limit_sec belong to the current
+    stage (e.g. one solve); objective / best_bound are None until the solver
+    has a solution. Reports can come from solver threads: hand them to the
+    GUI through a queue (see utils/async_utils.ProgressChannel).
+    """
+    stage: str
+    elapsed_sec: float = 0.0
+    time_limit_sec: Optional[float] = None
+    objective: Optional[float] = None
+    best_bound: Optional[float] = None
+    solutions: int = 0
+    variables: Optional[int] = None
+    constraints: Optional[int] = None
+
+    @property
+    def remaining_sec(self) -> Optional[float]:
+        """What is left of the time budget, or None without one."""
+        if self.time_limit_sec is None:
+            return None
+        return max(0.0, self.time_limit_sec - self.elapsed_sec)
+
+    @property
+    def gap(self) -> Optional[float]:
+        """|objective - bound| / max(1, |objective|), as in StopCriteria.relative_gap."""
+        if self.objective is None or self.best_bound is None:
+            return None
+        return abs(self.objective - self.best_bound) / max(1.0, abs(self.objective))
+
+
+ProgressCallback = Callable[[SolverProgress], None]
+
+
+class ProgressReporter:
+    """
+    Sends SolverProgress to a callback, remembering the current stage, its
+    start time, time limit and model size so that solution reports only
+    carry objective and bound. With callback=None every call does nothing,
+    so the solvers can report unconditionally.
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback] = None):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._stage = ""
+        self._started = time.monotonic()
+        self._time_limit: Optional[float] = None
+        self._size: Optional[ModelSize] = None
+
+    def __bool__(self) -> bool:
+        return self.callback is not None
+
+    def stage(self, name: str, time_limit_sec: Optional[float] = None, size: Optional[ModelSize] = None):
+        """Start a stage (resets the clock) and report it."""
+        with self._lock:
+            self._stage = name
+            self._started = time.monotonic()
+            self._time_limit = time_limit_sec
+            self._size = size
+        self._send()
+
+    def solution(self, objective: Optional[float], best_bound: Optional[float], solutions: int):
+        """Report an incumbent of the current stage."""
+        self._send(objective=objective, best_bound=best_bound, solutions=solutions)
+
+    def _send(self, **values):
+        if self.callback is None:
+            return
+        with self._lock:
+            event = SolverProgress(
+                stage=self._stage,
+                elapsed_sec=time.monotonic() - self._started,
+                time_limit_sec=self._time_limit,
+                variables=None if self._size is None else self._size.variables,
+                constraints=None if self._size is None else self._size.constraints,
+                **values,
+            )
+        self.callback(event)
+
+
+def as_reporter(progress) -> ProgressReporter:
+    """Accept a ProgressReporter, a plain callback or None."""
+    if isinstance(progress, ProgressReporter):
+        return progress
+    return ProgressReporter(progress)
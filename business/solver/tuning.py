@@ -0,0 +1,203 @@
+"""
+Business Layer - Solver Tuning
+Picks CP-SAT parameters from the model size, the machine and past runs
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from business.solver.early_stop import StopCriteria
+from utils.system_utils import available_cpus
+
+
+# Budget used when the caller does not give a time limit (previous hardcoded values)
+BASE_TIME_LIMIT_SEC = {"exam": 40.0, "invigilation": 25.0}
+
+# Default stagnation window: this share of the time limit, at least MIN_NO_IMPROVEMENT_SEC
+NO_IMPROVEMENT_SHARE = 0.25
+MIN_NO_IMPROVEMENT_SEC = 5.0
+
+# Model size tiers by number of CP-SAT variables
+SMALL_MODEL_VARS = 2_000
+LARGE_MODEL_VARS = 100_000
+
+# Bound-proving subsolvers skipped on large models so the threads go to LNS
+LNS_FOCUS_IGNORED_SUBSOLVERS = ("max_lp", "lb_tree_search", "objective_lb_search", "probing")
+
+HISTORY_MAX_RUNS = 200
+
+
+@dataclass
+class SolverSettings:
+    """CP-SAT parameters chosen for one solve, plus a short reason for the log."""
+    workers: int
+    time_limit_sec: float
+    linearization_level: int = 1
+    ignore_subsolvers: Tuple[str, ...] = ()
+    stop: StopCriteria = field(default_factory=StopCriteria)
+    reason: str = ""
+
+    def apply(self, solver):
+        """Copy the settings onto a cp_model.CpSolver."""
+        params = solver.parameters
+        params.num_workers = int(self.workers)
+        params.max_time_in_seconds = float(self.time_limit_sec)
+        params.linearization_level = int(self.linearization_level)
+        # the gaps are also checked natively, so a bound improvement alone can stop the search
+        if self.stop.relative_gap > 0:
+            params.relative_gap_limit = float(self.stop.relative_gap)
+        if self.stop.absolute_gap > 0:
+            params.absolute_gap_limit = float(self.stop.absolute_gap)
+        if self.ignore_subsolvers:
+            params.ignore_subsolvers.extend(self.ignore_subsolvers)
+        return solver
+
+
+@dataclass
+class ModelSize:
+    variables: int
+    constraints: int
+
+
+def model_size(model) -> ModelSize:
+    """Number of variables and constraints of a cp_model.CpModel."""
+    proto = model.Proto()
+    return ModelSize(variables=len(proto.variables), constraints=len(proto.constraints))
+
+
+def default_history_path() -> str:
+    """Per-user run history file (used by the GUI; the library only writes it when asked)."""
+    return os.path.join(os.path.expanduser("~"), ".final_exam_scheduler", "solver_history.json")
+
+
+def load_history(history_path: Optional[str]) -> List[Dict[str, Any]]:
+    if not history_path or not os.path.exists(history_path):
+        return []
+    try:
+        with open(history_path, encoding="utf-8") as f:
+            runs = json.load(f)
+        return runs if isinstance(runs, list) else []
+    except (OSError, ValueError):
+        # a broken history file must never stop a solve
+        return []
+
+
+def record_solver_run(
+    history_path: Optional[str],
+    kind: str,
+    size: ModelSize,
+    settings: SolverSettings,
+    status: str,
+    wall_time_sec: float,
+    objective: Optional[float] = None,
+    best_bound: Optional[float] = None,
+    stop_reason: Optional[str] = None,
+):
+    """Append one run to the history file (keeps the last HISTORY_MAX_RUNS runs)."""
+    if not history_path:
+        return
+    runs = load_history(history_path)
+    runs.append({
+        "kind": kind,
+        "variables": int(size.variables),
+        "constraints": int(size.constraints),
+        "workers": int(settings.workers),
+        "time_limit_sec": float(settings.time_limit_sec),
+        "status": status,
+        "wall_time_sec": round(float(wall_time_sec), 3),
+        "objective": objective,
+        "best_bound": best_bound,
+        "stop_reason": stop_reason,
+        "timestamp": int(time.time()),
+    })
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(history_path)), exist_ok=True)
+        with open(history_path, "w", encoding="utf-8") as f:
+            json.dump(runs[-HISTORY_MAX_RUNS:], f, indent=1)
+    except OSError:
+        pass
+
+
+def _similar_runs(history: List[Dict[str, Any]], kind: str, size: ModelSize) -> List[Dict[str, Any]]:
+    """Past runs of the same kind whose model was within a factor 2 in size."""
+    lo, hi = size.variables / 2.0, size.variables * 2.0
+    return [r for r in history if r.get("kind") == kind and lo <= r.get("variables", -1) <= hi]
+
+
+def is_large_model(variables: int) -> bool:
+    """Whether a model of this many variables falls in the large tier (LNS focus)."""
+    return variables >= LARGE_MODEL_VARS
+
+
+def choose_solver_settings(
+    kind: str,
+    size: ModelSize,
+    time_limit_sec: Optional[float] = None,
+    workers: Optional[int] = None,
+    early_stop: Optional[StopCriteria] = None,
+    history_path: Optional[str] = None,
+) -> SolverSettings:
+    """
+    Settings for one solve. Explicit arguments always win; None means "choose":
+
+      workers      - by model size, capped by the cores actually available
+                     (CPU affinity and container cgroup quota)
+      time limit   - the kind's base budget, larger for large models; shortened
+                     when similar past runs proved optimality well within it,
+                     stretched when they all ran out of time
+      early_stop   - stop after a quarter of the time limit (at least 5 s)
+                     without a better solution, plus a 1% relative gap on large
+                     models; pass StopCriteria() to always run to the limit
+      linearization and LNS focus - by model size tier
+    """
+    cpus = available_cpus()
+    base = BASE_TIME_LIMIT_SEC.get(kind, 40.0)
+    notes = [f"{size.variables} vars", f"{cpus} cpu(s)"]
+
+    if size.variables < SMALL_MODEL_VARS:
+        tier_workers, tier_time, linearization, gap, ignored = 4, base, 2, 0.0, ()
+        notes.append("small model")
+    elif not is_large_model(size.variables):
+        tier_workers, tier_time, linearization, gap, ignored = 8, base, 1, 0.0, ()
+        notes.append("medium model")
+    else:
+        tier_workers, tier_time, linearization, gap, ignored = 16, base * 3, 0, 0.01, LNS_FOCUS_IGNORED_SUBSOLVERS
+        notes.append("large model: LNS focus")
+
+    if workers is None:
+        workers = min(tier_workers, cpus)
+    if workers < 8:
+        # too few threads for a portfolio; keep the default subsolver mix
+        ignored = ()
+
+    if time_limit_sec is None:
+        time_limit_sec = tier_time
+        similar = _similar_runs(load_history(history_path), kind, size)
+        proved = [r["wall_time_sec"] for r in similar if r.get("status") == "OPTIMAL"]
+        timed_out = [
+            r for r in similar
+            if r.get("status") != "OPTIMAL" and r.get("wall_time_sec", 0) >= 0.95 * r.get("time_limit_sec", 0)
+        ]
+        if proved:
+            time_limit_sec = min(time_limit_sec, max(10.0, 3.0 * max(proved)))
+            notes.append(f"history: optimal in <= {max(proved):.1f}s")
+        elif similar and len(timed_out) == len(similar):
+            time_limit_sec = min(time_limit_sec * 1.5, 600.0)
+            notes.append("history: always hit the time limit")
+
+    if early_stop is None:
+        early_stop = StopCriteria(
+            relative_gap=gap,
+            no_improvement_sec=max(MIN_NO_IMPROVEMENT_SEC, NO_IMPROVEMENT_SHARE * float(time_limit_sec)),
+        )
+
+    return SolverSettings(
+        workers=max(1, int(workers)),
+        time_limit_sec=float(time_limit_sec),
+        linearization_level=linearization,
+        ignore_subsolvers=tuple(ignored),
+        stop=early_stop,
+        reason=", ".join(notes),
+    )
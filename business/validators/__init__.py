@@ -0,0 +1,19 @@
+"""
+Business Layer - Validators Package
+Exports the pre-solve feasibility checks (exams and invigilation)
+"""
+from business.validators.exam_prechecks import (
+    check_exam_feasibility,
+    precheck_errors_message
+)
+from business.validators.invigilation_prechecks import (
+    check_invigilation_feasibility,
+    invigilation_precheck_message
+)
+
+__all__ = [
+    'check_exam_feasibility',
+    'precheck_errors_message',
+    'check_invigilation_feasibility',
+    'invigilation_precheck_message',
+]
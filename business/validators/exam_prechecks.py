@@ -0,0 +1,245 @@
+"""
+Business Layer - Exam Schedule Pre-checks
+Fast screening for instances CP-SAT can only prove infeasible the slow way
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from business.exam_scheduling.feasibility import SlotDurationIndex
+from utils.interval_utils import overlap_cliques
+
+
+ERROR = "ERROR"
+WARNING = "WARNING"
+
+PRECHECK_COLUMNS = ["Severity", "Check", "ExamGroups", "Details"]
+
+# Cliques are reported once per member set; cap the rows so a badly broken
+# instance still gives a readable sheet
+MAX_ROWS_PER_CHECK = 200
+
+
+def _conflict_graph(student_groups: Dict[str, Sequence[str]]):
+    """Distinct student exam sets and the group adjacency they imply."""
+    signatures = {frozenset(g for g in gl if str(g).strip() != "") for gl in student_groups.values()}
+    signatures = sorted((s for s in signatures if len(s) >= 2), key=_set_order)
+
+    neighbours: Dict[str, Set[str]] = {}
+    for sig in signatures:
+        for g in sig:
+            neighbours.setdefault(g, set()).update(sig)
+    for g, nb in neighbours.items():
+        nb.discard(g)
+    return signatures, neighbours
+
+
+def _greedy_cliques(signatures, neighbours) -> List[frozenset]:
+    """
+    Every student's exam set is a clique of the conflict graph. For each group,
+    take the largest exam set containing it and grow it greedily with groups
+    adjacent to all current members (highest degree first). Not guaranteed
+    maximum, but cheap (at most one extension per group) and catches the
+    usual dense programs. Ties are broken by group name, so the result does
+    not depend on set iteration order (PYTHONHASHSEED).
+    """
+    seeds = {}
+    for sig in sorted(signatures, key=_set_order):
+        for g in sig:
+            seeds.setdefault(g, sig)
+
+    degree = {g: len(nb) for g, nb in neighbours.items()}
+    cliques = set()
+    for sig in sorted(set(seeds.values()), key=_set_order):
+        members = set(sig)
+        candidates = set.intersection(*(neighbours[g] for g in members)) - members
+        for c in sorted(candidates, key=lambda g: (-degree[g], str(g))):
+            if members <= neighbours[c]:
+                members.add(c)
+        cliques.add(frozenset(members))
+    return sorted(cliques, key=_set_order)
+
+
+def _set_order(groups):
+    """Sort key for group sets: largest first, then by member names."""
+    return -len(groups), sorted(map(str, groups))
+
+
+def _disjoint_slot_counter(slot_durations: Sequence[int], slot_intervals: Sequence[Tuple]) -> Callable[[int], int]:
+    """
+    count(duration): the most slots at least `duration` long that are pairwise
+    non-overlapping in time (earliest-end greedy per day), cached per duration.
+    """
+    by_end = sorted(range(len(slot_intervals)), key=lambda t: (slot_intervals[t][2], slot_intervals[t][1]))
+    cache: Dict[int, int] = {}
+
+    def count(duration: int) -> int:
+        if duration not in cache:
+            last_end = {}
+            n = 0
+            for t in by_end:
+                if int(slot_durations[t]) < duration:
+                    continue
+                day, start, end = slot_intervals[t]
+                if day not in last_end or start >= last_end[day]:
+                    last_end[day] = end
+                    n += 1
+            cache[duration] = n
+        return cache[duration]
+
+    return count
+
+
+def _hall_shortfall(clique: Iterable[str], group_duration: Dict[str, int], count: Callable[[int], int]):
+    """
+    Members of a clique need pairwise non-overlapping slots. Feasible slot sets
+    are nested by duration, so Hall's condition reduces to: the k longest exams
+    need at least k such slots that fit the k-th longest. Returns
+    (k, duration, slots) for the first violation, or None.
+    """
+    durations = sorted((int(group_duration.get(g, 120)) for g in clique), reverse=True)
+    for k, dur in enumerate(durations, start=1):
+        available = count(dur)
+        if available < k:
+            return k, dur, available
+    return None
+
+
+def _fmt_groups(groups: Iterable[str], limit: int = 20) -> str:
+    names = sorted(map(str, groups))
+    return ", ".join(names[:limit]) + (f" ... (+{len(names) - limit})" if len(names) > limit else "")
+
+
+def check_exam_feasibility(
+    student_groups: Dict[str, Sequence[str]],
+    group_duration: Dict[str, int],
+    group_students: Dict[str, int],
+    slot_durations: Sequence[int],
+    slot_capacities: Sequence[int],
+    fixed_slots: Optional[Dict[str, int]] = None,
+    slot_labels: Optional[Sequence[str]] = None,
+    slot_intervals: Optional[Sequence[Tuple]] = None,
+) -> "pd.DataFrame":
+    """
+    Screen an exam instance for infeasibility before a model is built.
+
+    Slots are identified by position (as in the model builder); fixed_slots maps
+    ExamGroup -> slot position. slot_intervals gives (day, start_min, end_min) per
+    slot; slots on the same day that overlap in time then count as clashing, like
+    in the model. Without it only the same slot clashes.
+    Returns a DataFrame with PRECHECK_COLUMNS:
+
+      ERROR   ConflictClique    groups sharing students that need more
+                                non-overlapping slots than their durations allow
+      ERROR   FixedClash        two fixed groups sharing students in the same or
+                                overlapping slots
+      ERROR   FixedBlocked      every duration-feasible slot of a group is taken
+                                (or overlapped) by a fixed group it shares students with
+      WARNING CapacityShortfall total students exceed total slot capacity
+                                (capacity is a soft constraint)
+
+    An empty frame means nothing was found; it does not prove feasibility.
+    """
+    fixed_slots = fixed_slots or {}
+    labels = list(slot_labels) if slot_labels is not None else [str(t) for t in range(len(slot_durations))]
+    dur_index = SlotDurationIndex(slot_durations)
+    signatures, neighbours = _conflict_graph(student_groups)
+    rows = []
+
+    # slot -> slots it cannot share a student with (itself + time overlaps)
+    clashing_slots: Dict[int, Set[int]] = {t: {t} for t in range(len(slot_durations))}
+    if slot_intervals is not None:
+        for clique in overlap_cliques(slot_intervals):
+            for t in clique:
+                clashing_slots[t].update(clique)
+        slot_count = _disjoint_slot_counter(slot_durations, slot_intervals)
+    else:
+        slot_count = dur_index.count
+
+    # 1) conflict cliques larger than the slots their durations can use. Student
+    #    exam sets are checked as they are (cheap) and as greedily grown cliques;
+    #    a violation carries over to every superset, so only maximal ones are reported.
+    violating = []
+    for clique in set(signatures).union(_greedy_cliques(signatures, neighbours)):
+        shortfall = _hall_shortfall(clique, group_duration, slot_count)
+        if shortfall is not None:
+            violating.append((clique, shortfall))
+    violating.sort(key=lambda v: _set_order(v[0]))
+    reported = []
+    for clique, (k, dur, available) in violating:
+        if any(clique <= r for r in reported):
+            continue
+        reported.append(clique)
+        rows.append({
+            "Severity": ERROR,
+            "Check": "ConflictClique",
+            "ExamGroups": _fmt_groups(clique),
+            "Details": (
+                f"{len(clique)} exam groups share students pairwise; {k} of them need "
+                f">= {dur} min but only {available} non-overlapping slot(s) are that long"
+            ),
+        })
+        if len(reported) >= MAX_ROWS_PER_CHECK:
+            break
+
+    # 2) fixed groups sharing students placed in the same or overlapping slots
+    clash_rows = []
+    fixed_sorted = sorted(fixed_slots.items(), key=lambda kv: str(kv[0]))
+    for i, (a, ta) in enumerate(fixed_sorted):
+        for b, tb in fixed_sorted[i + 1:]:
+            if tb in clashing_slots[ta] and b in neighbours.get(a, ()):
+                where = f"both fixed to {labels[ta]}" if ta == tb else f"fixed to overlapping {labels[ta]} / {labels[tb]}"
+                clash_rows.append({
+                    "Severity": ERROR,
+                    "Check": "FixedClash",
+                    "ExamGroups": _fmt_groups([a, b]),
+                    "Details": f"{where} but share students",
+                })
+    rows.extend(clash_rows[:MAX_ROWS_PER_CHECK])
+
+    # 3) free groups whose every feasible slot is occupied by (or overlaps) a fixed neighbour
+    blocked_rows = []
+    for g in sorted(group_duration, key=str):
+        if g in fixed_slots:
+            continue
+        feasible = dur_index.slots_for(group_duration[g])
+        taken = set()
+        for n in neighbours.get(g, ()):
+            if n in fixed_slots:
+                taken |= clashing_slots[fixed_slots[n]]
+        if feasible and taken.issuperset(feasible):
+            blockers = [n for n in neighbours.get(g, ()) if n in fixed_slots]
+            blocked_rows.append({
+                "Severity": ERROR,
+                "Check": "FixedBlocked",
+                "ExamGroups": str(g),
+                "Details": (
+                    f"all {len(feasible)} slot(s) long enough are taken by fixed groups sharing "
+                    f"its students: {_fmt_groups(blockers)}"
+                ),
+            })
+    rows.extend(blocked_rows[:MAX_ROWS_PER_CHECK])
+
+    # 4) capacity lower bound (soft in the model -> warning only)
+    demand = sum(int(group_students.get(g, 0)) for g in group_duration)
+    capacity = sum(int(c) for c in slot_capacities)
+    if demand > capacity:
+        rows.append({
+            "Severity": WARNING,
+            "Check": "CapacityShortfall",
+            "ExamGroups": "",
+            "Details": (
+                f"{demand} exam seats needed but total slot capacity is {capacity}; "
+                f"capacity overage will be at least {demand - capacity}"
+            ),
+        })
+
+    return pd.DataFrame(rows, columns=PRECHECK_COLUMNS)
+
+
+def precheck_errors_message(issues_df: "pd.DataFrame", limit: int = 20) -> str:
+    """Human readable summary of the ERROR rows, for exceptions and message boxes."""
+    errors = issues_df[issues_df["Severity"] == ERROR]
+    lines = [f"- [{r.Check}] {r.ExamGroups}: {r.Details}" for r in errors.head(limit).itertuples()]
+    more = f"\n... and {len(errors) - limit} more" if len(errors) > limit else ""
+    return "\n".join(lines) + more
@@ -0,0 +1,231 @@
+"""
+Business Layer - Invigilation Pre-checks
+Demand against staff availability, MaxHours and a max-flow bound, before any model is built
+"""
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from ortools.graph.python import max_flow
+
+from business.validators.exam_prechecks import ERROR, MAX_ROWS_PER_CHECK
+from utils.interval_utils import overlap_blocks, overlap_cliques
+
+
+INVIGILATION_PRECHECK_COLUMNS = ["Severity", "Check", "Sessions", "Window", "Details"]
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{int(minutes) // 60:02d}:{int(minutes) % 60:02d}"
+
+
+def _fmt_sessions(sessions: Sequence[Hashable], labels: Dict[Hashable, str], limit: int = 20) -> str:
+    names = [labels.get(s, str(s)) for s in sessions]
+    return ", ".join(names[:limit]) + (f" ... (+{len(names) - limit})" if len(names) > limit else "")
+
+
+def _max_disjoint(intervals: List[Tuple[Hashable, int, int]]) -> int:
+    """Most pairwise non-overlapping intervals (earliest end first, per date)."""
+    last_end: Dict[Hashable, int] = {}
+    n = 0
+    for day, start, end in sorted(intervals, key=lambda iv: (iv[2], iv[1])):
+        if day not in last_end or start >= last_end[day]:
+            last_end[day] = end
+            n += 1
+    return n
+
+
+def check_invigilation_feasibility(
+    session_ids: Sequence[Hashable],
+    staff_ids: Sequence[str],
+    inv_needed: Dict[Hashable, int],
+    duration: Dict[Hashable, int],
+    date_key: Dict[Hashable, Hashable],
+    start_min: Dict[Hashable, int],
+    end_min: Dict[Hashable, int],
+    blocked: Set[Tuple[str, Hashable]],
+    max_minutes: Dict[str, int],
+    session_labels: Optional[Dict[Hashable, str]] = None,
+) -> "pd.DataFrame":
+    """
+    Screen an invigilation instance before a model is built. blocked holds
+    (staff, session) pairs ruled out by engagements; max_minutes is MaxHours
+    in minutes. Returns a DataFrame with INVIGILATION_PRECHECK_COLUMNS:
+
+      ERROR SessionUnderstaffed  fewer free staff than InvigilatorsNeeded
+      ERROR WindowOverload       overlapping sessions need more invigilators
+                                 together than staff free in that window
+      ERROR MaxHoursTotal        demanded minutes exceed what all staff can
+                                 give (MaxHours, or their free sessions)
+      ERROR FlowBound            a max flow over staff -> session
+                                 availability (one session per person and
+                                 overlap window, non-overlapping session
+                                 counts and MaxHours per person) cannot fill
+                                 every slot; lists the sessions in the
+                                 bottleneck (source side of the min cut)
+
+    An empty frame means nothing was found; it does not prove feasibility.
+    """
+    labels = session_labels or {}
+    session_ids = list(session_ids)
+    staff_ids = list(dict.fromkeys(staff_ids))
+    n_sess, n_staff = len(session_ids), len(staff_ids)
+    rows = []
+
+    def window(sessions):
+        first = sessions[0]
+        start = max(start_min[s] for s in sessions)
+        end = min(end_min[s] for s in sessions)
+        return f"{date_key[first]} {_hhmm(start)}-{_hhmm(end)}"
+
+    # availability matrix: staff x session
+    s_pos = {s: j for j, s in enumerate(session_ids)}
+    d_pos = {d: i for i, d in enumerate(staff_ids)}
+    free = np.ones((n_staff, n_sess), dtype=bool)
+    for d, s in blocked:
+        if d in d_pos and s in s_pos:
+            free[d_pos[d], s_pos[s]] = False
+    need = np.array([int(inv_needed[s]) for s in session_ids], dtype=np.int64)
+    dur = np.array([int(duration[s]) for s in session_ids], dtype=np.int64)
+
+    # 1) single sessions
+    free_count = free.sum(axis=0)
+    for j in np.flatnonzero(free_count < need)[:MAX_ROWS_PER_CHECK]:
+        s = session_ids[j]
+        rows.append({
+            "Severity": ERROR,
+            "Check": "SessionUnderstaffed",
+            "Sessions": _fmt_sessions([s], labels),
+            "Window": window([s]),
+            "Details": f"needs {need[j]} invigilator(s) but only {free_count[j]} staff are free",
+        })
+
+    # 2) overlap windows: one person covers at most one session of a clique
+    cliques = [
+        c for c in overlap_cliques([(date_key[s], start_min[s], end_min[s]) for s in session_ids])
+        if len(c) >= 2
+    ]
+    overload_rows = []
+    for clique in cliques:
+        demand = int(need[clique].sum())
+        staff_free = int(free[:, clique].any(axis=1).sum())
+        if demand > staff_free:
+            members = [session_ids[j] for j in clique]
+            overload_rows.append({
+                "Severity": ERROR,
+                "Check": "WindowOverload",
+                "Sessions": _fmt_sessions(members, labels),
+                "Window": window(members),
+                "Details": (
+                    f"{len(members)} overlapping sessions need {demand} invigilators "
+                    f"but only {staff_free} staff are free in this window"
+                ),
+            })
+    rows.extend(overload_rows[:MAX_ROWS_PER_CHECK])
+
+    # per-person session count bound: per overlap block (run of sessions
+    # chained by overlaps on one date) the most non-overlapping sessions,
+    # summed over the blocks the person is free for at all; and the shortest
+    # free sessions that fit in MaxHours
+    block_of = overlap_blocks(session_ids, date_key, start_min, end_min)
+    block_ids = np.array([block_of[s] for s in session_ids], dtype=np.int64)
+    n_blocks = int(block_ids.max()) + 1 if n_sess else 0
+    members: Dict[int, List[Hashable]] = {}
+    for s in session_ids:
+        members.setdefault(block_of[s], []).append(s)
+    block_cap = np.array([
+        _max_disjoint([(date_key[s], start_min[s], end_min[s]) for s in members[b]])
+        for b in range(n_blocks)
+    ], dtype=np.int64)
+    incidence = np.zeros((n_sess, n_blocks), dtype=np.int64)
+    incidence[np.arange(n_sess), block_ids] = 1
+    count_cap = ((free.astype(np.int64) @ incidence) > 0).astype(np.int64) @ block_cap
+    minutes_cap = free.astype(np.int64) @ dur
+
+    limited = [(i, int(max_minutes[d])) for i, d in enumerate(staff_ids) if d in max_minutes]
+    if limited and n_sess:
+        rows_i = np.array([i for i, _ in limited])
+        caps_m = np.array([m for _, m in limited], dtype=np.int64)
+        shortest = np.cumsum(np.sort(np.where(free[rows_i], dur, np.iinfo(np.int64).max // (n_sess + 1)), axis=1), axis=1)
+        count_cap[rows_i] = np.minimum(count_cap[rows_i], (shortest <= caps_m[:, None]).sum(axis=1))
+        minutes_cap[rows_i] = np.minimum(minutes_cap[rows_i], caps_m)
+
+    # 3) total minutes
+    demanded = int((need * dur).sum())
+    capacity = int(minutes_cap.sum())
+    if demanded > capacity:
+        rows.append({
+            "Severity": ERROR,
+            "Check": "MaxHoursTotal",
+            "Sessions": "",
+            "Window": "",
+            "Details": (
+                f"sessions need {demanded} invigilator-minutes but staff can give at most "
+                f"{capacity} (MaxHours, or the length of the sessions they are free for)"
+            ),
+        })
+
+    # 4) max flow: source -> session -> (staff, clique) -> staff -> sink.
+    #    Sessions in exactly one clique go through a capacity-1 (staff, clique)
+    #    node; anyone may take at most one session of a clique anyway.
+    clique_of = np.full(n_sess, -1, dtype=np.int64)
+    seen = np.zeros(n_sess, dtype=np.int64)
+    for c, clique in enumerate(cliques):
+        clique_of[clique] = c
+        seen[clique] += 1
+    clique_of[seen > 1] = -1
+    n_cliques = len(cliques)
+
+    source, sink = 0, 1
+    session_node = 2 + np.arange(n_sess, dtype=np.int64)
+    staff_node = 2 + n_sess + np.arange(n_staff, dtype=np.int64)
+    block_base = 2 + n_sess + n_staff
+
+    di, sj = np.nonzero(free)
+    via_block = clique_of[sj] >= 0
+    pair_head = np.where(via_block, block_base + di * max(1, n_cliques) + clique_of[sj], staff_node[di])
+    block_i, block_c = np.divmod(np.arange(n_staff * n_cliques, dtype=np.int64), max(1, n_cliques))
+    tails = np.concatenate([
+        np.full(n_sess, source), session_node[sj], block_base + np.arange(n_staff * n_cliques),
+        staff_node,
+    ])
+    heads = np.concatenate([
+        session_node, pair_head, staff_node[block_i], np.full(n_staff, sink),
+    ])
+    caps = np.concatenate([
+        need, np.ones(len(sj), dtype=np.int64), np.ones(n_staff * n_cliques, dtype=np.int64), count_cap,
+    ])
+
+    flow = max_flow.SimpleMaxFlow()
+    flow.add_arcs_with_capacity(tails.astype(np.int32), heads.astype(np.int32), caps.astype(np.int64))
+    if flow.solve(source, sink) == flow.OPTIMAL and flow.optimal_flow() < int(need.sum()):
+        cut = set(flow.get_source_side_min_cut())
+        short = [session_ids[j] for j in range(n_sess) if int(session_node[j]) in cut]
+        by_window: Dict[str, List[Hashable]] = {}
+        for s in sorted(short, key=lambda s: (str(date_key[s]), start_min[s], str(s))):
+            by_window.setdefault(window([s]), []).append(s)
+        rows.append({
+            "Severity": ERROR,
+            "Check": "FlowBound",
+            "Sessions": _fmt_sessions(short, labels),
+            "Window": "; ".join(list(by_window)[:MAX_ROWS_PER_CHECK]),
+            "Details": (
+                f"at most {flow.optimal_flow()} of {int(need.sum())} invigilator slots can be filled; "
+                f"the listed sessions need {int(sum(inv_needed[s] for s in short))} between them "
+                "and the staff free for them run out"
+            ),
+        })
+
+    return pd.DataFrame(rows, columns=INVIGILATION_PRECHECK_COLUMNS)
+
+
+def invigilation_precheck_message(issues_df: "pd.DataFrame", limit: int = 20) -> str:
+    """Human readable summary of the ERROR rows, for exceptions and message boxes."""
+    errors = issues_df[issues_df["Severity"] == ERROR]
+    lines = [
+        f"- [{r.Check}] {r.Window + ': ' if r.Window else ''}{r.Details}"
+        + (f" ({r.Sessions})" if r.Sessions else "")
+        for r in errors.head(limit).itertuples()
+    ]
+    more = f"\n... and {len(errors) - limit} more" if len(errors) > limit else ""
+    return "\n".join(lines) + more
@@ -6,6 +6,8 @@ Generates Excel templates with sample data AND documentation (README sheets)
 import pandas as pd
 from datetime import datetime, timedelta
 
+from data.writers.excel_writer import write_excel_sheets
+
 def generate_exam_scheduler_templates(output_dir="."):
     """Generate all template files for the Exam Scheduler with README sheets."""
     
@@ -36,9 +38,10 @@ def generate_exam_scheduler_templates(output_dir="."):
         'Example': ['STU001', 'Ahmed Mohamed', 'CS', 'CS101,MATH101,PHYS101']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_regs.xlsx", engine='openpyxl') as writer:
-        regs_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        regs_df.to_excel(writer, sheet_name='Regs', index=False)
+    write_excel_sheets(f"{output_dir}/template_regs.xlsx", {
+        '📖 README': regs_readme,
+        'Regs': regs_df,
+    })
     
     # 2. Courses Master Template
     courses_data = {
@@ -68,9 +71,10 @@ def generate_exam_scheduler_templates(output_dir="."):
         'Example': ['CS101', 'Intro to Programming', 'CS', 'GRP_CS1', '120', '']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_courses_master.xlsx", engine='openpyxl') as writer:
-        courses_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        courses_df.to_excel(writer, sheet_name='Courses', index=False)
+    write_excel_sheets(f"{output_dir}/template_courses_master.xlsx", {
+        '📖 README': courses_readme,
+        'Courses': courses_df,
+    })
     
     # 3. Exam Calendar Template
     base_date = datetime(2025, 5, 20)
@@ -94,9 +98,10 @@ def generate_exam_scheduler_templates(output_dir="."):
         'Example': ['2025-05-20', 'Morning', '09:00', '12:00']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_exam_calendar.xlsx", engine='openpyxl') as writer:
-        calendar_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        calendar_df.to_excel(writer, sheet_name='Calendar', index=False)
+    write_excel_sheets(f"{output_dir}/template_exam_calendar.xlsx", {
+        '📖 README': calendar_readme,
+        'Calendar': calendar_df,
+    })
     
     # 4. Slot Capacity Template
     capacity_data = {
@@ -117,9 +122,10 @@ def generate_exam_scheduler_templates(output_dir="."):
         'Example': ['2025-05-20', 'Morning', '100']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_slot_capacity.xlsx", engine='openpyxl') as writer:
-        capacity_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        capacity_df.to_excel(writer, sheet_name='SlotCapacity', index=False)
+    write_excel_sheets(f"{output_dir}/template_slot_capacity.xlsx", {
+        '📖 README': capacity_readme,
+        'SlotCapacity': capacity_df,
+    })
     
     # 5. Constraints Template
     fixed_data = {
@@ -152,10 +158,11 @@ def generate_exam_scheduler_templates(output_dir="."):
         'Example': ['GRP_CS1', '2025-05-20', 'Morning', '5', '1', '3']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_constraints.xlsx", engine='openpyxl') as writer:
-        constraints_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        fixed_df.to_excel(writer, sheet_name='FixedAssignments', index=False)
-        balance_df.to_excel(writer, sheet_name='BalanceSettings', index=False)
+    write_excel_sheets(f"{output_dir}/template_constraints.xlsx", {
+        '📖 README': constraints_readme,
+        'FixedAssignments': fixed_df,
+        'BalanceSettings': balance_df,
+    })
     
     return [
         'template_regs.xlsx',
@@ -196,9 +203,10 @@ def generate_invigilation_templates(output_dir="."):
         'Example': ['SES001', 'Room A', '2025-05-20', '09:00', '11:00', '120', '2']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_sessions.xlsx", engine='openpyxl') as writer:
-        sessions_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        sessions_df.to_excel(writer, sheet_name='Sessions', index=False)
+    write_excel_sheets(f"{output_dir}/template_sessions.xlsx", {
+        '📖 README': sessions_readme,
+        'Sessions': sessions_df,
+    })
     
     # 2. Staff Template
     staff_data = {
@@ -222,9 +230,10 @@ def generate_invigilation_templates(output_dir="."):
         'Example': ['STAFF001', 'Dr. Ahmed Mohamed', 'full', '20']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_staff.xlsx", engine='openpyxl') as writer:
-        staff_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        staff_df.to_excel(writer, sheet_name='Staff', index=False)
+    write_excel_sheets(f"{output_dir}/template_staff.xlsx", {
+        '📖 README': staff_readme,
+        'Staff': staff_df,
+    })
     
     # 3. Engagement Template
     engagement_data = {
@@ -249,9 +258,10 @@ def generate_invigilation_templates(output_dir="."):
         'Example': ['STAFF001', '2025-05-20', '09:00', '10:00', '1']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_engagement.xlsx", engine='openpyxl') as writer:
-        engagement_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        engagement_df.to_excel(writer, sheet_name='Engagement', index=False)
+    write_excel_sheets(f"{output_dir}/template_engagement.xlsx", {
+        '📖 README': engagement_readme,
+        'Engagement': engagement_df,
+    })
     
     return [
         'template_sessions.xlsx',
@@ -287,9 +297,10 @@ def generate_courses_report_templates(output_dir="."):
         'Example': ['STU001', 'Ahmed Mohamed', 'CS', 'CS101,MATH101']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_regs_for_report.xlsx", engine='openpyxl') as writer:
-        regs_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        regs_df.to_excel(writer, sheet_name='Regs', index=False)
+    write_excel_sheets(f"{output_dir}/template_regs_for_report.xlsx", {
+        '📖 README': regs_readme,
+        'Regs': regs_df,
+    })
     
     courses_data = {
         'CourseCode': ['CS101', 'CS102', 'CS103', 'IS101', 'IS102', 'AI101', 'AI102', 'MATH101', 'PHYS101', 'STAT101'],
@@ -317,9 +328,10 @@ def generate_courses_report_templates(output_dir="."):
         'Example': ['CS101', 'Programming', 'CS', 'GRP_CS1', '120', '']
     })
     
-    with pd.ExcelWriter(f"{output_dir}/template_courses_for_report.xlsx", engine='openpyxl') as writer:
-        courses_readme.to_excel(writer, sheet_name='📖 README', index=False)
-        courses_df.to_excel(writer, sheet_name='Courses', index=False)
+    write_excel_sheets(f"{output_dir}/template_courses_for_report.xlsx", {
+        '📖 README': courses_readme,
+        'Courses': courses_df,
+    })
     
     return [
         'template_regs_for_report.xlsx',
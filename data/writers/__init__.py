@@ -0,0 +1,13 @@
+"""
+Data Layer - Writers Package
+Exports the streaming Excel writer used for all generated workbooks
+"""
+from data.writers.excel_writer import (
+    StreamingExcelWriter,
+    write_excel_sheets
+)
+
+__all__ = [
+    'StreamingExcelWriter',
+    'write_excel_sheets',
+]
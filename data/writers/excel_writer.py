@@ -0,0 +1,168 @@
+"""
+Data Layer - Streaming Excel Writer
+Constant-memory .xlsx output for schedules, reports and diagnostics
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# xlsxwriter is optional: without it we fall back to pandas + openpyxl
+try:
+    import xlsxwriter
+except Exception:
+    xlsxwriter = None
+
+
+# Rows converted to Python values per step; bounds the temporary memory per sheet
+DEFAULT_CHUNK_ROWS = 5000
+
+# Same look as pandas' own header row and datetime cells
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+
+# (flag columns, fill colour): a row gets the colour when any of its flag cells is TRUE
+RowFill = Tuple[Sequence[str], str]
+
+
+def _col_letter(idx: int) -> str:
+    """0-based column index -> Excel column letters (0 -> A, 26 -> AA)."""
+    letters = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _row_fill_formulas(columns: Sequence[str], row_fills: Sequence[RowFill]) -> List[Tuple[str, str]]:
+    """
+    Build one conditional-format formula per fill, anchored on data row 2.
+    Flag columns missing from the sheet are skipped.
+    """
+    col_pos = {str(c): i for i, c in enumerate(columns)}
+    rules = []
+    for flag_cols, color in row_fills:
+        refs = [f"${_col_letter(col_pos[c])}2" for c in flag_cols if c in col_pos]
+        if not refs:
+            continue
+        formula = refs[0] if len(refs) == 1 else f"OR({','.join(refs)})"
+        rules.append((formula, color))
+    return rules
+
+
+class StreamingExcelWriter:
+    """
+    Write DataFrames to an .xlsx file one sheet at a time.
+
+    With xlsxwriter installed the workbook runs in constant_memory mode: every
+    row is flushed to disk as soon as it is written, so memory stays flat no
+    matter how many rows or sheets are produced. Rows are converted in chunks
+    of `chunk_rows` so large frames are never copied as a whole.
+
+    Usage:
+        with StreamingExcelWriter("out.xlsx") as writer:
+            writer.write_dataframe(df, "Sheet1")
+    """
+
+    def __init__(self, output_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.output_path = output_path
+        self.chunk_rows = max(1, int(chunk_rows))
+        self._workbook = None
+        self._pd_writer = None
+
+        if xlsxwriter is not None:
+            self._workbook = xlsxwriter.Workbook(output_path, {
+                "constant_memory": True,
+                "default_date_format": DATETIME_FORMAT,
+                "remove_timezone": True,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+            })
+            self._header_format = self._workbook.add_format(HEADER_FORMAT)
+        else:
+            self._pd_writer = pd.ExcelWriter(output_path, engine="openpyxl")
+
+    def write_dataframe(
+        self,
+        df: "pd.DataFrame",
+        sheet_name: str,
+        row_fills: Optional[Sequence[RowFill]] = None,
+    ):
+        """
+        Write df (header + rows, no index) to a new sheet.
+
+        row_fills: optional [(flag_columns, "#RRGGBB"), ...]. Each entry becomes a
+        native conditional-formatting rule over the data rows, so highlighting costs
+        nothing per row and the file is written only once. Rules are checked in
+        order and the first match wins.
+        """
+        rules = _row_fill_formulas(df.columns, row_fills) if row_fills else []
+        last_row, last_col = len(df), len(df.columns) - 1
+
+        if self._pd_writer is not None:
+            df.to_excel(self._pd_writer, index=False, sheet_name=sheet_name)
+            if rules and last_row > 0:
+                from openpyxl.formatting.rule import FormulaRule
+                from openpyxl.styles import PatternFill
+
+                ws = self._pd_writer.sheets[sheet_name]
+                cell_range = f"A2:{_col_letter(last_col)}{last_row + 1}"
+                for formula, color in rules:
+                    rgb = color.lstrip("#").upper()
+                    fill = PatternFill(start_color=rgb, end_color=rgb, fill_type="solid")
+                    ws.conditional_formatting.add(
+                        cell_range, FormulaRule(formula=[formula], fill=fill, stopIfTrue=True)
+                    )
+            return
+
+        ws = self._workbook.add_worksheet(sheet_name)
+        if len(df.columns) == 0:
+            return
+
+        ws.write_row(0, 0, [str(c) for c in df.columns], self._header_format)
+
+        n_rows = len(df)
+        for start in range(0, n_rows, self.chunk_rows):
+            block = df.iloc[start:start + self.chunk_rows]
+            # NaN / NaT -> None so they end up as empty cells like pandas writes them
+            values = block.astype(object).where(block.notna(), None).to_numpy()
+            for offset, row in enumerate(values):
+                ws.write_row(start + offset + 1, 0, row)
+
+        if rules and last_row > 0:
+            for formula, color in rules:
+                ws.conditional_format(1, 0, last_row, last_col, {
+                    "type": "formula",
+                    "criteria": f"={formula}",
+                    "format": self._workbook.add_format({"bg_color": color}),
+                    "stop_if_true": True,
+                })
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        if self._pd_writer is not None:
+            self._pd_writer.close()
+            self._pd_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def write_excel_sheets(
+    output_path: str,
+    sheets: Dict[str, "pd.DataFrame"],
+    chunk_rows: Optional[int] = None,
+):
+    """
+    Write several DataFrames to one workbook, in dict order.
+    Sheet names are used as given (callers keep them Excel-safe).
+    """
+    with StreamingExcelWriter(output_path, chunk_rows or DEFAULT_CHUNK_ROWS) as writer:
+        for name, df in sheets.items():
+            writer.write_dataframe(df, name)
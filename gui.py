@@ -8,18 +8,20 @@ import traceback
 # --- Layered Imports ---
 # Presentation Layer
 from presentation.styles import COLORS, WINDOW_SIZES
-from presentation.gui.widgets import ModernButton, AppBase
+from presentation.gui.widgets import ModernButton, AppBase, ProgressPanel
 
 # Data Layer
 from data.templates import template_generator
 
 # Utils Layer
-from utils.async_utils import run_async
+from utils.async_utils import ProgressChannel, run_async
 
 # Business Layer
 # Business Layer - Direct imports
 from business.exam_scheduling import scheduler as exam_optimizer
 from business.invigilation import scheduler as invigilation_optimizer
+from business.solver.progress import SolverProgress
+from business.solver.tuning import default_history_path
 
 
 def resource_path(relative_path):
@@ -33,6 +35,25 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+# Loaded exam inputs shared by the exam tool windows (scheduler, courses report),
+# keyed by input paths + modification times so edited files are re-read.
+_EXAM_INPUTS_CACHE = {}
+_EXAM_INPUTS_CACHE_SIZE = 4
+
+
+def load_exam_inputs_cached(regs, master, cal=None, cap=None, cons=None):
+    """Parse/expand the exam input files once and reuse them while unchanged."""
+    paths = (regs, master, cal or None, cap or None, cons or None)
+    key = tuple((p, os.path.getmtime(p)) if p else None for p in paths)
+    inputs = _EXAM_INPUTS_CACHE.get(key)
+    if inputs is None:
+        inputs = exam_optimizer.load_exam_inputs(*paths)
+        if len(_EXAM_INPUTS_CACHE) >= _EXAM_INPUTS_CACHE_SIZE:
+            _EXAM_INPUTS_CACHE.pop(next(iter(_EXAM_INPUTS_CACHE)))
+        _EXAM_INPUTS_CACHE[key] = inputs
+    return inputs
+
+
 
 
 
@@ -120,9 +141,44 @@ class AppBase:
                     bg=COLORS['bg_medium'], fg=COLORS['text_secondary'],
                     wraplength=700).pack(pady=(0, 10))
         
+        # Footer (progress, status, run button) is packed before the inputs so it stays visible;
+        # the inputs above it scroll when the window is too short for them
+        self.footer = tk.Frame(self.top, bg=COLORS['bg_dark'])
+        self.footer.pack(side='bottom', fill='x')
+
         # Content frame
-        self.content = tk.Frame(self.top, bg=COLORS['bg_dark'])
-        self.content.pack(fill='both', expand=True, padx=25)
+        self.content = self._scrollable_frame()
+    
+    def _scrollable_frame(self):
+        """Frame inside a canvas with a vertical scrollbar shown only when needed."""
+        body = tk.Frame(self.top, bg=COLORS['bg_dark'])
+        body.pack(fill='both', expand=True, padx=25)
+        canvas = tk.Canvas(body, bg=COLORS['bg_dark'], highlightthickness=0)
+        bar = ttk.Scrollbar(body, orient='vertical', command=canvas.yview)
+        canvas.configure(yscrollcommand=bar.set)
+        canvas.pack(side='left', fill='both', expand=True)
+        frame = tk.Frame(canvas, bg=COLORS['bg_dark'])
+        window = canvas.create_window(0, 0, window=frame, anchor='nw')
+        
+        def update(event=None):
+            canvas.itemconfigure(window, width=canvas.winfo_width())
+            canvas.configure(scrollregion=(0, 0, canvas.winfo_width(), frame.winfo_reqheight()))
+            if frame.winfo_reqheight() > canvas.winfo_height():
+                bar.pack(side='right', fill='y', before=canvas)
+            else:
+                bar.pack_forget()
+                canvas.yview_moveto(0)
+        
+        def wheel(event):
+            # bound on the window, so it also sees the wheel over entries and buttons
+            if bar.winfo_ismapped() and str(event.widget).startswith(str(body)):
+                canvas.yview_scroll(-1 if event.num == 4 or event.delta > 0 else 1, 'units')
+        
+        frame.bind('<Configure>', update)
+        canvas.bind('<Configure>', update)
+        for seq in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.top.bind(seq, wheel, add='+')
+        return frame
     
     def add_section_header(self, text):
         """Add a section header for better organization."""
@@ -257,6 +313,12 @@ class AppBase:
     def get_path(self, key):
         return self.entries[key].get().strip()
 
+    def add_progress_panel(self, chart=True):
+        """Add a ProgressPanel (stage, progress bar, objective chart) below the inputs."""
+        panel = ProgressPanel(self.footer, chart=chart)
+        panel.pack(fill='x', padx=25, pady=(10, 0))
+        return panel
+
 # --- Mini Apps ---
 
 def open_exam_scheduler(root):
@@ -283,8 +345,17 @@ def open_exam_scheduler(root):
                      relief='flat', bd=0, width=10)
     e_rest.insert(0, "1")
     e_rest.pack(side='left', ipady=8)
+
+    explain_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(app.content, text="Explain conflicts if no schedule exists",
+                   variable=explain_var, font=('Segoe UI', 10), bg=COLORS['bg_dark'],
+                   fg=COLORS['text_secondary'], selectcolor=COLORS['bg_light'],
+                   activebackground=COLORS['bg_dark']).pack(anchor='w', pady=4)
     
-    status_lbl = tk.Label(app.top, text="Ready", font=('Segoe UI', 10),
+    panel = app.add_progress_panel()
+    channel = ProgressChannel(app.top, panel.report)
+
+    status_lbl = tk.Label(app.footer, text="Ready", font=('Segoe UI', 10),
                          bg=COLORS['bg_dark'], fg=COLORS['text_secondary'])
     status_lbl.pack(pady=15)
     
@@ -308,25 +379,29 @@ def open_exam_scheduler(root):
         rest = int(e_rest.get())
         
         exam_optimizer.run_final_exam_scheduler(
-            regs_path=regs,
-            courses_master_path=master,
-            calendar_path=cal,
-            slot_capacity_path=cap,
-            constraints_path=cons,
             output_path=out,
             rest_days=rest,
-            diagnostics_only=False
+            diagnostics_only=False,
+            inputs=load_exam_inputs_cached(regs, master, cal, cap, cons),
+            explain=explain_var.get(),
+            history_path=default_history_path(),
+            progress=channel.put
         )
         return out
 
     def on_ok(res):
+        panel.finish()
         messagebox.showinfo("Success", f"Schedule created:\n{res}")
         
     def on_fail(e):
+        panel.finish(ok=False)
         messagebox.showerror("Error", f"Failed:\n{e}\n\n{traceback.format_exc()}")
 
-    btn = ModernButton(app.top, "Run Scheduler", 
-                      lambda: run_async(app.top, run_logic, on_ok, on_fail, status_lbl, [btn]))
+    def start():
+        panel.start()
+        run_async(app.top, run_logic, on_ok, on_fail, status_lbl, [btn], channel)
+
+    btn = ModernButton(app.footer, "Run Scheduler", start)
     btn.pack(pady=20)
 
 def open_diagnostics(root):
@@ -342,15 +417,15 @@ def open_diagnostics(root):
     app.add_file_picker("Constraints:", "cons", "")  # Optional constraints for validation
     app.add_save_picker("Output Path:", "out", "Diagnostics.xlsx")
     
-    status_lbl = tk.Label(app.top, text="Ready", font=('Segoe UI', 10),
+    panel = app.add_progress_panel(chart=False)
+    channel = ProgressChannel(app.top, panel.report)
+
+    status_lbl = tk.Label(app.footer, text="Ready", font=('Segoe UI', 10),
                          bg=COLORS['bg_dark'], fg=COLORS['text_secondary'])
     status_lbl.pack(pady=15)
     
     def run_logic():
         # Using top-level import of exam_optimizer
-        import tempfile
-        import pandas as pd
-        
         regs = app.get_path("regs")
         master = app.get_path("master")
         cal = app.get_path("cal")
@@ -368,72 +443,30 @@ def open_diagnostics(root):
         if not os.path.isabs(out):
              raise ValueError(f"Please click 'Save As' button to select full path. You entered: '{out}'")
         
-        # For diagnostics, create minimal dummy files if calendar/capacity not provided
-        temp_files = []
-        try:
-            if not cal:
-                tf = tempfile.NamedTemporaryFile(mode='w', suffix='.xlsx', delete=False)
-                cal = tf.name
-                temp_files.append(cal)
-                # Create minimal calendar
-                pd.DataFrame({
-                    'Date': ['2025-05-20'],
-                    'SlotID': ['Morning'],
-                    'Start': ['09:00'],
-                    'End': ['12:00']
-                }).to_excel(cal, sheet_name='Calendar', index=False)
-            
-            if not cap:
-                tf = tempfile.NamedTemporaryFile(mode='w', suffix='.xlsx', delete=False)
-                cap = tf.name  
-                temp_files.append(cap)
-                # Create minimal capacity
-                pd.DataFrame({
-                    'Date': ['2025-05-20'],
-                    'SlotID': ['Morning'],
-                    'CapacityStudents': [999999]
-                }).to_excel(cap, sheet_name='SlotCapacity', index=False)
-            
-            # Create empty constraints file ONLY if not provided by user
-            if not cons:
-                tf_cons = tempfile.NamedTemporaryFile(mode='w', suffix='.xlsx', delete=False)
-                cons = tf_cons.name
-                temp_files.append(cons)
-                pd.DataFrame(columns=['ExamGroup', 'Date', 'SlotID']).to_excel(
-                    cons, sheet_name='FixedAssignments', index=False)
-                # Add empty BalanceSettings sheet
-                with pd.ExcelWriter(cons, engine='openpyxl', mode='a') as writer:
-                    pd.DataFrame(columns=['WeightCapacity', 'WeightRestViolation', 'WeightSpread']).to_excel(
-                        writer, sheet_name='BalanceSettings', index=False)
-
-            diag, dfs = exam_optimizer.run_final_exam_scheduler(
-                regs_path=regs,
-                courses_master_path=master,
-                calendar_path=cal,
-                slot_capacity_path=cap,
-                constraints_path=cons,
-                output_path=out,
-                diagnostics_only=True
-            )
-            
-            exam_optimizer.save_diagnostics_excel(dfs, out)
-            return out
-        finally:
-            # Clean up temp files
-            for tf in temp_files:
-                try:
-                    os.remove(tf)
-                except:
-                    pass
+        # Calendar / capacity / constraints are optional: missing ones are simply
+        # empty in the loaded inputs (no temporary files needed)
+        channel.put(SolverProgress("Loading exam inputs"))
+        inputs = load_exam_inputs_cached(regs, master, cal, cap, cons)
+        channel.put(SolverProgress("Computing diagnostics"))
+        diag, dfs = exam_optimizer.compute_diagnostics(inputs)
+
+        channel.put(SolverProgress("Saving Excel"))
+        exam_optimizer.save_diagnostics_excel(dfs, out)
+        return out
 
     def on_ok(res):
+        panel.finish()
         messagebox.showinfo("Success", f"Diagnostics saved:\n{res}")
         
     def on_fail(e):
+        panel.finish(ok=False)
         messagebox.showerror("Error", f"Failed:\n{e}\n\n{traceback.format_exc()}")
 
-    btn = ModernButton(app.top, "Run Diagnostics",
-                      lambda: run_async(app.top, run_logic, on_ok, on_fail, status_lbl, [btn]))
+    def start():
+        panel.start()
+        run_async(app.top, run_logic, on_ok, on_fail, status_lbl, [btn], channel)
+
+    btn = ModernButton(app.footer, "Run Diagnostics", start)
     btn.pack(pady=20)
 
 def open_courses_report(root):
@@ -446,7 +479,10 @@ def open_courses_report(root):
     app.add_file_picker("Courses Master:", "master")
     app.add_save_picker("Output Path:", "out", "Courses_Report.xlsx")
     
-    status_lbl = tk.Label(app.top, text="Ready", font=('Segoe UI', 10),
+    panel = app.add_progress_panel(chart=False)
+    channel = ProgressChannel(app.top, panel.report)
+
+    status_lbl = tk.Label(app.footer, text="Ready", font=('Segoe UI', 10),
                          bg=COLORS['bg_dark'], fg=COLORS['text_secondary'])
     status_lbl.pack(pady=15)
     
@@ -462,18 +498,27 @@ def open_courses_report(root):
         if not out:
              raise ValueError("Please select an output file path.")
              
-        report, issues = exam_optimizer.generate_courses_report(regs, master)
+        channel.put(SolverProgress("Loading exam inputs"))
+        inputs = load_exam_inputs_cached(regs, master)
+        channel.put(SolverProgress("Building courses report"))
+        report, issues = exam_optimizer.generate_courses_report(inputs=inputs)
+        channel.put(SolverProgress("Saving Excel"))
         exam_optimizer.save_courses_report_excel(report, issues, out)
         return out
 
     def on_ok(res):
+        panel.finish()
         messagebox.showinfo("Success", f"Report saved:\n{res}")
         
     def on_fail(e):
+        panel.finish(ok=False)
         messagebox.showerror("Error", f"Failed:\n{e}\n\n{traceback.format_exc()}")
 
-    btn = ModernButton(app.top, "Build Courses Report",
-                      lambda: run_async(app.top, run_logic, on_ok, on_fail, status_lbl, [btn]))
+    def start():
+        panel.start()
+        run_async(app.top, run_logic, on_ok, on_fail, status_lbl, [btn], channel)
+
+    btn = ModernButton(app.footer, "Build Courses Report", start)
     btn.pack(pady=20)
 
 def open_invigilation(root):
@@ -487,12 +532,14 @@ def open_invigilation(root):
     app.add_file_picker("Engagement:", "engage")
     app.add_save_picker("Output Path:", "out", "Invigilation_Schedule.xlsx")
     
-    status_lbl = tk.Label(app.top, text="Ready", font=('Segoe UI', 10),
+    panel = app.add_progress_panel()
+    channel = ProgressChannel(app.top, panel.report)
+
+    status_lbl = tk.Label(app.footer, text="Ready", font=('Segoe UI', 10),
                          bg=COLORS['bg_dark'], fg=COLORS['text_secondary'])
     status_lbl.pack(pady=15)
     
     def run_logic():
-        import invigilation_optimizer
         sess = app.get_path("sess")
         staff = app.get_path("staff")
         engage = app.get_path("engage")
@@ -501,17 +548,24 @@ def open_invigilation(root):
         if not (sess and staff):
             raise ValueError("Sessions and Staff files required.")
             
-        res = invigilation_optimizer.run_optimization(sess, staff, engage, out)
+        res = invigilation_optimizer.run_optimization(
+            sess, staff, engage, out, history_path=default_history_path(), progress=channel.put
+        )
         return out
 
     def on_ok(res):
+        panel.finish()
         messagebox.showinfo("Success", f"Schedule created:\n{res}")
         
     def on_fail(e):
+        panel.finish(ok=False)
         messagebox.showerror("Error", f"Failed:\n{e}\n\n{traceback.format_exc()}")
 
-    btn = ModernButton(app.top, "Run Invigilation",
-                      lambda: run_async(app.top, run_logic, on_ok, on_fail, status_lbl, [btn]))
+    def start():
+        panel.start()
+        run_async(app.top, run_logic, on_ok, on_fail, status_lbl, [btn], channel)
+
+    btn = ModernButton(app.footer, "Run Invigilation", start)
     btn.pack(pady=20)
 
 # --- Main Launcher ---
@@ -4,8 +4,10 @@ Exports reusable GUI widgets
 """
 from presentation.gui.widgets.modern_button import ModernButton
 from presentation.gui.widgets.base_window import AppBase
+from presentation.gui.widgets.progress_panel import ProgressPanel
 
 __all__ = [
     'ModernButton',
     'AppBase',
+    'ProgressPanel',
 ]
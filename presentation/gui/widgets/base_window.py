@@ -3,8 +3,9 @@ Presentation Layer - Base Window Widget
 Reusable base window for tool dialogs with template generation support
 """
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox
 from presentation.styles import COLORS, WINDOW_SIZES
+from presentation.gui.widgets.progress_panel import ProgressPanel
 
 
 class AppBase:
@@ -31,9 +32,44 @@ class AppBase:
                     bg=COLORS['bg_medium'], fg=COLORS['text_secondary'],
                     wraplength=700).pack(pady=(0, 10))
         
+        # Footer (progress, status, run button) is packed before the inputs so it stays visible;
+        # the inputs above it scroll when the window is too short for them
+        self.footer = tk.Frame(self.top, bg=COLORS['bg_dark'])
+        self.footer.pack(side='bottom', fill='x')
+
         # Content frame
-        self.content = tk.Frame(self.top, bg=COLORS['bg_dark'])
-        self.content.pack(fill='both', expand=True, padx=25)
+        self.content = self._scrollable_frame()
+    
+    def _scrollable_frame(self):
+        """Frame inside a canvas with a vertical scrollbar shown only when needed."""
+        body = tk.Frame(self.top, bg=COLORS['bg_dark'])
+        body.pack(fill='both', expand=True, padx=25)
+        canvas = tk.Canvas(body, bg=COLORS['bg_dark'], highlightthickness=0)
+        bar = ttk.Scrollbar(body, orient='vertical', command=canvas.yview)
+        canvas.configure(yscrollcommand=bar.set)
+        canvas.pack(side='left', fill='both', expand=True)
+        frame = tk.Frame(canvas, bg=COLORS['bg_dark'])
+        window = canvas.create_window(0, 0, window=frame, anchor='nw')
+        
+        def update(event=None):
+            canvas.itemconfigure(window, width=canvas.winfo_width())
+            canvas.configure(scrollregion=(0, 0, canvas.winfo_width(), frame.winfo_reqheight()))
+            if frame.winfo_reqheight() > canvas.winfo_height():
+                bar.pack(side='right', fill='y', before=canvas)
+            else:
+                bar.pack_forget()
+                canvas.yview_moveto(0)
+        
+        def wheel(event):
+            # bound on the window, so it also sees the wheel over entries and buttons
+            if bar.winfo_ismapped() and str(event.widget).startswith(str(body)):
+                canvas.yview_scroll(-1 if event.num == 4 or event.delta > 0 else 1, 'units')
+        
+        frame.bind('<Configure>', update)
+        canvas.bind('<Configure>', update)
+        for seq in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.top.bind(seq, wheel, add='+')
+        return frame
     
     def add_section_header(self, text):
         """Add a section header for better organization."""
@@ -167,3 +203,9 @@ class AppBase:
 
     def get_path(self, key):
         return self.entries[key].get().strip()
+
+    def add_progress_panel(self, chart=True):
+        """Add a ProgressPanel (stage, progress bar, objective chart) below the inputs."""
+        panel = ProgressPanel(self.footer, chart=chart)
+        panel.pack(fill='x', padx=25, pady=(10, 0))
+        return panel
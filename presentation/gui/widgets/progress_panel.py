@@ -0,0 +1,172 @@
+"""
+Presentation Layer - Progress Panel Widget
+Solver stage, progress bar with time left and a live objective / bound chart
+"""
+import time
+import tkinter as tk
+from tkinter import ttk
+from presentation.styles import COLORS
+
+
+class ProgressPanel(tk.Frame):
+    """
+    Shows SolverProgress reports (business/solver/progress.py): the stage and
+    model size, a bar over the stage's time budget with elapsed / remaining
+    time, and (beside them) the incumbent objective and best bound over time. Feed it on
+    the Tk thread only (utils/async_utils.ProgressChannel does that). Between
+    reports the clock keeps ticking from the last one.
+    """
+
+    def __init__(self, parent, chart=True, tick_ms=250, **kwargs):
+        super().__init__(parent, bg=COLORS['bg_dark'], **kwargs)
+        self.tick_ms = tick_ms
+        self._tick_id = None
+        self._last = None
+        self._received = 0.0
+        self._points = []
+
+        # the chart sits beside the text column, so it adds no height of its own
+        self.chart = None
+        if chart:
+            self.chart = tk.Canvas(self, width=260, height=80, bg=COLORS['bg_medium'], highlightthickness=0)
+            self.chart.pack(side='right', fill='y', padx=(12, 0))
+            self.chart.bind('<Configure>', lambda e: self._draw_chart())
+        text = tk.Frame(self, bg=COLORS['bg_dark'])
+        text.pack(side='left', fill='x', expand=True, anchor='n')
+
+        self.stage_lbl = tk.Label(text, text="", font=('Segoe UI', 10, 'bold'), anchor='w',
+                                  bg=COLORS['bg_dark'], fg=COLORS['text_primary'])
+        self.stage_lbl.pack(fill='x')
+
+        style = ttk.Style(self)
+        style.configure('Solver.Horizontal.TProgressbar', troughcolor=COLORS['bg_light'],
+                        background=COLORS['accent_primary'], bordercolor=COLORS['bg_dark'])
+        self.bar = ttk.Progressbar(text, style='Solver.Horizontal.TProgressbar', mode='determinate')
+        self.bar.pack(fill='x', pady=(4, 2))
+
+        self.info_lbl = tk.Label(text, text="", font=('Segoe UI', 9), anchor='w', justify='left',
+                                 bg=COLORS['bg_dark'], fg=COLORS['text_secondary'])
+        self.info_lbl.pack(fill='x')
+
+    # ---------------- feeding ----------------
+
+    def start(self):
+        """Clear the panel for a new run and start the clock."""
+        self._last = None
+        self._points = []
+        self.stage_lbl.config(text="Starting...")
+        self.info_lbl.config(text="")
+        self.bar.stop()
+        self.bar.config(mode='indeterminate')
+        self.bar.start(15)
+        self._draw_chart()
+        self._schedule_tick()
+
+    def report(self, event):
+        """Show one SolverProgress report."""
+        if self._last is None or event.stage != self._last.stage:
+            self._points = []
+            self.bar.stop()
+            if event.time_limit_sec:
+                self.bar.config(mode='determinate', maximum=float(event.time_limit_sec), value=0)
+            else:
+                self.bar.config(mode='indeterminate')
+                self.bar.start(15)
+        self._last = event
+        self._received = time.monotonic()
+        if event.objective is not None:
+            self._points.append((event.elapsed_sec, event.objective, event.best_bound))
+        self.stage_lbl.config(text=event.stage)
+        self._refresh()
+        self._draw_chart()
+
+    def finish(self, ok=True):
+        """Stop the clock; the last figures stay visible."""
+        if self._tick_id is not None:
+            self.after_cancel(self._tick_id)
+            self._tick_id = None
+        self.bar.stop()
+        self.bar.config(mode='determinate', maximum=1.0, value=1.0 if ok else 0.0)
+        self.stage_lbl.config(text="Finished" if ok else "Stopped with an error")
+
+    # ---------------- drawing ----------------
+
+    def _schedule_tick(self):
+        if self._tick_id is not None:
+            self.after_cancel(self._tick_id)
+        self._tick_id = self.after(self.tick_ms, self._tick)
+
+    def _tick(self):
+        self._refresh()
+        self._tick_id = self.after(self.tick_ms, self._tick)
+
+    def _elapsed(self):
+        return self._last.elapsed_sec + (time.monotonic() - self._received)
+
+    def _refresh(self):
+        event = self._last
+        if event is None:
+            return
+        elapsed = self._elapsed()
+        lines = []
+        if event.variables is not None:
+            lines.append(f"Model: {event.variables:,} variables, {event.constraints:,} constraints")
+        if event.objective is not None:
+            text = f"Objective {event.objective:,.0f}"
+            if event.best_bound is not None:
+                gap = abs(event.objective - event.best_bound) / max(1.0, abs(event.objective))
+                text += f"   bound {event.best_bound:,.0f}   gap {gap:.1%}"
+            lines.append(text + f"   ({event.solutions} solution(s))")
+        timing = f"Elapsed {elapsed:.0f}s"
+        if event.time_limit_sec:
+            self.bar.config(value=min(elapsed, float(event.time_limit_sec)))
+            left = max(0.0, event.time_limit_sec - elapsed)
+            timing += f"   at most {left:.0f}s left (limit {event.time_limit_sec:.0f}s)"
+        lines.append(timing)
+        self.info_lbl.config(text="\n".join(lines))
+
+    def _draw_chart(self):
+        if self.chart is None:
+            return
+        c = self.chart
+        c.delete('all')
+        w, h = max(c.winfo_width(), 50), max(c.winfo_height(), 50)
+        pad = 8
+        if not self._points:
+            c.create_text(w // 2, h // 2, text="Objective chart:\nwaiting for a first solution", justify='center',
+                          fill=COLORS['text_secondary'], font=('Segoe UI', 8))
+            return
+
+        values = [v for _, obj, bound in self._points for v in (obj, bound) if v is not None]
+        low, high = min(values), max(values)
+        span = (high - low) or 1.0
+        limit = self._last.time_limit_sec if self._last else None
+        t_max = max([limit or 0.0] + [t for t, _, _ in self._points]) or 1.0
+
+        def xy(t, v):
+            return (pad + (w - 2 * pad) * t / t_max,
+                    h - pad - (h - 2 * pad) * (v - low) / span)
+
+        def steps(series, color):
+            pts = [(t, v) for t, v in series if v is not None]
+            if not pts:
+                return
+            coords = []
+            for k, (t, v) in enumerate(pts):
+                if k:
+                    coords.extend(xy(t, pts[k - 1][1]))
+                coords.extend(xy(t, v))
+            coords.extend(xy(min(t_max, self._elapsed()) if self._tick_id else pts[-1][0], pts[-1][1]))
+            if len(coords) >= 4:
+                c.create_line(*coords, fill=color, width=2)
+
+        steps([(t, bound) for t, _, bound in self._points], COLORS['accent_success'])
+        steps([(t, obj) for t, obj, _ in self._points], COLORS['accent_secondary'])
+        c.create_text(pad, pad, anchor='nw', text=f"{high:,.0f}", fill=COLORS['text_secondary'],
+                      font=('Segoe UI', 7))
+        c.create_text(pad, h - pad, anchor='sw', text=f"{low:,.0f}", fill=COLORS['text_secondary'],
+                      font=('Segoe UI', 7))
+        c.create_text(w - pad, pad, anchor='ne', text="objective", fill=COLORS['accent_secondary'],
+                      font=('Segoe UI', 7))
+        c.create_text(w - pad, pad + 12, anchor='ne', text="bound", fill=COLORS['accent_success'],
+                      font=('Segoe UI', 7))
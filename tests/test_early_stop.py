@@ -0,0 +1,64 @@
+"""
+Test: Early stopping of CP-SAT on gap or stagnation
+"""
+import random
+
+from ortools.sat.python import cp_model
+
+from business.solver.early_stop import StopCriteria, solve_with_early_stop
+from business.solver.tuning import ModelSize, choose_solver_settings
+
+
+def _max_cut(n=120, density=0.2, seed=1):
+    """Random max-cut: good cuts come fast, the bound stays far from them."""
+    rnd = random.Random(seed)
+    model = cp_model.CpModel()
+    side = [model.NewBoolVar(f"side_{i}") for i in range(n)]
+    cut = []
+    for i in range(n):
+        for j in range(i + 1, n):
+            if rnd.random() < density:
+                c = model.NewBoolVar(f"cut_{i}_{j}")
+                model.AddBoolXOr([side[i], side[j], c.Not()])
+                cut.append(c)
+    model.Maximize(sum(cut))
+    return model
+
+
+def _solver(time_limit):
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_workers = 1
+    return solver
+
+
+def test_stagnation_stops_well_before_time_limit():
+    solver = _solver(30)
+    status, reason = solve_with_early_stop(solver, _max_cut(), StopCriteria(no_improvement_sec=1.0))
+    assert status == cp_model.FEASIBLE
+    assert reason == "no improvement for 1s"
+    assert solver.WallTime() < 10
+
+
+def test_gap_stops_on_first_good_enough_solution():
+    solver = _solver(30)
+    status, reason = solve_with_early_stop(solver, _max_cut(), StopCriteria(relative_gap=0.9))
+    assert status == cp_model.FEASIBLE
+    assert reason.startswith("relative gap")
+    assert solver.WallTime() < 10
+
+
+def test_disabled_criteria_leave_search_alone():
+    model = cp_model.CpModel()
+    a = model.NewIntVar(0, 10, "a")
+    model.Minimize(a)
+    status, reason = solve_with_early_stop(_solver(5), model, StopCriteria())
+    assert status == cp_model.OPTIMAL and reason is None
+
+
+def test_default_settings_stop_on_stagnation():
+    settings = choose_solver_settings("exam", ModelSize(500, 800), time_limit_sec=40)
+    assert settings.stop.no_improvement_sec == 10.0
+
+    settings = choose_solver_settings("exam", ModelSize(500, 800), early_stop=StopCriteria())
+    assert not settings.stop.enabled
@@ -0,0 +1,54 @@
+"""
+Test: Engagement interval index (bisect lookups and vectorized session join)
+"""
+import random
+
+from business.invigilation.availability import EngagementIndex
+
+
+def _overlaps(a_start, a_end, b_start, b_end):
+    return a_start < b_end and b_start < a_end
+
+
+def test_busy_and_blocked_pairs_match_same_day_overlaps():
+    index = EngagementIndex(
+        staff_ids=['1', '2', '3', '9', '1'],
+        date_keys=['05-20', '05-20', '05-21', '05-20', '05-20'],
+        starts=[600, 720, 480, 540, 900],
+        ends=[660, 780, 541, 720, 960],
+    )
+    assert index.busy('1', '05-20', 540, 720)          # 10:00-11:00 inside
+    assert not index.busy('2', '05-20', 540, 720)      # touches the end only
+    assert not index.busy('1', '05-21', 540, 720)      # other day
+    assert index.busy(1, '05-20', 950, 1000)           # ids are compared as strings
+    assert index.staff_on('05-20') == {'1', '2', '9'}
+
+    blocked = index.blocked_pairs(
+        ['S1', 'S2'], ['05-20', '05-21'], [540, 540], [720, 720], staff_filter=['1', '2', '3'],
+    )
+    assert blocked == {('1', 'S1'), ('3', 'S2')}
+
+
+def test_random_instances_agree_with_pairwise_scan():
+    rnd = random.Random(7)
+    dates = ['05-20', '05-21', '05-22']
+    busy = []
+    for _ in range(400):
+        start = rnd.randrange(480, 1080, 15)
+        busy.append((str(rnd.randrange(30)), rnd.choice(dates), start, start + rnd.choice([0, 30, 60, 180])))
+    sessions = []
+    for k in range(60):
+        start = rnd.randrange(480, 1000, 30)
+        sessions.append((f'S{k}', rnd.choice(dates), start, start + rnd.choice([60, 120, 180])))
+
+    index = EngagementIndex(*zip(*busy))
+    expected = {
+        (staff, sid)
+        for sid, s_date, s_start, s_end in sessions
+        for staff, b_date, b_start, b_end in busy
+        if s_date == b_date and _overlaps(s_start, s_end, b_start, b_end)
+    }
+    assert index.blocked_pairs(*zip(*sessions)) == expected
+    for staff in map(str, range(30)):
+        for sid, s_date, s_start, s_end in sessions:
+            assert index.busy(staff, s_date, s_start, s_end) == ((staff, sid) in expected)
@@ -0,0 +1,77 @@
+"""
+Test: Exam groups with identical or nested student sets and their use in the model
+"""
+import pandas as pd
+
+from business.exam_scheduling import scheduler
+from business.exam_scheduling.cohorts import (
+    group_student_sets,
+    identical_student_sets,
+    mergeable_groups,
+    nested_student_sets,
+    strict_subsets,
+)
+
+
+def _inputs():
+    # G1/G2/G3 are sections of one cohort (S1-S3), G4 is taken by part of it, G5 by others
+    regs = pd.DataFrame({
+        'ID': ['S1', 'S2', 'S3', 'S4', 'S5'],
+        'Program': ['CS', 'CS', 'CS', 'MATH', 'MATH'],
+        'COURSES': ['A1,A2,A3,B1', 'A1,A2,A3,B1', 'A1,A2,A3', 'C1', 'C1,B1'],
+    })
+    courses = pd.DataFrame({
+        'CourseCode': ['A1', 'A2', 'A3', 'B1', 'C1'],
+        'CourseName': ['Sec 1', 'Sec 2', 'Sec 3', 'Lab', 'Calc'],
+        'Program': ['ALL'] * 5,
+        'ExamGroup': ['G1', 'G2', 'G3', 'G4', 'G5'],
+        'DurationMin': [120, 120, 90, 120, 120],
+        'Terminated': [''] * 5,
+    })
+    days = [f'2025-05-{d}' for d in (20, 20, 21, 21, 22, 22)]
+    calendar = pd.DataFrame({'Date': days, 'SlotID': ['AM', 'PM'] * 3,
+                             'Start': ['09:00', '13:00'] * 3, 'End': ['12:00', '16:00'] * 3})
+    return scheduler.prepare_exam_inputs(regs, courses, calendar)
+
+
+def test_identical_and_nested_sets():
+    inputs = _inputs()
+    sets = group_student_sets(inputs.enroll_df)
+    assert identical_student_sets(sets) == [['G1', 'G2', 'G3']]
+    assert nested_student_sets(sets) == []
+
+    # different durations split a class; fixed groups are never merged
+    durations = {'G1': 120, 'G2': 120, 'G3': 90}
+    assert mergeable_groups(sets, durations, fixed_groups=set()) == [['G1', 'G2']]
+    assert mergeable_groups(sets, durations, fixed_groups={'G1'}) == []
+
+    _, dfs = scheduler.compute_diagnostics(inputs)
+    cohorts = dfs['ExamGroupCohorts']
+    assert sorted(cohorts.loc[cohorts['Relation'] == 'SameStudentsAs', 'OtherExamGroup']) == ['G2', 'G3']
+
+
+def test_nested_sets_reported():
+    sets = group_student_sets(pd.DataFrame({
+        'StudentID': ['S1', 'S2', 'S1', 'S2', 'S3'],
+        'ExamGroup': ['G1', 'G1', 'G2', 'G2', 'G2'],
+    }))
+    assert nested_student_sets(sets) == [('G1', 'G2')]
+
+
+def test_nested_exam_sets_go_through_their_superset():
+    # student exam sets as the model sees them: (A, B) and (B,) repeat part of (A, B, C)
+    sets = {('A', 'B', 'C'): ('A', 'B', 'C'), ('A', 'B'): ('A', 'B'), ('B',): ('B',), ('C', 'D'): ('C', 'D')}
+    assert strict_subsets(sets) == [(('A', 'B'), ('A', 'B', 'C')), (('B',), ('A', 'B')), (('B',), ('A', 'B', 'C'))]
+
+
+def test_merged_model_matches_unmerged_schedule_quality():
+    inputs = _inputs()
+    merged = scheduler.solve_exam_schedule(inputs, time_limit_sec=20, workers=4)
+    plain = scheduler.solve_exam_schedule(inputs, time_limit_sec=20, workers=4, merge_identical=False)
+
+    master = merged.master_df.set_index('ExamGroup')
+    assert sorted(master.index) == ['G1', 'G2', 'G3', 'G4', 'G5']
+    # the cohort's exams are in three different slots
+    assert master.loc[['G1', 'G2', 'G3', 'G4'], 'SlotKey'].nunique() == 4
+    assert merged.summary_df.loc[0, 'SolverStatus'] == 'OPTIMAL'
+    assert round(merged.summary_df.loc[0, 'ObjectiveValue']) == round(plain.summary_df.loc[0, 'ObjectiveValue'])
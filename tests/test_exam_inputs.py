@@ -0,0 +1,148 @@
+"""
+Test: One loaded ExamInputs bundle feeds courses report, diagnostics and scheduler
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from business.exam_scheduling import scheduler
+
+
+def _input_frames():
+    regs = pd.DataFrame({
+        'ID': ['S1', 'S2', 'S3'],
+        'Program': ['cs', 'CS', 'MATH'],
+        'COURSES': ['CS101, CS102', 'CS101,MATH201', 'MATH201,CS102'],
+    })
+    courses = pd.DataFrame({
+        'CourseCode': ['CS101', 'CS102', 'MATH201'],
+        'CourseName': ['Programming', 'Data Structures', 'Calculus'],
+        'Program': ['CS', 'ALL', 'ALL'],
+        'ExamGroup': ['G1', 'G2', 'G3'],
+        'DurationMin': [120, 120, 120],
+        'Terminated': ['', '', ''],
+    })
+    calendar = pd.DataFrame({
+        'Date': ['2025-05-20', '2025-05-20', '2025-05-21'],
+        'SlotID': ['Morning', 'Afternoon', 'Morning'],
+        'Start': ['09:00', '13:00', '09:00'],
+        'End': ['12:00', '16:00', '12:00'],
+    })
+    capacity = calendar[['Date', 'SlotID']].assign(CapacityStudents=100)
+    return regs, courses, calendar, capacity
+
+
+def _write_inputs(folder):
+    regs, courses, calendar, capacity = _input_frames()
+    paths = {
+        'regs': os.path.join(folder, 'regs.xlsx'),
+        'master': os.path.join(folder, 'courses.xlsx'),
+        'cal': os.path.join(folder, 'calendar.xlsx'),
+        'cap': os.path.join(folder, 'capacity.xlsx'),
+    }
+    regs.to_excel(paths['regs'], sheet_name='Regs', index=False)
+    courses.to_excel(paths['master'], sheet_name='Courses', index=False)
+    calendar.to_excel(paths['cal'], sheet_name='Calendar', index=False)
+    capacity.to_excel(paths['cap'], sheet_name='SlotCapacity', index=False)
+    return paths
+
+
+def test_shared_inputs_match_path_based_calls():
+    with tempfile.TemporaryDirectory() as tmp:
+        p = _write_inputs(tmp)
+        inputs = scheduler.load_exam_inputs(p['regs'], p['master'], p['cal'], p['cap'])
+
+        # constraints were not given -> empty frames, not an error
+        assert inputs.fixed_df.empty
+        assert len(inputs.enroll_df) == 6
+
+        report_paths, issues_paths = scheduler.generate_courses_report(p['regs'], p['master'])
+        report_shared, issues_shared = scheduler.generate_courses_report(inputs=inputs)
+        pd.testing.assert_frame_equal(report_paths, report_shared)
+        pd.testing.assert_frame_equal(issues_paths, issues_shared)
+
+        diag, _ = scheduler.run_final_exam_scheduler(inputs=inputs, diagnostics_only=True)
+        assert diag['students'] == 3
+        assert diag['examgroups'] == 3
+        assert diag['slots'] == 3
+
+        enroll_before = inputs.enroll_df.copy()
+        out = os.path.join(tmp, 'schedule.xlsx')
+        master_df = scheduler.run_final_exam_scheduler(
+            inputs=inputs, output_path=out, time_limit_sec=5, workers=1
+        )[0]
+        assert sorted(master_df['ExamGroup']) == ['G1', 'G2', 'G3']
+        # the bundle is not modified by the solve
+        pd.testing.assert_frame_equal(enroll_before, inputs.enroll_df)
+
+
+def test_schedule_requires_calendar():
+    with tempfile.TemporaryDirectory() as tmp:
+        p = _write_inputs(tmp)
+        inputs = scheduler.load_exam_inputs(p['regs'], p['master'])
+        try:
+            scheduler.run_final_exam_scheduler(inputs=inputs, output_path=os.path.join(tmp, 'x.xlsx'))
+        except ValueError as e:
+            assert 'Calendar' in str(e)
+        else:
+            raise AssertionError('expected ValueError without a calendar')
+
+
+def test_dataframe_api_does_not_touch_disk():
+    regs, courses, calendar, capacity = _input_frames()
+    regs_before = regs.copy()
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            inputs = scheduler.prepare_exam_inputs(regs, courses, calendar, capacity)
+            diag, dfs = scheduler.compute_diagnostics(inputs)
+            result = scheduler.solve_exam_schedule(inputs, time_limit_sec=5, workers=1)
+            assert os.listdir(tmp) == []
+        finally:
+            os.chdir(cwd)
+
+    # caller frames untouched
+    pd.testing.assert_frame_equal(regs, regs_before)
+    assert diag['slots'] == 3 and 'ExamGroupStats' in dfs
+    assert sorted(result.master_df['ExamGroup']) == ['G1', 'G2', 'G3']
+    assert result.summary_df.loc[0, 'TotalExamGroups'] == 3
+    assert set(result.program_sheets) == {'CS', 'MATH'}
+
+
+def test_courses_report_resolved_fields_and_long_counts():
+    regs = pd.DataFrame({
+        'ID': ['S1', 'S2', 'S3', 'S4'],
+        'Program': ['CS', 'CS', 'MATH', 'MATH'],
+        'COURSES': ['CS101', 'CS101', 'CS101,MATH201', 'CS101'],
+    })
+    # CS101 has two master rows: names tie 2-2 across programs -> smallest name wins
+    courses = pd.DataFrame({
+        'CourseCode': ['CS101', 'CS101', 'MATH201'],
+        'CourseName': ['Programming B', 'Programming A', ''],
+        'Program': ['CS', 'MATH', 'ALL'],
+        'ExamGroup': ['G1', 'G1', 'G3'],
+        'DurationMin': [90, 120, 60],
+        'Terminated': ['', '', ''],
+    })
+    inputs = scheduler.prepare_exam_inputs(regs, courses)
+
+    report, issues = scheduler.generate_courses_report(inputs=inputs)
+    cs101 = report.set_index('CourseCode').loc['CS101']
+    assert cs101['ResolvedCourseName'] == 'Programming A'
+    assert cs101['DurationMin'] == 120
+    assert (cs101['TotalStudents'], cs101['CS'], cs101['MATH']) == (4, 2, 2)
+    assert issues['CourseCode'].tolist() == ['MATH201']
+
+    report_long, issues_long, counts = scheduler.generate_courses_report(inputs=inputs, program_counts='long')
+    assert 'CS' not in report_long.columns
+    pd.testing.assert_frame_equal(issues, issues_long)
+    assert sorted(map(tuple, counts.values.tolist())) == [
+        ('CS101', 'CS', 2), ('CS101', 'MATH', 2), ('MATH201', 'MATH', 1)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, 'report.xlsx')
+        scheduler.save_courses_report_excel(report_long, issues_long, out, program_counts_df=counts)
+        assert list(pd.read_excel(out, sheet_name=None)) == ['CoursesReport', 'Issues', 'ProgramCounts']
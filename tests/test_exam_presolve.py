@@ -0,0 +1,69 @@
+"""
+Test: Presolve substitutes fixed exam groups and hints the conflict-free ones
+"""
+import pandas as pd
+
+from business.exam_scheduling import scheduler
+from business.exam_scheduling.presolve import place_free_groups, slots_blocked_by_constants, split_trivial_groups
+
+
+def test_split_and_blocked_slots():
+    student_groups = {'S1': ['G1', 'G2'], 'S2': ['G3'], 'S3': ['G2', 'G4']}
+    constants, free = split_trivial_groups(['G1', 'G2', 'G3', 'G4'], student_groups, {'G1': 0})
+    assert constants == {'G1': 0} and free == ['G3']
+    assert split_trivial_groups(['G1', 'G2'], student_groups, {'G1': 0}, keep_fixed=True)[0] == {}
+
+    # slot 0 overlaps slot 1 -> G2 (shares S1 with G1) loses both
+    clashing = {0: {0, 1}, 1: {0, 1}, 2: {2}}
+    node_of = {g: g for g in ['G1', 'G2', 'G3', 'G4']}
+    assert slots_blocked_by_constants(student_groups, constants, clashing, node_of) == {'G2': {0, 1}}
+
+
+def test_greedy_placement_respects_capacity_then_balance():
+    used = [30, 0, 0]
+    placed = place_free_groups(
+        ['small', 'big'], {'small': [0, 1, 2], 'big': [0, 1, 2]}, {'small': 10, 'big': 40},
+        used, capacities=[40, 40, 50], slot_day=[0, 1, 2], n_days=3,
+    )
+    # big only fits without overage on day 1 or 2; small then goes to the emptier day
+    assert placed['big'] in (1, 2)
+    assert placed['small'] == 3 - placed['big']
+    assert sorted(used) == [10, 30, 40]
+
+
+def test_presolve_schedules_every_group_without_clashes():
+    regs = pd.DataFrame({
+        'ID': ['S1', 'S2', 'S3', 'S4'],
+        'Program': ['CS'] * 4,
+        'COURSES': ['C1,C2', 'C2,C3', 'C4', 'C5'],
+    })
+    courses = pd.DataFrame({
+        'CourseCode': [f'C{i}' for i in range(1, 6)],
+        'CourseName': [f'Course {i}' for i in range(1, 6)],
+        'Program': ['ALL'] * 5,
+        'ExamGroup': [f'G{i}' for i in range(1, 6)],
+        'DurationMin': [120] * 5,
+        'Terminated': [''] * 5,
+    })
+    days = ['2025-05-20', '2025-05-20', '2025-05-21', '2025-05-21']
+    calendar = pd.DataFrame({'Date': days, 'SlotID': ['AM', 'PM'] * 2,
+                             'Start': ['09:00', '13:00'] * 2, 'End': ['12:00', '16:00'] * 2})
+    fixed = pd.DataFrame({'ExamGroup': ['G1'], 'Date': ['2025-05-20'], 'SlotID': ['AM']})
+    inputs = scheduler.prepare_exam_inputs(regs, courses, calendar, fixed_df=fixed)
+
+    result = scheduler.solve_exam_schedule(inputs, time_limit_sec=10, workers=2)
+    master = result.master_df.set_index('ExamGroup')
+    assert sorted(master.index) == ['G1', 'G2', 'G3', 'G4', 'G5']
+    assert master.loc['G1', 'SlotKey'].endswith('| AM') and master.loc['G1', 'Date'] == '05-20'
+    assert master.loc['G2', 'SlotKey'] != master.loc['G1', 'SlotKey']
+    assert master.loc['G2', 'SlotKey'] != master.loc['G3', 'SlotKey']
+    # G1 fixed, G4 and G5 conflict-free
+    assert result.summary_df.loc[0, 'PresolvedExamGroups'] == 1
+    assert result.summary_df.loc[0, 'HintedExamGroups'] == 2
+    assert result.capacity_report_df['UsedStudents'].sum() == 6
+
+    full = scheduler.solve_exam_schedule(inputs, time_limit_sec=10, workers=2, presolve=False)
+    assert full.summary_df.loc[0, 'PresolvedExamGroups'] == 0
+    # exact: the hinted groups stay in the model, so both prove the same optimum
+    assert result.summary_df.loc[0, 'SolverStatus'] == full.summary_df.loc[0, 'SolverStatus'] == 'OPTIMAL'
+    assert result.summary_df.loc[0, 'ObjectiveValue'] == full.summary_df.loc[0, 'ObjectiveValue']
@@ -0,0 +1,70 @@
+"""
+Test: Symmetry breaking finds equivalent groups/slots and keeps the optimum
+"""
+import pandas as pd
+
+from business.exam_scheduling import scheduler
+from business.exam_scheduling.symmetry import identical_slot_classes, interchangeable_group_classes
+
+
+def test_group_classes_skip_fixed_groups_and_other_durations():
+    examgroups = ['G1', 'G2', 'G3', 'G4', 'G5', 'G6']
+    student_groups = {'S1': ['G1'], 'S2': ['G2'], 'S3': ['G3', 'G4'], 'S4': ['G5'], 'S5': ['G6']}
+    students = {g: 1 for g in examgroups}
+    durations = {'G1': 120, 'G2': 120, 'G3': 120, 'G4': 120, 'G5': 120, 'G6': 90}
+    classes = interchangeable_group_classes(examgroups, student_groups, students, durations, fixed_groups={'G5'})
+    # G3/G4 share their only student, so swapping them changes nothing either
+    assert classes == [['G1', 'G2'], ['G3', 'G4']]
+
+
+def test_group_classes_inside_a_clash_neighbourhood():
+    # E1/E2/E3 are electives next to the same core exams; E3 also meets X
+    examgroups = ['CORE', 'E1', 'E2', 'E3', 'X']
+    student_groups = {
+        'S1': ['CORE', 'E1'], 'S2': ['CORE', 'E1'], 'S3': ['CORE', 'E2'], 'S4': ['CORE', 'E2'],
+        'S5': ['CORE', 'E3'], 'S6': ['E3', 'X'],
+    }
+    students = {'CORE': 5, 'E1': 2, 'E2': 2, 'E3': 2, 'X': 1}
+    durations = {g: 120 for g in examgroups}
+    assert interchangeable_group_classes(examgroups, student_groups, students, durations, set()) == [['E1', 'E2']]
+
+    # groups with different allowed slots (e.g. blocked by a fixed neighbour) are told apart
+    slots = {'CORE': [0, 1], 'E1': [0, 1], 'E2': [1], 'E3': [0, 1], 'X': [0, 1]}
+    assert interchangeable_group_classes(examgroups, student_groups, students, durations, set(), slots) == []
+
+
+def test_slot_classes_by_day_duration_capacity_and_overlap():
+    # day 0: two free 180 min slots + two identical overlapping ones; day 1: one slot
+    slot_day = [0, 0, 0, 0, 1]
+    slot_start = [540, 780, 1020, 1020, 540]
+    slot_end = [720, 960, 1200, 1200, 720]
+    capacities = [100, 100, 100, 100, 100]
+    cliques = [[0], [1], [2, 3], [4]]
+    assert identical_slot_classes(slot_day, slot_start, slot_end, capacities, cliques, set()) == [[0, 1], [2, 3]]
+    assert identical_slot_classes(slot_day, slot_start, slot_end, capacities, cliques, {1}) == [[2, 3]]
+
+
+def test_same_objective_with_and_without_symmetry_breaking():
+    regs = pd.DataFrame({
+        'ID': [f'S{i}' for i in range(8)],
+        'Program': ['CS'] * 8,
+        'COURSES': ['C1', 'C2', 'C3', 'C4', 'C5,C6', 'C5,C6', 'C6,C7', 'C5,C7'],
+    })
+    courses = pd.DataFrame({
+        'CourseCode': [f'C{i}' for i in range(1, 8)],
+        'CourseName': [f'Course {i}' for i in range(1, 8)],
+        'Program': ['ALL'] * 7,
+        'ExamGroup': [f'G{i}' for i in range(1, 8)],
+        'DurationMin': [120] * 7,
+        'Terminated': [''] * 7,
+    })
+    days = ['2025-05-20', '2025-05-20', '2025-05-21', '2025-05-21', '2025-05-22', '2025-05-22']
+    calendar = pd.DataFrame({'Date': days, 'SlotID': ['AM', 'PM'] * 3,
+                             'Start': ['09:00', '13:00'] * 3, 'End': ['12:00', '16:00'] * 3})
+    capacity = calendar[['Date', 'SlotID']].assign(CapacityStudents=2)
+    inputs = scheduler.prepare_exam_inputs(regs, courses, calendar, capacity)
+
+    plain = scheduler.solve_exam_schedule(inputs, time_limit_sec=20, workers=4, break_symmetries=False)
+    broken = scheduler.solve_exam_schedule(inputs, time_limit_sec=20, workers=4)
+    assert broken.summary_df.loc[0, 'SolverStatus'] == 'OPTIMAL'
+    assert round(plain.summary_df.loc[0, 'ObjectiveValue']) == round(broken.summary_df.loc[0, 'ObjectiveValue'])
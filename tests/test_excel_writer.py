@@ -0,0 +1,95 @@
+"""
+Test: Streaming Excel writer round-trips DataFrames sheet by sheet
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from data.writers import excel_writer
+from data.writers.excel_writer import StreamingExcelWriter, write_excel_sheets
+
+
+def _sample_df():
+    return pd.DataFrame({
+        'ExamGroup': ['G1', 'G2', None, 'G4'],
+        'Students': [10, 0, 3, 7],
+        'Ratio': [0.5, float('nan'), 1.25, 2.0],
+        'Flag': [True, False, True, False],
+        'Date': pd.to_datetime(['2025-05-20', None, '2025-05-21', '2025-05-22']),
+    })
+
+
+def _roundtrip(path, sheet):
+    return pd.read_excel(path, sheet_name=sheet)
+
+
+def test_write_excel_sheets_roundtrip_in_chunks():
+    df = _sample_df()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'out.xlsx')
+        # chunk smaller than the frame so several chunks are written
+        write_excel_sheets(path, {'First': df, 'Empty': pd.DataFrame(columns=['A'])}, chunk_rows=3)
+
+        back = _roundtrip(path, 'First')
+        assert list(back.columns) == list(df.columns)
+        assert back['Students'].tolist() == [10, 0, 3, 7]
+        assert pd.isna(back.loc[2, 'ExamGroup'])
+        assert pd.isna(back.loc[1, 'Ratio'])
+        assert back['Flag'].tolist() == [True, False, True, False]
+        assert back.loc[0, 'Date'] == pd.Timestamp('2025-05-20')
+        assert pd.isna(back.loc[1, 'Date'])
+
+        empty = _roundtrip(path, 'Empty')
+        assert list(empty.columns) == ['A'] and empty.empty
+
+
+def test_writer_keeps_sheet_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'order.xlsx')
+        with StreamingExcelWriter(path) as writer:
+            for name in ['MasterSchedule', 'CapacityReport', 'Summary']:
+                writer.write_dataframe(pd.DataFrame({'Sheet': [name]}), name)
+        assert list(pd.read_excel(path, sheet_name=None).keys()) == ['MasterSchedule', 'CapacityReport', 'Summary']
+
+
+def test_openpyxl_fallback_without_xlsxwriter(monkeypatch):
+    monkeypatch.setattr(excel_writer, 'xlsxwriter', None)
+    df = _sample_df()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'fallback.xlsx')
+        write_excel_sheets(path, {'First': df})
+        assert _roundtrip(path, 'First')['Students'].tolist() == [10, 0, 3, 7]
+
+
+def _fill_rules(path, sheet):
+    from openpyxl import load_workbook
+    ws = load_workbook(path)[sheet]
+    rules = []
+    for cf in ws.conditional_formatting:
+        for rule in cf.rules:
+            rules.append((str(cf.sqref), rule.formula[0], rule.stopIfTrue))
+    return rules
+
+
+def test_row_fills_written_as_conditional_formats(monkeypatch):
+    df = pd.DataFrame({
+        'CourseCode': ['A', 'B', 'C'],
+        'NOT_TITLED': [False, True, False],
+        'NOT_GROUPED': [False, False, False],
+        'MISSING_IN_MASTER': [False, False, True],
+    })
+    row_fills = [(['MISSING_IN_MASTER'], '#F8CBAD'), (['NOT_TITLED', 'NOT_GROUPED', 'NOT_THERE'], '#FFF2CC')]
+    expected = [('A2:D4', '$D2', True), ('A2:D4', 'OR($B2,$C2)', True)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'fills.xlsx')
+        with StreamingExcelWriter(path) as writer:
+            writer.write_dataframe(df, 'CoursesReport', row_fills=row_fills)
+        assert sorted(_fill_rules(path, 'CoursesReport')) == sorted(expected)
+
+        monkeypatch.setattr(excel_writer, 'xlsxwriter', None)
+        path = os.path.join(tmp, 'fills_fallback.xlsx')
+        with StreamingExcelWriter(path) as writer:
+            writer.write_dataframe(df, 'CoursesReport', row_fills=row_fills)
+        assert sorted(_fill_rules(path, 'CoursesReport')) == sorted(expected)
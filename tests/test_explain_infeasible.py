@@ -0,0 +1,126 @@
+"""
+Test: Explain mode names the constraints behind an infeasible model
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from business.exam_scheduling import scheduler
+from business.invigilation.scheduler import run_optimization
+from business.solver import InfeasibleModelError
+
+
+def _raises_infeasible(fn):
+    try:
+        fn()
+    except InfeasibleModelError as e:
+        return e
+    raise AssertionError('expected InfeasibleModelError')
+
+
+def test_exam_odd_cycle_reports_student_clashes():
+    # G1-G2-G3-G4-G5-G1 conflict cycle: no clique above 2, but it needs 3 slots
+    regs = pd.DataFrame({
+        'ID': ['S1', 'S2', 'S3', 'S4', 'S5', 'S6'],
+        'Program': ['CS'] * 6,
+        'COURSES': ['C1,C2', 'C2,C3', 'C3,C4', 'C4,C5', 'C5,C1', 'C1'],
+    })
+    courses = pd.DataFrame({
+        'CourseCode': [f'C{i}' for i in range(1, 6)],
+        'CourseName': [f'Course {i}' for i in range(1, 6)],
+        'Program': ['ALL'] * 5,
+        'ExamGroup': [f'G{i}' for i in range(1, 6)],
+        'DurationMin': [120] * 5,
+        'Terminated': [''] * 5,
+    })
+    calendar = pd.DataFrame({'Date': ['2025-05-20', '2025-05-21'], 'SlotID': ['AM', 'AM'],
+                             'Start': ['09:00', '09:00'], 'End': ['12:00', '12:00']})
+    inputs = scheduler.prepare_exam_inputs(regs, courses, calendar)
+
+    plain = _raises_infeasible(lambda: scheduler.solve_exam_schedule(inputs, time_limit_sec=5, workers=1))
+    assert plain.conflicts == [] and 'explain=True' in str(plain)
+
+    err = _raises_infeasible(lambda: scheduler.solve_exam_schedule(inputs, time_limit_sec=5, workers=1, explain=True))
+    assert err.conflicts
+    assert {c['Constraint'] for c in err.conflicts} == {'StudentClash'}
+    # the lone C1 student never takes part in a clash
+    assert all(',' in c['Entity'] for c in err.conflicts)
+    assert list(err.conflicts_df().columns) == ['Constraint', 'Entity', 'Details']
+
+
+def test_exam_precheck_errors_are_printed_in_explain_mode(capsys):
+    # three exams taken together, two slots: caught by the pre-checks
+    regs = pd.DataFrame({'ID': ['S1', 'S2'], 'Program': ['CS', 'CS'], 'COURSES': ['C1,C2,C3', 'C1,C2']})
+    courses = pd.DataFrame({
+        'CourseCode': ['C1', 'C2', 'C3'], 'CourseName': ['One', 'Two', 'Three'],
+        'Program': ['ALL'] * 3, 'ExamGroup': ['G1', 'G2', 'G3'],
+        'DurationMin': [120] * 3, 'Terminated': [''] * 3,
+    })
+    calendar = pd.DataFrame({'Date': ['2025-05-20', '2025-05-21'], 'SlotID': ['AM', 'AM'],
+                             'Start': ['09:00', '09:00'], 'End': ['12:00', '12:00']})
+    inputs = scheduler.prepare_exam_inputs(regs, courses, calendar)
+
+    err = _raises_infeasible(lambda: scheduler.solve_exam_schedule(inputs, time_limit_sec=5, workers=1, explain=True))
+    assert 'ConflictClique' in capsys.readouterr().out
+    assert {c['Constraint'] for c in err.conflicts} == {'StudentClash'}
+
+
+def test_invigilation_reports_demand_and_max_hours():
+    sessions = pd.DataFrame({
+        'Room': ['R1', 'R2'], 'Date': ['20/5/2025', '21/5/2025'],
+        'Start': ['09:00', '09:00'], 'End': ['12:00', '12:00'],
+        'Duration': [3, 3], 'InvigilatorsNeeded': [2, 1],
+    })
+    staff = pd.DataFrame({'StaffID': [1, 2], 'Name': ['Ann', 'Ben'], 'MaxHours': [3, 3]})
+    engage = pd.DataFrame({'StaffID': [1], 'Date': ['1/1/2025'], 'Start': ['08:00'], 'Engagement': [0]})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, n) for n in ('sessions.xlsx', 'staff.xlsx', 'engage.xlsx')]
+        for df, p in zip((sessions, staff, engage), paths):
+            df.to_excel(p, index=False)
+        out = os.path.join(tmp, 'out.xlsx')
+
+        err = _raises_infeasible(lambda: run_optimization(*paths, out, explain=True))
+        kinds = {c['Constraint'] for c in err.conflicts}
+        assert kinds <= {'SessionDemand', 'MaxHours'} and 'MaxHours' in kinds
+        assert not os.path.exists(out)
+
+
+def test_timeout_is_not_explained_as_infeasible(tmp_path, monkeypatch):
+    from ortools.sat.python import cp_model
+
+    from business.invigilation import scheduler as invigilation
+    from business.invigilation.scheduler import prepare_invigilation_inputs
+    from business.solver.explain import AssumptionGuards
+
+    def timed_out(solver, model, criteria=None, progress=None):
+        solver.Solve(model)
+        return cp_model.UNKNOWN, None
+
+    def no_explain(self, time_limit_sec=30.0):
+        raise AssertionError('explain() on a solve that only ran out of time')
+
+    monkeypatch.setattr(scheduler, 'solve_with_early_stop', timed_out)
+    monkeypatch.setattr(invigilation, 'solve_with_early_stop', timed_out)
+    monkeypatch.setattr(AssumptionGuards, 'explain', no_explain)
+
+    regs = pd.DataFrame({'ID': ['S1'], 'Program': ['CS'], 'COURSES': ['C1']})
+    courses = pd.DataFrame({'CourseCode': ['C1'], 'CourseName': ['One'], 'Program': ['ALL'], 'ExamGroup': ['G1'],
+                            'DurationMin': [120], 'Terminated': ['']})
+    calendar = pd.DataFrame({'Date': ['2025-05-20'], 'SlotID': ['AM'], 'Start': ['09:00'], 'End': ['12:00']})
+    inputs = scheduler.prepare_exam_inputs(regs, courses, calendar)
+    err = _raises_infeasible(lambda: scheduler.solve_exam_schedule(inputs, time_limit_sec=5, workers=1, explain=True))
+    assert err.status == 'UNKNOWN' and err.conflicts == []
+    assert 'time limit' in str(err) and 'No feasible solution' not in str(err)
+
+    sessions = pd.DataFrame({'Room': ['R1'], 'Date': ['20/5/2025'], 'Start': ['09:00'], 'End': ['12:00'],
+                             'Duration': [3], 'InvigilatorsNeeded': [1]})
+    staff = pd.DataFrame({'StaffID': [1, 2], 'Name': ['Ann', 'Ben']})
+    engage = pd.DataFrame(columns=['StaffID', 'Date', 'Start', 'Engagement'])
+    staff_inputs = prepare_invigilation_inputs(sessions, staff, engage)
+    err = _raises_infeasible(lambda: invigilation.run_optimization(
+        None, None, None, str(tmp_path / 'out.xlsx'), inputs=staff_inputs, explain=True, time_limit_sec=5,
+    ))
+    assert err.status == 'UNKNOWN' and err.conflicts == []
+    assert 'time limit' in str(err) and 'No feasible solution' not in str(err)
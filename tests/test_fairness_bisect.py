@@ -0,0 +1,89 @@
+"""
+Test: Load spread found by bisection over feasibility solves
+"""
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from business.invigilation.scheduler import prepare_invigilation_inputs, run_optimization
+from business.solver.fairness import bisect_spread
+from business.solver.tuning import ModelSize, choose_solver_settings
+
+
+def test_bisect_spread_proves_the_tightest_spread():
+    # jobs 3,3,2,2,2,2 on three machines: best is 5/5/4
+    jobs = [3, 3, 2, 2, 2, 2]
+    model = cp_model.CpModel()
+    x = {(j, m): model.NewBoolVar(f"x_{j}_{m}") for j in range(len(jobs)) for m in range(3)}
+    for j in range(len(jobs)):
+        model.AddExactlyOne(x[(j, m)] for m in range(3))
+    load = [model.NewIntVar(0, sum(jobs), f"load_{m}") for m in range(3)]
+    hi = model.NewIntVar(0, sum(jobs), "hi")
+    lo = model.NewIntVar(0, sum(jobs), "lo")
+    for m in range(3):
+        model.Add(load[m] == sum(jobs[j] * x[(j, m)] for j in range(len(jobs))))
+        model.Add(load[m] <= hi)
+        model.Add(load[m] >= lo)
+
+    def measure(solver):
+        values = [solver.Value(v) for v in load]
+        return max(values), min(values)
+
+    settings = choose_solver_settings("invigilation", ModelSize(20, 20), time_limit_sec=10, workers=1)
+    result = bisect_spread(model, hi, lo, list(x.values()), measure, settings, max_lower=5, min_upper=4)
+    assert result.status == cp_model.OPTIMAL
+    assert (result.max_value, result.min_value, result.spread) == (5, 4, 1)
+    assert sorted(result.solver.Value(v) for v in load) == [4, 5, 5]
+
+
+def test_bisect_fairness_matches_single_shot(tmp_path):
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start=start, End=end, Duration=2, InvigilatorsNeeded=1 + k % 2)
+        for day in ('1/6/2025', '2/6/2025') for start, end in (('09:00', '11:00'), ('12:00', '15:00'))
+        for k in range(3)
+    ])
+    staff = pd.DataFrame({
+        'StaffID': range(7), 'Name': [f'P{i}' for i in range(7)],
+        'LoadType': ['half', 'half'] + ['full'] * 5,
+    })
+    engage = pd.DataFrame({'StaffID': [3], 'Date': ['2/6/2025'], 'Start': ['09:00'], 'Engagement': [1]})
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+
+    spreads = {}
+    for fairness in ('spread', 'bisect'):
+        _, summary = run_optimization(
+            None, None, None, str(tmp_path / 'out.xlsx'), inputs=inputs, fairness=fairness, time_limit_sec=20,
+        )
+        weight = summary['LoadType'].str.lower().map({'half': 2}).fillna(1)
+        norm = summary['TotalHours'] * 60 * weight
+        spreads[fairness] = norm.max() - norm.min()
+    assert spreads['bisect'] == spreads['spread']
+
+
+def test_bisect_runs_per_person_when_classes_would_apply(tmp_path, monkeypatch, capsys):
+    from business.invigilation import scheduler
+
+    # 20 identical staff (one engaged): classes would halve the units many times over
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start=start, End=end, Duration=dur, InvigilatorsNeeded=1 + (k * 7 + i) % 2)
+        for i, day in enumerate(('1/6/2025', '2/6/2025', '3/6/2025'))
+        for k, (start, end, dur) in enumerate([('09:00', '11:00', 2), ('09:30', '12:30', 3),
+                                                ('13:00', '15:00', 2), ('14:00', '16:00', 2)] * 3)
+    ])
+    staff = pd.DataFrame({'StaffID': range(20), 'Name': [f'P{i}' for i in range(20)], 'LoadType': ['full'] * 20})
+    engage = pd.DataFrame({'StaffID': [0], 'Date': ['1/6/2025'], 'Start': ['09:00'], 'Engagement': [1]})
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+    monkeypatch.setattr(scheduler, 'is_large_model', lambda variables: True)
+
+    _, per_person = run_optimization(
+        None, None, None, str(tmp_path / 'a.xlsx'), inputs=inputs, aggregate_staff=False, time_limit_sec=20,
+    )
+    capsys.readouterr()
+    _, bisect = run_optimization(
+        None, None, None, str(tmp_path / 'b.xlsx'), inputs=inputs, fairness='bisect', time_limit_sec=20,
+    )
+    out = capsys.readouterr().out
+    assert 'Staff classes' not in out and 'Solver status: OPTIMAL' in out
+
+    def spread(summary):
+        return summary['TotalHours'].max() - summary['TotalHours'].min()
+    assert spread(bisect) == spread(per_person)
@@ -0,0 +1,48 @@
+"""
+Test: Sweep-line overlap cliques and overlap-aware exam clash constraints
+"""
+from itertools import combinations
+
+import pandas as pd
+
+from business.exam_scheduling import scheduler
+from utils.interval_utils import overlap_cliques
+
+
+def test_overlap_cliques_cover_every_overlapping_pair():
+    intervals = [
+        ('d1', 540, 720),   # 09:00-12:00
+        ('d1', 660, 780),   # 11:00-13:00
+        ('d1', 720, 900),   # 12:00-15:00 touches the first, overlaps the second
+        ('d2', 540, 720),   # other day
+        ('d1', 600, 630),   # inside the first only
+        ('d1', 960, 960),   # empty
+    ]
+    cliques = overlap_cliques(intervals)
+    assert cliques == [[0, 1], [0, 4], [1, 2], [3], [5]]
+
+    for a, b in combinations(range(len(intervals)), 2):
+        (ka, sa, ea), (kb, sb, eb) = intervals[a], intervals[b]
+        overlaps = ka == kb and sa < eb and sb < ea
+        assert overlaps == any(a in c and b in c for c in cliques)
+
+
+def _inputs(calendar):
+    regs = pd.DataFrame({'ID': ['S1'], 'Program': ['CS'], 'COURSES': ['C1,C2']})
+    courses = pd.DataFrame({
+        'CourseCode': ['C1', 'C2'], 'CourseName': ['One', 'Two'], 'Program': ['ALL', 'ALL'],
+        'ExamGroup': ['G1', 'G2'], 'DurationMin': [60, 60], 'Terminated': ['', ''],
+    })
+    return scheduler.prepare_exam_inputs(regs, courses, pd.DataFrame(calendar))
+
+
+def test_overlapping_slots_are_not_given_to_one_student():
+    calendar = {'Date': ['2025-05-20', '2025-05-20', '2025-05-20'], 'SlotID': ['A', 'B', 'C'],
+                'Start': ['09:00', '11:00', '12:00'], 'End': ['12:00', '13:00', '14:00']}
+    master = scheduler.solve_exam_schedule(_inputs(calendar), time_limit_sec=5, workers=1).master_df
+    assert sorted(master['SlotID']) == ['A', 'C']
+
+    # only two mutually overlapping slots -> caught by the pre-checks
+    calendar = {k: v[:2] for k, v in calendar.items()}
+    diag, dfs = scheduler.compute_diagnostics(_inputs(calendar))
+    assert dfs['PrecheckIssues']['Check'].tolist() == ['ConflictClique']
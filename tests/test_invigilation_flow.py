@@ -0,0 +1,75 @@
+"""
+Test: Min-cost-flow invigilation engine
+"""
+import pandas as pd
+import pytest
+
+from business.invigilation.flow_engine import flow_assignment, overlap_blocks
+from business.invigilation.scheduler import prepare_invigilation_inputs, run_optimization
+
+
+def _sessions():
+    # S1/S2 overlap (one block), S3 later the same day, S4 next day
+    date = {'S1': 1, 'S2': 1, 'S3': 1, 'S4': 2}
+    start = {'S1': 540, 'S2': 600, 'S3': 780, 'S4': 540}
+    end = {'S1': 720, 'S2': 720, 'S3': 900, 'S4': 660}
+    dur = {s: end[s] - start[s] for s in start}
+    return date, start, end, dur
+
+
+def test_overlap_blocks_chain_sessions_per_date():
+    date, start, end, _ = _sessions()
+    blocks = overlap_blocks(list(date), date, start, end)
+    assert blocks['S1'] == blocks['S2']
+    assert len({blocks['S1'], blocks['S3'], blocks['S4']}) == 3
+
+
+def test_flow_covers_demand_without_overlaps_or_engagements():
+    date, start, end, dur = _sessions()
+    need = {'S1': 2, 'S2': 1, 'S3': 2, 'S4': 1}
+    blocked = {('p', 'S4')}
+    assigned, loads = flow_assignment(
+        list(date), ['p', 'q', 'r'], need, dur, date, start, end, blocked, {}, {'r': 120},
+    )
+    assert {s: len(set(people)) for s, people in assigned.items()} == need
+    assert not set(assigned['S1']) & set(assigned['S2'])
+    assert 'p' not in assigned['S4']
+    assert loads['r'] <= 120
+    assert sum(loads.values()) == sum(dur[s] * k for s, k in need.items())
+
+
+def test_flow_returns_none_when_demand_cannot_be_met():
+    date, start, end, dur = _sessions()
+    need = {'S1': 2, 'S2': 2, 'S3': 1, 'S4': 1}
+    assert flow_assignment(list(date), ['p', 'q', 'r'], need, dur, date, start, end, set(), {}, {}) is None
+
+
+def test_flow_engine_end_to_end(tmp_path):
+    days = ['1/6/2025', '2/6/2025']
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start=start, End=end, Duration=3, InvigilatorsNeeded=2)
+        for day in days for start, end in (('09:00', '12:00'), ('13:00', '15:00')) for k in range(3)
+    ])
+    staff = pd.DataFrame({
+        'StaffID': range(10), 'Name': [f'P{i}' for i in range(10)],
+        'LoadType': ['half' if i < 2 else 'full' for i in range(10)],
+        'MaxHours': [5 if i == 9 else None for i in range(10)],
+    })
+    engage = pd.DataFrame({'StaffID': [0], 'Date': ['1/6/2025'], 'Start': ['09:00'], 'Engagement': [1]})
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+
+    for engine in ('flow', 'flow+cpsat'):
+        merged, summary = run_optimization(
+            None, None, None, str(tmp_path / 'out.xlsx'), inputs=inputs, engine=engine, time_limit_sec=10,
+        )
+        assert all(len(set(ids.split(', '))) == 2 for ids in merged['Invigilators_IDs'])
+        first = merged[(merged['DateKey'] == '06-01') & (merged['Start'] == '09:00')]
+        assert not any('0' in ids.split(', ') for ids in first['Invigilators_IDs'])
+        hours = dict(zip(summary['StaffID'], summary['TotalHours']))
+        assert hours['9'] <= 5
+        assert sum(hours.values()) == 2 * 2 * 3 * (3 + 2)
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        run_optimization(None, None, None, engine='greedy')
@@ -0,0 +1,140 @@
+"""
+Test: Invigilation model construction (availability, overlaps, loads)
+"""
+import pandas as pd
+
+from business.invigilation.scheduler import (
+    _normalize_date,
+    _parse_time_to_min,
+    prepare_invigilation_inputs,
+    run_optimization,
+)
+
+
+def _write_inputs(tmp_path, sessions, staff, engage):
+    paths = []
+    for name, rows in (('sessions', sessions), ('staff', staff), ('engage', engage)):
+        p = str(tmp_path / f'{name}.xlsx')
+        pd.DataFrame(rows).to_excel(p, index=False)
+        paths.append(p)
+    return paths
+
+
+def _assigned(merged):
+    return {
+        (row.Room, row.Start): set(filter(None, str(row.Invigilators_IDs).split(', ')))
+        for row in merged.itertuples()
+    }
+
+
+def test_prepared_inputs_match_row_by_row_parsing():
+    sessions = pd.DataFrame({
+        'Room': ['R1', 'R2', 'R3'], 'Date': ['20/5/2025', '2025-05-21', '20/5/2025'],
+        'Start': ['09:00', 930, '09:00'], 'End': [1200, '12:30', 1100.0],
+        'Duration': [3, 3, 2], 'InvigilatorsNeeded': [1, 2, 1],
+    })
+    staff = pd.DataFrame({
+        'StaffID': [1, 2, 3], 'Name': ['Ann', 'Ben', 'Cal'],
+        'LoadType': [' Half', None, 'full'], 'MaxHours': [12.5, None, '30'],
+    })
+    engage = pd.DataFrame({
+        'StaffID': [1, 3, 3], 'Date': ['20/5', '5.21.2025', '20/5'],
+        'Start': ['08:00', 1000, '13:15'], 'Engagement': [1, '1', None],
+    })
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+
+    assert inputs.sessions_df['SessionID'].tolist() == ['S1', 'S2', 'S3']
+    assert inputs.sessions_df['DateKey'].tolist() == sessions['Date'].map(_normalize_date).tolist()
+    assert inputs.sessions_df['Start_min'].tolist() == sessions['Start'].apply(_parse_time_to_min).tolist()
+    assert inputs.sessions_df['DurationMinutes'].tolist() == [180, 180, 120]
+    assert inputs.engage_df['End_min'].tolist() == [540, 660, 855]
+    assert inputs.engage_df['Engagement'].tolist() == [1, 1, 0]
+    assert inputs.load_weight == {'1': 2, '2': 1, '3': 1}
+    assert inputs.max_hours_map == {'1': 750, '3': 1800}
+    assert inputs.engagements.busy('3', '21-05', 630, 700)
+    assert not inputs.engagements.busy('3', '05-20', 780, 900)  # Engagement empty -> free
+    assert 'Date' in sessions.columns and 'DateKey' not in sessions.columns
+
+
+def test_engaged_staff_are_never_assigned(tmp_path):
+    sessions = {
+        'Room': ['R1', 'R2', 'R3'], 'Date': ['20/5/2025', '20/5/2025', '21/5/2025'],
+        'Start': ['09:00', '13:00', '09:00'], 'End': ['11:00', '15:00', '11:00'],
+        'Duration': [2, 2, 2], 'InvigilatorsNeeded': [1, 1, 1],
+    }
+    staff = {'StaffID': [1, 2], 'Name': ['Ann', 'Ben']}
+    engage = {
+        'StaffID': [1, 2, 1], 'Date': ['20/5/2025', '20/5/2025', '21/5/2025'],
+        'Start': ['10:00', '14:00', '09:00'], 'End': ['10:30', '16:00', '10:00'],
+        'Engagement': [1, 1, 0],
+    }
+    paths = _write_inputs(tmp_path, sessions, staff, engage)
+    merged, summary = run_optimization(*paths, str(tmp_path / 'out.xlsx'), time_limit_sec=10)
+
+    assigned = _assigned(merged)
+    assert assigned[('R1', '09:00')] == {'2'}
+    assert assigned[('R2', '13:00')] == {'1'}
+    assert len(assigned[('R3', '09:00')]) == 1
+    assert summary['TotalHours'].sum() == 6
+
+
+def test_overlapping_sessions_need_distinct_staff(tmp_path):
+    # 09-11, 10-12 and 10:30-11:30 all overlap; 11-13 overlaps only the last two
+    sessions = {
+        'Room': ['R1', 'R2', 'R3', 'R4'], 'Date': ['20/5/2025'] * 4,
+        'Start': ['09:00', '10:00', '10:30', '11:00'], 'End': ['11:00', '12:00', '11:30', '13:00'],
+        'Duration': [2, 2, 1, 2], 'InvigilatorsNeeded': [1, 1, 1, 1],
+    }
+    staff = {'StaffID': [1, 2, 3], 'Name': ['Ann', 'Ben', 'Cal']}
+    engage = {'StaffID': [1], 'Date': ['1/1/2025'], 'Start': ['08:00'], 'Engagement': [0]}
+    paths = _write_inputs(tmp_path, sessions, staff, engage)
+    merged, _ = run_optimization(*paths, str(tmp_path / 'out.xlsx'), time_limit_sec=10)
+
+    who = {room: ids.pop() for (room, _), ids in _assigned(merged).items()}
+    assert len({who['R1'], who['R2'], who['R3']}) == 3
+    assert len({who['R2'], who['R3'], who['R4']}) == 3
+
+
+def test_day_decomposition_carries_max_hours_across_days(tmp_path):
+    days = ['20/5/2025', '21/5/2025', '22/5/2025']
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start='09:00', End='12:00', Duration=3, InvigilatorsNeeded=1)
+        for day in days for k in range(2)
+    ])
+    staff = pd.DataFrame({'StaffID': [1, 2, 3], 'Name': ['Ann', 'Ben', 'Cal'], 'MaxHours': [3, None, None]})
+    engage = pd.DataFrame({'StaffID': [2], 'Date': ['21/5/2025'], 'Start': ['09:00'], 'Engagement': [1]})
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+
+    merged, summary = run_optimization(
+        None, None, None, str(tmp_path / 'out.xlsx'), inputs=inputs, decompose_by_day=True, time_limit_sec=10,
+    )
+    hours = dict(zip(summary['StaffID'], summary['TotalHours']))
+    assert hours['1'] <= 3
+    assert sum(hours.values()) == 18
+    for _, day in merged.groupby('DateKey'):
+        ids = [i for row in day['Invigilators_IDs'] for i in row.split(', ')]
+        assert len(ids) == len(set(ids)) == 2
+    assert '2' not in ','.join(merged[merged['DateKey'] == '05-21']['Invigilators_IDs'])
+
+
+def test_day_decomposition_keeps_flow_assignment_on_timeout(tmp_path, monkeypatch):
+    from business.invigilation import scheduler
+    from business.solver.explain import InfeasibleModelError
+
+    def timed_out(*args, **kwargs):
+        raise InfeasibleModelError("no solution in time", status="UNKNOWN")
+
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start='09:00', End='12:00', Duration=3, InvigilatorsNeeded=1)
+        for day in ('20/5/2025', '21/5/2025') for k in range(2)
+    ])
+    staff = pd.DataFrame({'StaffID': [1, 2, 3], 'Name': ['Ann', 'Ben', 'Cal']})
+    engage = pd.DataFrame(columns=['StaffID', 'Date', 'Start', 'Engagement'])
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+    monkeypatch.setattr(scheduler, '_solve_assignment', timed_out)
+
+    merged, summary = run_optimization(
+        None, None, None, str(tmp_path / 'out.xlsx'), inputs=inputs, decompose_by_day=True, time_limit_sec=5,
+    )
+    assert summary['TotalHours'].sum() == 12
+    assert all(merged['Invigilators_IDs'].str.len() > 0)
@@ -0,0 +1,65 @@
+"""
+Test: Invigilation pre-checks before the model is built
+"""
+import pandas as pd
+import pytest
+
+from business.invigilation.scheduler import prepare_invigilation_inputs, run_optimization
+from business.validators import check_invigilation_feasibility
+
+
+def _check(need, staff, blocked=(), max_minutes=None, **overrides):
+    # S1/S2/S3 overlap on day 1 (09:00-11:00 in common), S4 on day 2
+    date = {'S1': 1, 'S2': 1, 'S3': 1, 'S4': 2}
+    start = {'S1': 540, 'S2': 540, 'S3': 600, 'S4': 540}
+    end = {'S1': 720, 'S2': 660, 'S3': 720, 'S4': 660}
+    date.update(overrides.get('date', {}))
+    dur = {s: end[s] - start[s] for s in start}
+    return check_invigilation_feasibility(
+        list(need), staff, need, dur, date, start, end, set(blocked), max_minutes or {},
+    )
+
+
+def test_clean_instance_has_no_issues():
+    issues = _check({'S1': 1, 'S2': 1, 'S3': 1, 'S4': 2}, ['a', 'b', 'c'])
+    assert issues.empty
+
+
+def test_overloaded_window_is_named():
+    issues = _check({'S1': 2, 'S2': 2, 'S3': 2, 'S4': 1}, ['a', 'b', 'c', 'd', 'e'])
+    row = issues[issues['Check'] == 'WindowOverload'].iloc[0]
+    assert row['Window'] == '1 10:00-11:00'
+    assert 'S1' in row['Sessions'] and 'need 6 invigilators' in row['Details']
+
+
+def test_engagements_and_max_hours():
+    staff = ['a', 'b']
+    issues = _check({'S4': 2}, staff, blocked={('a', 'S4')})
+    assert issues['Check'].tolist()[0] == 'SessionUnderstaffed'
+
+    issues = _check({'S1': 1, 'S4': 2}, staff, max_minutes={'a': 60, 'b': 60})
+    assert 'MaxHoursTotal' in issues['Check'].tolist()
+
+
+def test_flow_bound_finds_what_the_totals_miss():
+    # S1 and S4 can only be covered by a, whose MaxHours fits one of them
+    # (240 minutes, 180 + 120 needed); every total and single count passes
+    need = {'S1': 1, 'S3': 1, 'S4': 1}
+    blocked = {(d, s) for d in ('b', 'c') for s in ('S1', 'S4')} | {('a', 'S3')}
+    issues = _check(need, ['a', 'b', 'c'], blocked=blocked, max_minutes={'a': 240}, date={'S3': 3})
+    assert issues['Check'].tolist() == ['FlowBound']
+    row = issues.iloc[0]
+    assert 'at most 2 of 3' in row['Details']
+    assert 'S1' in row['Sessions'] and 'S4' in row['Sessions'] and 'S3' not in row['Sessions']
+
+
+def test_run_optimization_stops_before_solving(tmp_path):
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date='1/6/2025', Start='09:00', End='12:00', Duration=3, InvigilatorsNeeded=2)
+        for k in range(3)
+    ])
+    staff = pd.DataFrame({'StaffID': range(5), 'Name': [f'P{i}' for i in range(5)], 'LoadType': ['full'] * 5})
+    engage = pd.DataFrame(columns=['StaffID', 'Date', 'Start', 'Engagement'])
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+    with pytest.raises(ValueError, match='WindowOverload'):
+        run_optimization(None, None, None, str(tmp_path / 'out.xlsx'), inputs=inputs)
@@ -0,0 +1,62 @@
+"""
+Test: Incremental invigilation repair
+"""
+import pandas as pd
+import pytest
+
+from business.invigilation.repair import repair_invigilation
+from business.invigilation.scheduler import prepare_invigilation_inputs, run_optimization
+from business.solver.explain import InfeasibleModelError
+
+
+def _schedule(tmp_path):
+    days = ['1/6/2025', '2/6/2025']
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start=start, End=end, Duration=2, InvigilatorsNeeded=1)
+        for day in days for start, end in (('09:00', '11:00'), ('13:00', '15:00')) for k in range(2)
+    ])
+    staff = pd.DataFrame({'StaffID': range(1, 7), 'Name': [f'P{i}' for i in range(1, 7)]})
+    engage = pd.DataFrame({'StaffID': [1], 'Date': ['1/1/2025'], 'Start': ['08:00'], 'Engagement': [0]})
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+    merged, _ = run_optimization(None, None, None, str(tmp_path / 'out.xlsx'), inputs=inputs, time_limit_sec=10)
+    return inputs, merged
+
+
+def _ids(merged):
+    return {s: set(ids.split(', ')) if ids else set() for s, ids in zip(merged['SessionID'], merged['Invigilators_IDs'])}
+
+
+def test_sick_staff_are_replaced_and_others_kept(tmp_path):
+    inputs, merged = _schedule(tmp_path)
+    before = _ids(merged)
+    sick = next(iter(before['S1']))
+    removed = next(iter(before['S8']))
+
+    sick_row = pd.DataFrame({'StaffID': [sick], 'Date': ['1/6/2025'], 'Start': ['08:00'], 'End': ['12:00']})
+    repaired, summary = repair_invigilation(
+        str(tmp_path / 'out.xlsx'), inputs, new_engagements=sick_row, removed_staff=[removed],
+    )
+    after = _ids(repaired)
+
+    assert sick not in after['S1'] and sick not in after['S2'] and len(after['S1']) == 1
+    assert all(removed not in people for people in after.values())
+    touched = {s for s in ('S1', 'S2') if sick in before[s]} | {s for s in before if removed in before[s]}
+    assert {s for s in before if before[s] != after[s]} <= touched
+    assert removed not in set(summary['StaffID'])
+    assert summary['TotalHours'].sum() == 16
+
+
+def test_demand_change_adds_invigilators(tmp_path):
+    inputs, merged = _schedule(tmp_path)
+    before = _ids(merged)
+    repaired, _ = repair_invigilation(merged, inputs, invigilators_needed={'S3': 3})
+    after = _ids(repaired)
+    assert len(after['S3']) == 3 and before['S3'] <= after['S3']
+    assert not after['S3'] & after['S4']
+    assert all(before[s] == after[s] for s in before if s != 'S3')
+
+
+def test_repair_raises_when_nobody_is_left(tmp_path):
+    inputs, merged = _schedule(tmp_path)
+    with pytest.raises(InfeasibleModelError):
+        repair_invigilation(merged, inputs, invigilators_needed={'S1': 6})
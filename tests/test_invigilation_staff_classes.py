@@ -0,0 +1,119 @@
+"""
+Test: Staff equivalence classes in the invigilation model
+"""
+import random
+
+import pandas as pd
+
+from business.invigilation import scheduler
+from business.invigilation.scheduler import prepare_invigilation_inputs, run_optimization
+from business.invigilation.staff_classes import rebalance_loads, split_class_counts, staff_classes
+
+
+def test_classes_need_same_weight_max_hours_and_engagements():
+    staff = ['a', 'b', 'c', 'd', 'e', 'a']
+    weight = {'a': 1, 'b': 1, 'c': 1, 'd': 2, 'e': 1}
+    max_hours = {'e': 600}
+    blocked = {('c', 'S1')}
+    assert staff_classes(staff, weight, max_hours, blocked) == [['a', 'b'], ['c'], ['d'], ['e']]
+
+
+def test_split_respects_overlaps_and_balances():
+    # S1/S2 overlap, S3 later the same day, S4 next day
+    date = {'S1': 1, 'S2': 1, 'S3': 1, 'S4': 2}
+    start = {'S1': 540, 'S2': 600, 'S3': 780, 'S4': 540}
+    end = {'S1': 720, 'S2': 720, 'S3': 900, 'S4': 660}
+    dur = {s: end[s] - start[s] for s in start}
+    counts = {'S1': 2, 'S2': 1, 'S3': 2, 'S4': 1}
+
+    assigned, loads = split_class_counts(['p', 'q', 'r'], counts, date, start, end, dur)
+    assert {s: len(p) for s, p in assigned.items()} == counts
+    assert not set(assigned['S1']) & set(assigned['S2'])
+    assert sum(loads.values()) == sum(dur[s] * k for s, k in counts.items())
+    assert max(loads.values()) - min(loads.values()) <= max(dur.values())
+
+
+def test_rebalance_swaps_long_for_short_sessions():
+    date = {'L1': 1, 'L2': 2, 'S1': 3, 'S2': 4}
+    start = dict.fromkeys(date, 540)
+    dur = {'L1': 180, 'L2': 180, 'S1': 120, 'S2': 120}
+    end = {s: start[s] + dur[s] for s in dur}
+    assigned = {'L1': ['p'], 'L2': ['p'], 'S1': ['q'], 'S2': ['q']}
+    loads = {'p': 360, 'q': 240}
+
+    moves = rebalance_loads(assigned, loads, set(), date, start, end, dur, {}, {})
+    assert moves == 1
+    assert sorted(loads.values()) == [300, 300]
+
+
+def _spread(summary):
+    minutes = summary['TotalHours'] * 60
+    return round(minutes.max() - minutes.min())
+
+
+def _small_pool(seed):
+    # 20 identical staff (one engaged), 36 sessions over 3 days with random demand
+    rng = random.Random(seed)
+    times = [('09:00', '11:00', 2), ('09:30', '12:30', 3), ('13:00', '15:00', 2), ('14:00', '16:00', 2)]
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start=times[k % 4][0], End=times[k % 4][1], Duration=times[k % 4][2],
+             InvigilatorsNeeded=rng.randint(1, 2))
+        for day in ('1/6/2025', '2/6/2025', '3/6/2025') for k in range(12)
+    ])
+    staff = pd.DataFrame({'StaffID': range(20), 'Name': [f'P{i}' for i in range(20)], 'LoadType': ['full'] * 20})
+    engage = pd.DataFrame({'StaffID': [0], 'Date': ['1/6/2025'], 'Start': ['09:00'], 'Engagement': [1]})
+    return prepare_invigilation_inputs(sessions, staff, engage)
+
+
+def test_small_pool_keeps_the_per_person_optimum(tmp_path, monkeypatch, capsys):
+    inputs = _small_pool(2)
+    _, per_person = run_optimization(
+        None, None, None, str(tmp_path / 'a.xlsx'), inputs=inputs, aggregate_staff=False, time_limit_sec=20,
+    )
+    # small per-person models are never aggregated by default
+    _, default = run_optimization(None, None, None, str(tmp_path / 'b.xlsx'), inputs=inputs, time_limit_sec=20)
+    assert 'Staff classes' not in capsys.readouterr().out
+    assert _spread(default) == _spread(per_person)
+
+    # forced classes: a split less fair than the class bound is polished per person
+    monkeypatch.setattr(scheduler, 'is_large_model', lambda variables: True)
+    _, classes = run_optimization(None, None, None, str(tmp_path / 'c.xlsx'), inputs=inputs, time_limit_sec=20)
+    assert 'Staff classes' in capsys.readouterr().out
+    assert _spread(classes) == _spread(per_person)
+
+
+def test_large_identical_pool_is_solved_per_class(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, 'is_large_model', lambda variables: True)
+    days = ['1/6/2025', '2/6/2025', '3/6/2025']
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start=start, End=end, Duration=3, InvigilatorsNeeded=2)
+        for day in days for start, end in (('09:00', '12:00'), ('11:00', '13:00')) for k in range(4)
+    ])
+    staff = pd.DataFrame({
+        'StaffID': range(24), 'Name': [f'P{i}' for i in range(24)],
+        'LoadType': ['half' if i < 4 else 'full' for i in range(24)],
+        'MaxHours': [6 if i >= 20 else None for i in range(24)],
+    })
+    engage = pd.DataFrame({'StaffID': [0], 'Date': ['1/6/2025'], 'Start': ['09:00'], 'Engagement': [1]})
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+
+    merged, summary = run_optimization(
+        None, None, None, str(tmp_path / 'out.xlsx'), inputs=inputs, time_limit_sec=20,
+    )
+    sess = inputs.sessions_df.set_index('SessionID')
+    taken = {}
+    for row in merged.itertuples():
+        ids = row.Invigilators_IDs.split(', ')
+        assert len(set(ids)) == 2
+        for d in ids:
+            taken.setdefault(d, []).append(row.SessionID)
+    assert not [s for s in taken.get('0', []) if sess.loc[s, 'DateKey'] == '06-01' and sess.loc[s, 'Start_min'] == 540]
+    for d, sids in taken.items():
+        for i, a in enumerate(sids):
+            for b in sids[i + 1:]:
+                same_day = sess.loc[a, 'DateKey'] == sess.loc[b, 'DateKey']
+                assert not (same_day and sess.loc[a, 'Start_min'] < sess.loc[b, 'End_min']
+                            and sess.loc[b, 'Start_min'] < sess.loc[a, 'End_min'])
+    hours = dict(zip(summary['StaffID'], summary['TotalHours']))
+    assert all(hours[str(i)] <= 6 for i in range(20, 24))
+    assert sum(hours.values()) == 2 * (3 * 4 * 3 + 2 * 4 * 3)
@@ -0,0 +1,20 @@
+"""
+Test: Slot duration index matches a full scan over the calendar
+"""
+from business.exam_scheduling.feasibility import SlotDurationIndex
+
+
+def test_matches_linear_scan():
+    durations = [180, 120, 90, 150, 120, 180, 60]
+    index = SlotDurationIndex(durations)
+    for dur in [0, 60, 61, 90, 120, 121, 150, 180, 181]:
+        expected = tuple(t for t, d in enumerate(durations) if d >= dur)
+        assert index.slots_for(dur) == expected
+        assert index.count(dur) == len(expected)
+    assert index.fits(1, 120) and not index.fits(2, 120)
+
+
+def test_same_duration_shares_one_slot_list():
+    index = SlotDurationIndex([120, 180, 150])
+    assert index.slots_for(120) is index.slots_for(120.0)
+    assert SlotDurationIndex([]).slots_for(120) == ()
@@ -0,0 +1,44 @@
+"""
+Test: Solver progress reports and their hand-over to the GUI thread
+"""
+import threading
+
+import pandas as pd
+
+from business.invigilation.scheduler import prepare_invigilation_inputs, run_optimization
+from utils.async_utils import ProgressChannel
+
+
+def test_invigilation_reports_stages_and_solutions(tmp_path):
+    sessions = pd.DataFrame([
+        dict(Room=f'R{k}', Date=day, Start='09:00', End='11:00', Duration=2, InvigilatorsNeeded=1 + k % 2)
+        for day in ('1/6/2025', '2/6/2025') for k in range(3)
+    ])
+    staff = pd.DataFrame({'StaffID': range(6), 'Name': [f'P{i}' for i in range(6)], 'LoadType': ['full'] * 6})
+    engage = pd.DataFrame(columns=['StaffID', 'Date', 'Start', 'Engagement'])
+    inputs = prepare_invigilation_inputs(sessions, staff, engage)
+
+    events = []
+    run_optimization(
+        None, None, None, str(tmp_path / 'out.xlsx'), inputs=inputs, aggregate_staff=False,
+        time_limit_sec=10, progress=events.append,
+    )
+    stages = list(dict.fromkeys(e.stage for e in events))
+    assert stages == ['Pre-checks', 'Building invigilation model', 'Solving invigilation model', 'Saving Excel']
+
+    solving = [e for e in events if e.stage == 'Solving invigilation model']
+    assert solving[0].time_limit_sec == 10 and solving[0].variables > 0
+    found = [e for e in solving if e.objective is not None]
+    assert found and found[-1].solutions == len(found)
+    assert found[-1].best_bound <= found[-1].objective
+    assert 0 <= found[-1].remaining_sec <= 10
+
+
+def test_channel_delivers_worker_reports_in_order():
+    received = []
+    channel = ProgressChannel(root=None, handler=received.append)
+    worker = threading.Thread(target=lambda: [channel.put(k) for k in range(100)])
+    worker.start()
+    worker.join()
+    channel.drain()
+    assert received == list(range(100))
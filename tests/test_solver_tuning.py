@@ -0,0 +1,72 @@
+"""
+Test: Automatic CP-SAT parameter selection (workers, time limit, history)
+"""
+import os
+
+from ortools.sat.python import cp_model
+
+from business.solver import tuning
+from business.solver.tuning import ModelSize, choose_solver_settings, model_size, record_solver_run
+from utils import system_utils
+
+
+def test_available_cpus_is_capped_by_cgroup_quota(monkeypatch):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(16)), raising=False)
+    monkeypatch.setattr(system_utils, "_cgroup_cpu_limit", lambda: 2.5)
+    assert system_utils.available_cpus() == 2
+
+    monkeypatch.setattr(system_utils, "_cgroup_cpu_limit", lambda: 0.5)
+    assert system_utils.available_cpus() == 1
+
+    monkeypatch.setattr(system_utils, "_cgroup_cpu_limit", lambda: None)
+    assert system_utils.available_cpus() == 16
+
+
+def test_tiers_and_explicit_values(monkeypatch):
+    monkeypatch.setattr(tuning, "available_cpus", lambda: 32)
+
+    small = choose_solver_settings("exam", ModelSize(500, 800))
+    assert (small.workers, small.time_limit_sec, small.linearization_level) == (4, 40.0, 2)
+    assert small.ignore_subsolvers == ()
+
+    large = choose_solver_settings("invigilation", ModelSize(250_000, 400_000))
+    assert large.workers == 16 and large.time_limit_sec == 75.0
+    assert large.linearization_level == 0 and large.stop.relative_gap > 0
+    assert "max_lp" in large.ignore_subsolvers
+
+    explicit = choose_solver_settings("exam", ModelSize(250_000, 1), time_limit_sec=5, workers=3)
+    assert (explicit.workers, explicit.time_limit_sec) == (3, 5.0)
+
+    monkeypatch.setattr(tuning, "available_cpus", lambda: 2)
+    assert choose_solver_settings("exam", ModelSize(50_000, 1)).workers == 2
+
+
+def test_history_adjusts_time_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(tuning, "available_cpus", lambda: 8)
+    history = str(tmp_path / "runs.json")
+    size = ModelSize(10_000, 20_000)
+    settings = choose_solver_settings("exam", size, history_path=history)
+    assert settings.time_limit_sec == 40.0
+
+    record_solver_run(history, "exam", size, settings, "OPTIMAL", 4.0)
+    assert choose_solver_settings("exam", size, history_path=history).time_limit_sec == 12.0
+    # other kinds and very different sizes are not "similar"
+    assert choose_solver_settings("invigilation", size, history_path=history).time_limit_sec == 25.0
+    assert choose_solver_settings("exam", ModelSize(50_000, 1), history_path=history).time_limit_sec == 40.0
+
+    timeout_history = str(tmp_path / "timeouts.json")
+    record_solver_run(timeout_history, "exam", size, settings, "FEASIBLE", 40.0)
+    assert choose_solver_settings("exam", size, history_path=timeout_history).time_limit_sec == 60.0
+
+
+def test_settings_apply_to_solver():
+    model = cp_model.CpModel()
+    a = model.NewIntVar(0, 10, "a")
+    model.Add(a <= 7)
+    model.Maximize(a)
+
+    settings = choose_solver_settings("exam", model_size(model), time_limit_sec=5)
+    solver = settings.apply(cp_model.CpSolver())
+    assert solver.parameters.max_time_in_seconds == 5.0
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    assert solver.Value(a) == 7
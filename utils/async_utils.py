@@ -2,6 +2,7 @@
 Utils Layer - Async Utilities
 Threading helpers for GUI responsiveness
 """
+import queue
 import threading
 import traceback
 from typing import Callable, Any, Optional, List
@@ -24,8 +25,54 @@ class ThreadedTask(threading.Thread):
             self.on_error(e)
 
 
+class ProgressChannel:
+    """
+    Carries progress reports from worker (and solver) threads to the Tk loop.
+    put() may be called from any thread; while started, the queue is drained
+    every interval_ms with root.after() and each item is passed to
+    handler(item) on the Tk thread. Tk widgets must not be touched from
+    other threads, hence the queue.
+    """
+
+    def __init__(self, root, handler: Callable[[Any], None], interval_ms: int = 100):
+        self.root = root
+        self.handler = handler
+        self.interval_ms = interval_ms
+        self._queue: "queue.Queue" = queue.Queue()
+        self._after_id = None
+
+    def put(self, item):
+        """Queue a report (thread-safe)."""
+        self._queue.put(item)
+
+    def start(self):
+        """Begin polling (Tk thread)."""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._poll)
+
+    def stop(self):
+        """Stop polling and hand over whatever is still queued (Tk thread)."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self.drain()
+
+    def drain(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self.handler(item)
+
+    def _poll(self):
+        self.drain()
+        self._after_id = self.root.after(self.interval_ms, self._poll)
+
+
 def run_async(root, func: Callable, on_success_callback: Callable, 
-              on_error_callback: Callable, status_label=None, buttons_to_disable: Optional[List] = None):
+              on_error_callback: Callable, status_label=None, buttons_to_disable: Optional[List] = None,
+              progress_channel: Optional[ProgressChannel] = None):
     """
     Run func() in thread with proper error handling.
     
@@ -36,12 +83,16 @@ def run_async(root, func: Callable, on_success_callback: Callable,
         on_error_callback: Called on error
         status_label: Optional label to update with status
         buttons_to_disable: Optional list of buttons to disable during execution
+        progress_channel: Optional ProgressChannel that func reports into
+            (channel.put); polled while func runs, drained before the callbacks
     """
     if buttons_to_disable:
         for b in buttons_to_disable:
             b.config(state='disabled')
     if status_label:
         status_label.config(text="Running...")
+    if progress_channel:
+        progress_channel.start()
 
     def _on_success_thread(result):
         root.after(0, lambda: _on_success_main(result))
@@ -50,6 +101,8 @@ def run_async(root, func: Callable, on_success_callback: Callable,
         root.after(0, lambda: _on_error_main(e))
 
     def _on_success_main(result):
+        if progress_channel:
+            progress_channel.stop()
         if status_label:
             status_label.config(text="Done")
         if buttons_to_disable:
@@ -58,6 +111,8 @@ def run_async(root, func: Callable, on_success_callback: Callable,
         on_success_callback(result)
 
     def _on_error_main(e):
+        if progress_channel:
+            progress_channel.stop()
         if status_label:
             status_label.config(text="Error")
         if buttons_to_disable:
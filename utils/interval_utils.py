@@ -0,0 +1,75 @@
+"""
+Utils Layer - Interval Utilities
+Overlap grouping for time intervals (exam slots, invigilation sessions)
+"""
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+
+def overlap_cliques(intervals: Sequence[Tuple[Hashable, int, int]]) -> List[List[int]]:
+    """
+    Maximal groups of pairwise overlapping intervals, found with a sweep line.
+
+    intervals: (group_key, start, end) per item; only items with the same
+    group_key (e.g. the date) can overlap. Intervals are half-open [start, end),
+    so 09:00-12:00 and 12:00-15:00 do not overlap; empty intervals (end <= start)
+    overlap nothing.
+
+    Returns lists of positions into `intervals`, each sorted. Every pair of
+    overlapping intervals shares at least one returned clique, and items that
+    overlap nothing come back as singletons. An interval graph has at most n
+    maximal cliques, so this is O(n log n) plus the output size.
+    """
+    by_key = {}
+    cliques = []
+    for i, (key, start, end) in enumerate(intervals):
+        if int(end) <= int(start):
+            cliques.append([i])
+            continue
+        by_key.setdefault(key, []).append((int(start), int(end), i))
+
+    for items in by_key.values():
+        # ends sort before starts at the same instant (half-open intervals)
+        events = sorted(
+            [(s, 1, i) for s, _, i in items] + [(e, 0, i) for _, e, i in items]
+        )
+        active = set()
+        grew = False
+        for _, is_start, i in events:
+            if is_start:
+                active.add(i)
+                grew = True
+            else:
+                # the active set is maximal right before the first end after a start
+                if grew:
+                    cliques.append(sorted(active))
+                    grew = False
+                active.discard(i)
+    return sorted(cliques)
+
+
+def overlap_blocks(
+    session_ids: Sequence[Hashable],
+    date_key: Dict[Hashable, Hashable],
+    start_min: Dict[Hashable, int],
+    end_min: Dict[Hashable, int],
+) -> Dict[Hashable, int]:
+    """
+    Session -> block number, a block being a run of sessions on one date
+    chained by overlaps. With fixed exam periods every block is one clique.
+    """
+    by_date: Dict[Hashable, List[Hashable]] = {}
+    for s in session_ids:
+        by_date.setdefault(date_key[s], []).append(s)
+
+    block_of = {}
+    block = -1
+    for sessions in by_date.values():
+        reach = None
+        for s in sorted(sessions, key=lambda s: (start_min[s], end_min[s])):
+            if reach is None or start_min[s] >= reach:
+                block += 1
+                reach = end_min[s]
+            else:
+                reach = max(reach, end_min[s])
+            block_of[s] = block
+    return block_of
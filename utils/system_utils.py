@@ -0,0 +1,48 @@
+"""
+Utils Layer - System Utilities
+Machine information used to size solver runs
+"""
+import os
+from typing import Optional
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """
+    CPU quota of the current container in cores, or None when unlimited/unknown.
+    Reads cgroup v2 (cpu.max) first, then cgroup v1 (cfs quota/period).
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max" and int(period) > 0:
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read().strip())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read().strip())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """
+    Cores this process may actually use: CPU affinity (or os.cpu_count) capped
+    by the container's cgroup quota, at least 1.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, int(limit)))
+    return max(1, cpus)